@@ -9,7 +9,41 @@ based on the symptoms extracted from the text.
 .. moduleauthor:: Michil Egorov <egorov_michil@mail.ru>
 """
 
-from distool.estimators.classifiers import BaseDiseaseClassifier
-from distool.feature_extraction.dumb_extractor import DumbSymptomExtractor
-from distool.feature_extraction.smart_extractor import SmartSymptomExtractor
-from distool.interpretation.explainer import SymptomBasedExplainer
+from typing import TYPE_CHECKING
+
+from distool.base.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from distool.estimators.classifiers import BaseDiseaseClassifier
+    from distool.feature_extraction.dumb_extractor import DumbSymptomExtractor
+    from distool.feature_extraction.smart_extractor import SmartSymptomExtractor
+    from distool.interpretation.explainer import SymptomBasedExplainer
+    from distool.pipeline import IntakePipeline
+
+# Heavy dependencies (FEDOT, spaCy, scikit-learn) are imported only on first access
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "BaseDiseaseClassifier": "distool.estimators.classifiers",
+        "DumbSymptomExtractor": "distool.feature_extraction.dumb_extractor",
+        "IntakePipeline": "distool.pipeline",
+        "SmartSymptomExtractor": "distool.feature_extraction.smart_extractor",
+        "SymptomBasedExplainer": "distool.interpretation.explainer",
+    },
+    submodules=[
+        "base",
+        "estimators",
+        "feature_extraction",
+        "interpretation",
+        "pipeline",
+        "serving",
+    ],
+)
+
+__all__ = [
+    "BaseDiseaseClassifier",
+    "DumbSymptomExtractor",
+    "IntakePipeline",
+    "SmartSymptomExtractor",
+    "SymptomBasedExplainer",
+]
@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List
+from itertools import islice
+from typing import Iterable, Iterator, List
+
+import numpy as np
 
 
 class BaseEstimator(ABC):
@@ -85,3 +88,48 @@ class BaseTransformer(ABC):
                 Transformed data.
         """
         pass
+
+    def transform_iter(
+        self,
+        messages: Iterable[str],
+        batch_size: int = 1000,
+        as_rows: bool = False,
+        cumulative: bool = False,
+    ) -> Iterator[np.array]:
+        """Transform a stream of messages with memory bounded by the batch size.
+
+        Messages are consumed lazily, so any iterable works, like a file, a queue or a generator.
+
+        Args:
+            messages: Iterable of strings
+                Input messages, possibly unbounded.
+            batch_size: int
+                The number of messages transformed at once and the number of rows in a yielded block.
+            as_rows: bool
+                Whether to yield a row per message instead of blocks.
+            cumulative: bool
+                Whether to yield the merged state of all messages so far instead of marks of every message,
+                as if the stream were a single dialog.
+
+        Yields:
+            Numpy arrays of shape (n_messages_in_block, n_symptoms), or of shape (n_symptoms,) if as_rows is True.
+        """
+        # Imported here, because feature extraction depends on the base module
+        from distool.feature_extraction.anamnesis import Anamnesis
+
+        messages = iter(messages)
+        session_marks = None
+        while True:
+            batch = list(islice(messages, batch_size))
+            if not batch:
+                return
+
+            marks = self.transform(batch)
+            if cumulative:
+                marks = Anamnesis.accumulate_marks(marks, session_marks)
+                session_marks = marks[-1]
+
+            if as_rows:
+                yield from marks
+            else:
+                yield marks
@@ -0,0 +1,42 @@
+import importlib
+import sys
+from typing import Callable, Dict, Iterable, List, Tuple
+
+
+def lazy_attributes(
+    package_name: str,
+    attribute_modules: Dict[str, str],
+    submodules: Iterable[str] = (),
+) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """Creates module level ``__getattr__`` and ``__dir__`` functions (PEP 562) for a package.
+
+    Public names of the package are resolved on first access, so importing the package itself
+    does not pull in heavy dependencies (FEDOT, spaCy, scikit-learn) of its submodules.
+
+    Args:
+        package_name: The ``__name__`` of the package the functions are created for.
+        attribute_modules: A dictionary that maps exported attribute names to the modules defining them.
+        submodules: Names of subpackages and submodules that should be importable as attributes.
+
+    Returns:
+        A tuple of ``__getattr__`` and ``__dir__`` functions to be assigned in the package namespace.
+    """
+    submodules = frozenset(submodules)
+
+    def __getattr__(name: str) -> object:
+        if name in attribute_modules:
+            value = getattr(importlib.import_module(attribute_modules[name]), name)
+        elif name in submodules:
+            value = importlib.import_module(f"{package_name}.{name}")
+        else:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+
+        # Cache resolved value, so the next access does not go through ``__getattr__``
+        setattr(sys.modules[package_name], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        package_attributes = vars(sys.modules[package_name])
+        return sorted(set(package_attributes) | set(attribute_modules) | submodules)
+
+    return __getattr__, __dir__
@@ -1,7 +1,35 @@
 """This page documents the classes used for disease and urgency classification.
-It includes BaseDiseaseClassifier, DiseaseClassifier, FedotDiseaseClassifier, and UrgencyClassifier classes.
+It includes BaseDiseaseClassifier, DiseaseClassifier, OnlineDiseaseClassifier, FedotDiseaseClassifier,
+and UrgencyClassifier classes.
 These classes are used to train and predict diseases and their urgency based on the extracted symptoms.
+LinearScorer serves the predictions of a fitted DiseaseClassifier without scikit-learn.
 """
-from distool.estimators.classifiers import DiseaseClassifier, FedotDiseaseClassifier
 
-__all__ = ["DiseaseClassifier", "FedotDiseaseClassifier"]
+from typing import TYPE_CHECKING
+
+from distool.base.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from distool.estimators.classifiers import (
+        DiseaseClassifier,
+        FedotDiseaseClassifier,
+        OnlineDiseaseClassifier,
+    )
+    from distool.estimators.linear_scorer import LinearScorer
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "DiseaseClassifier": "distool.estimators.classifiers",
+        "FedotDiseaseClassifier": "distool.estimators.classifiers",
+        "LinearScorer": "distool.estimators.linear_scorer",
+        "OnlineDiseaseClassifier": "distool.estimators.classifiers",
+    },
+)
+
+__all__ = [
+    "DiseaseClassifier",
+    "FedotDiseaseClassifier",
+    "LinearScorer",
+    "OnlineDiseaseClassifier",
+]
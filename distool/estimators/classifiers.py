@@ -1,8 +1,31 @@
+import json
+import os
+import pickle
+from copy import deepcopy
+from pathlib import Path
+from typing import Dict, Iterable, NamedTuple, Optional, Union
+
 import numpy as np
-from fedot.api.main import Fedot
+from scipy import sparse
 from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
 
 from distool.base.estimators import BaseEstimator
+from distool.estimators.linear_scorer import LinearScorer
+from distool.feature_extraction.feature_encoder import SymptomFeatureEncoder
+from distool.feature_extraction.sparse_marks import align_marks_format, csr_to_marks
+
+
+class TopKPrediction(NamedTuple):
+    """The top-k candidate classes of samples.
+
+    Attributes:
+        labels: The candidate labels of shape (n_samples, k), ordered by decreasing probability.
+        probabilities: The probabilities of the candidates of shape (n_samples, k).
+    """
+
+    labels: np.array
+    probabilities: np.array
 
 
 class BaseDiseaseClassifier(BaseEstimator):
@@ -10,10 +33,26 @@ class BaseDiseaseClassifier(BaseEstimator):
 
     This is an abstract base class that provides a common interface for all disease classifiers in the system.
     A disease classifier is an object that can fit models and make predictions about diseases.
+
+    Attributes:
+        ABSTAIN_LABEL: The label of a sample or a candidate the classifier is not confident about.
+        threshold: The minimum top probability of a sample to be ranked by ``predict_topk``.
+        encoder: The encoder of symptom marks into model features, it is persisted with the model.
     """
 
+    ABSTAIN_LABEL: str = "-1"
+
     threshold: float = 0.5
     id2class: dict = {}
+    encoder: SymptomFeatureEncoder = SymptomFeatureEncoder()
+
+    def get_classes(self) -> np.array:
+        """Gets the class labels in the order of the columns of ``predict_proba``.
+
+        Returns:
+            A numpy array of class labels.
+        """
+        return np.array([self.id2class[i] for i in range(len(self.id2class))])
 
     def predict(self, x):
         """Predict class labels for samples in X.
@@ -28,8 +67,67 @@ class BaseDiseaseClassifier(BaseEstimator):
         """
         logits = self.predict_proba(x)
         class_ids = np.argmax(logits, axis=1)
-        classes = np.array([self.id2class[class_id] for class_id in class_ids])
-        return classes
+        return np.take(self.get_classes(), class_ids)
+
+    def predict_topk(self, x, k: int = 3, min_proba: float = 0.0) -> TopKPrediction:
+        """Predicts the top-k candidate classes of samples for a differential diagnosis.
+
+        Samples whose top probability is below ``threshold`` are not ranked, all their candidates
+        are ABSTAIN_LABEL with zero probability. Candidates of ranked samples with a probability below
+        ``min_proba`` are replaced the same way.
+
+        Args:
+            x: array-like, shape (n_samples, n_features)
+                Samples.
+            k: The number of candidates per sample, it is limited by the number of classes.
+            min_proba: The minimum probability of a candidate.
+
+        Returns:
+            A TopKPrediction with arrays of shape (n_samples, k) of labels and probabilities.
+        """
+        if k < 1:
+            raise ValueError(f"K should be positive, but it is {k}")
+
+        classes = self.get_classes()
+        proba = np.asarray(self.predict_proba(x), dtype=float)
+        # Binary models may return only the probability of the positive class
+        if proba.ndim == 1 or (proba.shape[1] == 1 and len(classes) == 2):
+            positive_proba = proba.reshape(-1, 1)
+            proba = np.hstack([1.0 - positive_proba, positive_proba])
+
+        n_samples, n_classes = proba.shape
+        k = min(k, n_classes)
+
+        # String labels are widened, so the abstain label is not truncated
+        labels_dtype = classes.dtype
+        if labels_dtype.kind == "U":
+            labels_dtype = np.promote_types(
+                labels_dtype, np.array(self.ABSTAIN_LABEL).dtype
+            )
+        abstain_label = np.array(self.ABSTAIN_LABEL).astype(labels_dtype)
+
+        labels = np.full((n_samples, k), abstain_label, dtype=labels_dtype)
+        probabilities = np.zeros((n_samples, k))
+
+        ranked_rows = np.flatnonzero(proba.max(axis=1) >= self.threshold)
+        if ranked_rows.size == 0:
+            return TopKPrediction(labels, probabilities)
+
+        ranked_proba = proba[ranked_rows]
+        # Partitioning finds the k best classes in linear time, only they are sorted
+        top_ids = np.argpartition(-ranked_proba, k - 1, axis=1)[:, :k]
+        top_proba = np.take_along_axis(ranked_proba, top_ids, axis=1)
+        order = np.argsort(-top_proba, axis=1, kind="stable")
+        top_ids = np.take_along_axis(top_ids, order, axis=1)
+        top_proba = np.take_along_axis(top_proba, order, axis=1)
+
+        is_candidate = top_proba >= min_proba
+        labels[ranked_rows] = np.where(
+            is_candidate, np.take(classes, top_ids), abstain_label
+        )
+        probabilities[ranked_rows] = np.where(is_candidate, top_proba, 0.0)
+
+        return TopKPrediction(labels, probabilities)
 
 
 class DiseaseClassifier(BaseDiseaseClassifier):
@@ -39,17 +137,24 @@ class DiseaseClassifier(BaseDiseaseClassifier):
 
     Attributes:
         log_reg: A Logistic Regression classifier.
+        encoder: The encoder of symptom marks into model features.
     """
 
-    def __init__(self):
-        """Initializes a new instance of the DiseaseClassifier class."""
+    def __init__(self, encoding: str = SymptomFeatureEncoder.ORDINAL):
+        """Initializes a new instance of the DiseaseClassifier class.
+
+        Args:
+            encoding: The name of the encoding of symptom marks, one of SymptomFeatureEncoder.ENCODINGS.
+        """
         self.log_reg = LogisticRegression()
+        self.encoder = SymptomFeatureEncoder(encoding)
+        self._fitted_on_sparse = False
 
     def fit(self, features: np.array, y: np.array) -> "BaseDiseaseClassifier":
         """Fit the model according to the given training data.
 
         Args:
-            features: array-like, shape (n_samples, n_features)
+            features: array-like or sparse marks matrix, shape (n_samples, n_features)
                 Training vector, where n_samples is the number of samples and n_features is the number of features.
             y: array-like, shape (n_samples,)
                 Target vector relative to X.
@@ -57,7 +162,8 @@ class DiseaseClassifier(BaseDiseaseClassifier):
         Returns:
             self: object
         """
-        self.log_reg.fit(features, y)
+        self._fitted_on_sparse = sparse.issparse(features)
+        self.log_reg.fit(self.encoder.transform(features), y)
         self.id2class = {i: c for i, c in enumerate(self.log_reg.classes_)}
 
         return self
@@ -68,14 +174,328 @@ class DiseaseClassifier(BaseDiseaseClassifier):
         The returned estimates for all classes are ordered by the label of classes.
 
         Args:
-            features: array-like, shape = [n_samples, n_features]
+            features: array-like or sparse marks matrix, shape = [n_samples, n_features]
                 The input samples.
 
         Returns:
             p: array-like, shape = [n_samples, n_classes]
                 The class probabilities of the input samples. The order of the classes corresponds to that in the attribute `classes_`.
         """
-        return self.log_reg.predict_proba(features)
+        # Marks are converted to the encoding the model was fitted on, because NO_INFO differs in them
+        features = align_marks_format(
+            features, getattr(self, "_fitted_on_sparse", False)
+        )
+        return self.log_reg.predict_proba(self.encoder.transform(features))
+
+    def get_weights(self) -> Dict[str, np.array]:
+        """Gets the fitted weights of the model.
+
+        Returns:
+            A dictionary with the coefficients, the intercepts and the classes of the Logistic Regression.
+        """
+        return {
+            "coef": self.log_reg.coef_,
+            "intercept": self.log_reg.intercept_,
+            "classes": self.log_reg.classes_,
+        }
+
+    @classmethod
+    def from_weights(
+        cls,
+        weights: Dict[str, np.array],
+        encoding: str = SymptomFeatureEncoder.ORDINAL,
+        fitted_on_sparse: bool = False,
+    ) -> "DiseaseClassifier":
+        """Creates a fitted classifier from the weights of ``get_weights``.
+
+        The weights are used as they are, so memory-mapped arrays stay memory-mapped.
+
+        Args:
+            weights: A dictionary with the coefficients, the intercepts and the classes.
+            encoding: The name of the encoding of symptom marks the weights were fitted with.
+            fitted_on_sparse: A boolean indicating whether the weights were fitted on sparse marks.
+
+        Returns:
+            A DiseaseClassifier instance.
+        """
+        classifier = cls(encoding)
+        classifier._fitted_on_sparse = fitted_on_sparse
+
+        classifier.log_reg.coef_ = weights["coef"]
+        classifier.log_reg.intercept_ = weights["intercept"]
+        classifier.log_reg.classes_ = weights["classes"]
+        classifier.log_reg.n_features_in_ = weights["coef"].shape[1]
+        classifier.id2class = {i: c for i, c in enumerate(weights["classes"])}
+
+        return classifier
+
+    def export_scorer(self) -> LinearScorer:
+        """Exports the fitted model into a NumPy-only scorer for low-latency inference.
+
+        Returns:
+            A LinearScorer instance with the weights of the model.
+        """
+        return LinearScorer.from_weights(
+            self.get_weights(),
+            self.encoder.encoding,
+            getattr(self, "_fitted_on_sparse", False),
+        )
+
+
+class OnlineDiseaseClassifier(BaseDiseaseClassifier):
+    """Online Disease Classifier
+
+    This class is a specific implementation of the BaseDiseaseClassifier that learns a multinomial
+    logistic regression with mini-batch stochastic gradient descent. ``partial_fit`` updates the model
+    on a batch of new cases only, so learning from a stream of batches takes constant memory.
+    Disease labels unseen before are added to the model when they appear, and the state of the model
+    can be checkpointed to disk with ``save`` and restored with ``load``.
+
+    Attributes:
+        learning_rate: The step size of gradient descent.
+        alpha: The strength of L2 regularization.
+        batch_size: The number of samples in a gradient step.
+        n_epochs: The number of passes over every batch given to ``partial_fit``.
+        encoder: The encoder of symptom marks into model features.
+        coef: The coefficients of shape (n_classes, n_features).
+        intercept: The intercepts of shape (n_classes,).
+        n_steps: The number of gradient steps made so far.
+    """
+
+    def __init__(
+        self,
+        encoding: str = SymptomFeatureEncoder.ORDINAL,
+        learning_rate: float = 0.1,
+        alpha: float = 1e-4,
+        batch_size: int = 32,
+        n_epochs: int = 5,
+    ) -> None:
+        """Initializes a new instance of the OnlineDiseaseClassifier class.
+
+        Args:
+            encoding: The name of the encoding of symptom marks, one of SymptomFeatureEncoder.ENCODINGS.
+            learning_rate: The step size of gradient descent.
+            alpha: The strength of L2 regularization.
+            batch_size: The number of samples in a gradient step.
+            n_epochs: The number of passes over every batch given to ``partial_fit``.
+        """
+        self.learning_rate = learning_rate
+        self.alpha = alpha
+        self.batch_size = batch_size
+        self.n_epochs = n_epochs
+        self.encoder = SymptomFeatureEncoder(encoding)
+        self._reset()
+
+    def _reset(self):
+        self.coef: Optional[np.array] = None
+        self.intercept: Optional[np.array] = None
+        self.n_steps = 0
+        self.id2class = {}
+        self._class2id = {}
+        self._fitted_on_sparse = False
+
+    def _add_classes(self, classes: Iterable):
+        """Adds unseen class labels with zero weights."""
+        new_classes = [c for c in dict.fromkeys(classes) if c not in self._class2id]
+        if not new_classes:
+            return
+
+        for c in new_classes:
+            self._class2id[c] = len(self.id2class)
+            self.id2class[len(self.id2class)] = c
+
+        self.coef = np.vstack(
+            [self.coef, np.zeros((len(new_classes), self.coef.shape[1]))]
+        )
+        self.intercept = np.concatenate([self.intercept, np.zeros(len(new_classes))])
+
+    def _encode(self, features: np.array) -> Union[np.array, sparse.csr_matrix]:
+        if not sparse.issparse(features):
+            features = np.asarray(features)
+        features = align_marks_format(features, self._fitted_on_sparse)
+        return self.encoder.transform(features)
+
+    def _predict_scores(self, features: Union[np.array, sparse.csr_matrix]) -> np.array:
+        scores = features @ self.coef.T
+        scores += self.intercept
+        return scores
+
+    @staticmethod
+    def _softmax(scores: np.array) -> np.array:
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+    def partial_fit(
+        self, features: np.array, y: np.array, classes: Optional[Iterable] = None
+    ) -> "OnlineDiseaseClassifier":
+        """Updates the model on a batch of samples.
+
+        Args:
+            features: array-like or sparse marks matrix, shape (n_samples, n_features)
+                Training vector of the batch.
+            y: array-like, shape (n_samples,)
+                Target vector of the batch, it may contain labels unseen before.
+            classes: All class labels known in advance, they are added to the model before the update.
+
+        Returns:
+            self: object
+        """
+        if self.coef is None:
+            self._fitted_on_sparse = sparse.issparse(features)
+
+        encoded = self._encode(features)
+        n_samples, n_features = encoded.shape
+
+        if self.coef is None:
+            self.coef = np.zeros((0, n_features))
+            self.intercept = np.zeros(0)
+        elif n_features != self.coef.shape[1]:
+            raise ValueError(
+                f"Model has {self.coef.shape[1]} features, but the batch has {n_features}"
+            )
+
+        y = np.asarray(y)
+        if classes is not None:
+            self._add_classes(classes)
+        self._add_classes(y)
+
+        class_ids = np.array([self._class2id[c] for c in y], dtype=np.intp)
+
+        for _ in range(self.n_epochs):
+            for start in range(0, n_samples, self.batch_size):
+                batch = encoded[start : start + self.batch_size]
+                batch_class_ids = class_ids[start : start + self.batch_size]
+
+                # Gradient of cross-entropy by scores is the probabilities minus the one-hot targets
+                errors = self._softmax(self._predict_scores(batch))
+                errors[np.arange(len(batch_class_ids)), batch_class_ids] -= 1.0
+                errors /= len(batch_class_ids)
+
+                coef_gradient = np.asarray((batch.T @ errors).T)
+                coef_gradient += self.alpha * self.coef
+                self.coef -= self.learning_rate * coef_gradient
+                self.intercept -= self.learning_rate * errors.sum(axis=0)
+                self.n_steps += 1
+
+        return self
+
+    def fit(self, features: np.array, y: np.array) -> "OnlineDiseaseClassifier":
+        """Fit the model from scratch according to the given training data.
+
+        Args:
+            features: array-like or sparse marks matrix, shape (n_samples, n_features)
+                Training vector, where n_samples is the number of samples and n_features is the number of features.
+            y: array-like, shape (n_samples,)
+                Target vector relative to X.
+
+        Returns:
+            self: object
+        """
+        self._reset()
+        return self.partial_fit(features, y)
+
+    def predict_proba(self, features: np.array) -> np.array:
+        """Probability estimates.
+
+        Args:
+            features: array-like or sparse marks matrix, shape = [n_samples, n_features]
+                The input samples.
+
+        Returns:
+            p: array-like, shape = [n_samples, n_classes]
+                The class probabilities of the input samples in the order of ``get_classes``.
+        """
+        if self.coef is None:
+            raise ValueError("Classifier is not fitted")
+
+        return self._softmax(self._predict_scores(self._encode(features)))
+
+    def get_weights(self) -> Dict[str, np.array]:
+        """Gets the learned weights of the model.
+
+        Returns:
+            A dictionary with the coefficients, the intercepts and the classes.
+        """
+        return {
+            "coef": self.coef,
+            "intercept": self.intercept,
+            "classes": self.get_classes(),
+        }
+
+    def export_scorer(self) -> LinearScorer:
+        """Exports the learned model into a NumPy-only scorer for low-latency inference.
+
+        Returns:
+            A LinearScorer instance with a copy of the weights of the model.
+        """
+        weights = {name: np.copy(weight) for name, weight in self.get_weights().items()}
+        return LinearScorer.from_weights(
+            weights, self.encoder.encoding, self._fitted_on_sparse
+        )
+
+    def save(self, path: Union[str, Path]):
+        """Saves a checkpoint of the model.
+
+        The checkpoint is written to a temporary file first, so an interrupted save keeps the previous one.
+
+        Args:
+            path: The file path of the checkpoint.
+        """
+        if self.coef is None:
+            raise ValueError("Classifier is not fitted")
+
+        path = Path(path)
+        classes = self.get_classes()
+        # Labels are saved as unicode strings, because object arrays need pickle
+        if classes.dtype == object:
+            classes = classes.astype(str)
+
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "wb") as f:
+            np.savez(
+                f,
+                coef=self.coef,
+                intercept=self.intercept,
+                classes=classes,
+                n_steps=self.n_steps,
+                fitted_on_sparse=self._fitted_on_sparse,
+                encoding=self.encoder.encoding,
+                hyperparameters=np.array(
+                    [self.learning_rate, self.alpha, self.batch_size, self.n_epochs]
+                ),
+            )
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "OnlineDiseaseClassifier":
+        """Loads a model from a checkpoint, it can continue learning with ``partial_fit``.
+
+        Args:
+            path: The file path of the checkpoint.
+
+        Returns:
+            An OnlineDiseaseClassifier instance.
+        """
+        with np.load(path, allow_pickle=False) as checkpoint:
+            learning_rate, alpha, batch_size, n_epochs = checkpoint["hyperparameters"]
+            classifier = cls(
+                str(checkpoint["encoding"]),
+                learning_rate=float(learning_rate),
+                alpha=float(alpha),
+                batch_size=int(batch_size),
+                n_epochs=int(n_epochs),
+            )
+            classifier.coef = checkpoint["coef"]
+            classifier.intercept = checkpoint["intercept"]
+            classifier.n_steps = int(checkpoint["n_steps"])
+            classifier._fitted_on_sparse = bool(checkpoint["fitted_on_sparse"])
+            for class_id, c in enumerate(checkpoint["classes"].tolist()):
+                classifier.id2class[class_id] = c
+                classifier._class2id[c] = class_id
+
+        return classifier
 
 
 class FedotDiseaseClassifier(BaseDiseaseClassifier):
@@ -83,19 +503,76 @@ class FedotDiseaseClassifier(BaseDiseaseClassifier):
 
     This class is a specific implementation of the BaseDiseaseClassifier that uses the FEDOT framework for classification.
 
+    The found pipeline is saved with ``save`` and loaded with ``load``, so serving never runs the search.
+    With ``warm_start`` the next ``fit`` seeds the search from the pipeline found before.
+
     Attributes:
+        SURROGATE_MAX_DEPTH: The maximum depth of the surrogate decision tree.
+        MANIFEST_FILE_NAME: The file name of the classifier description in a saved directory.
+        PIPELINE_DIR_NAME: The directory name of the FEDOT pipeline in a saved directory.
+        SURROGATE_FILE_NAME: The file name of the pickled surrogate in a saved directory.
         model: A FEDOT model.
+        encoder: The encoder of symptom marks into model features.
+        options: Options of the FEDOT model, including the compute budget.
+        warm_start: Whether ``fit`` starts the search from the previously found pipeline.
+        surrogate: A decision tree that mimics the predictions of the fitted pipeline, it is used for explanations.
+        surrogate_score: The share of training samples the surrogate predicts the same as the pipeline.
     """
 
-    def __init__(self, **options) -> None:
-        """Initializes a new instance of the FedotDiseaseClassifier class."""
-        self.model = Fedot(
-            **options,
-            problem="classification",
-            timeout=5,
-            preset="best_quality",
-            safe_mode=True,
-        )
+    SURROGATE_MAX_DEPTH: int = 5
+
+    MANIFEST_FILE_NAME: str = "manifest.json"
+    PIPELINE_DIR_NAME: str = "pipeline"
+    SURROGATE_FILE_NAME: str = "surrogate.pkl"
+
+    surrogate: Optional[DecisionTreeClassifier] = None
+    surrogate_score: Optional[float] = None
+
+    def __init__(
+        self,
+        encoding: str = SymptomFeatureEncoder.ORDINAL,
+        timeout: float = 5,
+        preset: str = "best_quality",
+        n_jobs: int = -1,
+        early_stopping_iterations: Optional[int] = None,
+        early_stopping_timeout: Optional[float] = None,
+        warm_start: bool = False,
+        **options,
+    ) -> None:
+        """Initializes a new instance of the FedotDiseaseClassifier class.
+
+        Args:
+            encoding: The name of the encoding of symptom marks, one of SymptomFeatureEncoder.ENCODINGS.
+            timeout: The time limit of the search in minutes.
+            preset: The name of the FEDOT preset of models.
+            n_jobs: The number of parallel jobs of the search, all CPUs if -1.
+            early_stopping_iterations: The number of generations without improvement to stop the search after.
+            early_stopping_timeout: The time without improvement in minutes to stop the search after.
+            warm_start: Whether ``fit`` starts the search from the previously found pipeline.
+            **options: Other options of the FEDOT model.
+        """
+        self.encoder = SymptomFeatureEncoder(encoding)
+        self.warm_start = warm_start
+
+        self.options = dict(timeout=timeout, preset=preset, n_jobs=n_jobs, **options)
+        # FEDOT defaults are used for the early stopping options that are not set
+        if early_stopping_iterations is not None:
+            self.options["early_stopping_iterations"] = early_stopping_iterations
+        if early_stopping_timeout is not None:
+            self.options["early_stopping_timeout"] = early_stopping_timeout
+
+        self.model = self._create_model()
+
+    def _create_model(self, initial_assumption=None):
+        """Creates a FEDOT model with the options of the classifier."""
+        # FEDOT has a heavy import graph, so it is loaded only when the classifier is constructed
+        from fedot.api.main import Fedot
+
+        options = dict(self.options)
+        if initial_assumption is not None:
+            options["initial_assumption"] = initial_assumption
+
+        return Fedot(problem="classification", safe_mode=True, **options)
 
     def fit(self, features: np.array, y: np.array) -> "FedotDiseaseClassifier":
         """Fit the model according to the given training data.
@@ -109,17 +586,127 @@ class FedotDiseaseClassifier(BaseDiseaseClassifier):
         Returns:
             self: object
         """
-        if not hasattr(features, "shape"):
-            features = np.array(features)
-
         if not hasattr(y, "shape"):
             y = np.array(y)
 
+        if self.warm_start and self.model.current_pipeline is not None:
+            # The found pipeline is copied, so the fitted one is not changed by the search
+            initial_assumption = deepcopy(self.model.current_pipeline)
+            initial_assumption.unfit()
+            self.model = self._create_model(initial_assumption)
+
         self.id2class = {i: c for i, c in enumerate(np.unique(y))}
-        self.model.fit(features=features, target=y)
+        self.model.fit(features=self.encode(features), target=y)
+        self.fit_surrogate(features)
 
         return self
 
+    def save(self, path: Union[str, Path]):
+        """Saves the fitted pipeline, the options and the surrogate of the classifier to a directory.
+
+        The manifest is written last, so a directory interrupted while saving is not loaded.
+
+        Args:
+            path: The directory path, it is created if it doesn't exist.
+        """
+        if self.model.current_pipeline is None:
+            raise ValueError("Classifier is not fitted")
+
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        self.model.current_pipeline.save(
+            path=str(path / self.PIPELINE_DIR_NAME), create_subdir=False
+        )
+        if self.surrogate is not None:
+            with open(path / self.SURROGATE_FILE_NAME, "wb") as f:
+                pickle.dump((self.surrogate, self.surrogate_score), f)
+
+        manifest = {
+            "encoding": self.encoder.encoding,
+            "warm_start": self.warm_start,
+            "options": self.options,
+            "classes": self.get_classes().tolist(),
+        }
+        with open(path / self.MANIFEST_FILE_NAME, "w", encoding="utf8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "FedotDiseaseClassifier":
+        """Loads a classifier saved with ``save``, it predicts without running the search.
+
+        Args:
+            path: The directory path.
+
+        Returns:
+            A FedotDiseaseClassifier instance.
+        """
+        path = Path(path)
+        with open(path / cls.MANIFEST_FILE_NAME, encoding="utf8") as f:
+            manifest = json.load(f)
+
+        classifier = cls(
+            manifest["encoding"],
+            warm_start=manifest["warm_start"],
+            **manifest["options"],
+        )
+        classifier.model.load(str(path / cls.PIPELINE_DIR_NAME))
+        classifier.id2class = {i: c for i, c in enumerate(manifest["classes"])}
+
+        surrogate_path = path / cls.SURROGATE_FILE_NAME
+        if surrogate_path.exists():
+            with open(surrogate_path, "rb") as f:
+                classifier.surrogate, classifier.surrogate_score = pickle.load(f)
+
+        return classifier
+
+    def fit_surrogate(
+        self, features: np.array, predicted: Optional[np.array] = None
+    ) -> DecisionTreeClassifier:
+        """Fits a decision tree that mimics the predictions of the FEDOT pipeline.
+
+        Running the explanation machinery of FEDOT takes seconds per call, so the surrogate is fitted once
+        after ``fit`` and is kept with the model, and explanations are answered from it.
+
+        Args:
+            features: array-like, shape (n_samples, n_features)
+                Samples to fit the surrogate on, usually the training vector.
+            predicted: The predictions of the pipeline for the samples, they are computed if None.
+
+        Returns:
+            The fitted surrogate decision tree.
+        """
+        encoded = self.encode(features)
+        if predicted is None:
+            predicted = self.predict(features)
+
+        self.surrogate = DecisionTreeClassifier(
+            max_depth=self.SURROGATE_MAX_DEPTH, random_state=0
+        ).fit(encoded, predicted)
+        self.surrogate_score = self.surrogate.score(encoded, predicted)
+
+        return self.surrogate
+
+    def encode(self, features: np.array) -> np.array:
+        """Encodes symptom marks into the dense features FEDOT works with.
+
+        Args:
+            features: A dense or a sparse marks matrix.
+
+        Returns:
+            A numpy array of encoded features.
+        """
+        if sparse.issparse(features):
+            features = csr_to_marks(features)
+        elif not hasattr(features, "shape"):
+            features = np.array(features)
+
+        features = self.encoder.transform(features)
+        if sparse.issparse(features):
+            features = features.toarray()
+
+        return features
+
     def predict_proba(self, x: np.array) -> np.array:
         """Probability estimates.
 
@@ -133,21 +720,36 @@ class FedotDiseaseClassifier(BaseDiseaseClassifier):
             p: array-like, shape = [n_samples, n_classes]
                 The class probabilities of the input samples. The order of the classes corresponds to that in the attribute `classes_`.
         """
-        return self.model.predict_proba(x)
+        # Binary models return only the probability of the second class by default
+        return self.model.predict_proba(self.encode(x), probs_for_all_classes=True)
 
 
-class UrgencyClassifier(BaseEstimator):
+class UrgencyClassifier(BaseDiseaseClassifier):
     """Urgency Classifier"""
 
     def __init__(self):
         self.log_reg = LogisticRegression()
+        self._fitted_on_sparse = False
 
     def fit(self, features: np.array, y: np.array) -> "UrgencyClassifier":
+        self._fitted_on_sparse = sparse.issparse(features)
         self.log_reg.fit(features, y)
         return self
 
     def predict_proba(self, features: np.array) -> np.array:
+        features = align_marks_format(
+            features, getattr(self, "_fitted_on_sparse", False)
+        )
         return self.log_reg.predict_proba(features)
 
+    def get_classes(self) -> np.array:
+        """Gets the class labels in the order of the columns of ``predict_proba``.
+
+        Returns:
+            A numpy array of class labels.
+        """
+        return self.log_reg.classes_
+
     def predict(self, x):
+        x = align_marks_format(x, getattr(self, "_fitted_on_sparse", False))
         return self.log_reg.predict(x)
@@ -0,0 +1,141 @@
+from typing import Dict, Union
+
+import numpy as np
+from scipy import sparse
+
+from distool.feature_extraction.feature_encoder import SymptomFeatureEncoder
+from distool.feature_extraction.sparse_marks import align_marks_format
+
+
+class LinearScorer:
+    """
+    A NumPy-only inference engine of a fitted logistic regression.
+
+    ``LogisticRegression.predict_proba`` validates its input on every call, which takes longer than
+    the matrix multiply itself for a single message. The scorer keeps only the weights of the model
+    and computes the scores with one matrix product, so it doesn't import scikit-learn at serving time.
+    Sparse marks are multiplied without densifying them.
+
+    Attributes:
+        coef: The coefficients of shape (n_classes, n_features), or (1, n_features) for two classes.
+        intercept: The intercepts of shape (n_classes,), or (1,) for two classes.
+        classes: The class labels in the order of the scores.
+        encoder: The encoder of symptom marks into model features.
+    """
+
+    def __init__(
+        self,
+        coef: np.array,
+        intercept: np.array,
+        classes: np.array,
+        encoding: str = SymptomFeatureEncoder.ORDINAL,
+        fitted_on_sparse: bool = False,
+    ) -> None:
+        """Initializes a new instance of the LinearScorer class.
+
+        Args:
+            coef: The coefficients of the model.
+            intercept: The intercepts of the model.
+            classes: The class labels of the model.
+            encoding: The name of the encoding of symptom marks the model was fitted with.
+            fitted_on_sparse: A boolean indicating whether the model was fitted on sparse marks.
+        """
+        self.coef = coef
+        self.intercept = intercept
+        self.classes = np.asarray(classes)
+        self.encoder = SymptomFeatureEncoder(encoding)
+        self._fitted_on_sparse = fitted_on_sparse
+        # Transposed once, so scoring doesn't make a strided view on every call
+        self._coef_t = np.ascontiguousarray(np.asarray(coef).T)
+
+    @classmethod
+    def from_weights(
+        cls,
+        weights: Dict[str, np.array],
+        encoding: str = SymptomFeatureEncoder.ORDINAL,
+        fitted_on_sparse: bool = False,
+    ) -> "LinearScorer":
+        """Creates a scorer from the weights of ``DiseaseClassifier.get_weights``.
+
+        Args:
+            weights: A dictionary with the coefficients, the intercepts and the classes.
+            encoding: The name of the encoding of symptom marks the weights were fitted with.
+            fitted_on_sparse: A boolean indicating whether the weights were fitted on sparse marks.
+
+        Returns:
+            A LinearScorer instance.
+        """
+        return cls(
+            weights["coef"],
+            weights["intercept"],
+            weights["classes"],
+            encoding,
+            fitted_on_sparse,
+        )
+
+    def encode(
+        self, features: Union[np.array, sparse.spmatrix]
+    ) -> Union[np.array, sparse.csr_matrix]:
+        """Encodes symptom marks into the features of the model.
+
+        Args:
+            features: A dense or a sparse marks matrix of shape (n_samples, n_symptoms), or a single dense row.
+
+        Returns:
+            A numpy array or a csr matrix of shape (n_samples, n_features).
+        """
+        if not sparse.issparse(features):
+            features = np.atleast_2d(features)
+        features = align_marks_format(features, self._fitted_on_sparse)
+        return self.encoder.transform(features)
+
+    def decision_function(self, features: Union[np.array, sparse.spmatrix]) -> np.array:
+        """Computes the linear scores of samples.
+
+        Args:
+            features: A dense or a sparse marks matrix of shape (n_samples, n_symptoms), or a single dense row.
+
+        Returns:
+            A numpy array of shape (n_samples, n_classes), or (n_samples, 1) for two classes.
+        """
+        scores = self.encode(features) @ self._coef_t
+        scores += self.intercept
+        return scores
+
+    def predict_proba(self, features: Union[np.array, sparse.spmatrix]) -> np.array:
+        """Probability estimates, equal to those of the exported LogisticRegression.
+
+        Args:
+            features: A dense or a sparse marks matrix of shape (n_samples, n_symptoms), or a single dense row.
+
+        Returns:
+            A numpy array of shape (n_samples, n_classes) of class probabilities in the order of ``classes``.
+        """
+        scores = self.decision_function(features)
+
+        if scores.shape[1] == 1:
+            positive_proba = 1.0 / (1.0 + np.exp(-scores))
+            return np.hstack([1.0 - positive_proba, positive_proba])
+
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+    def predict(self, features: Union[np.array, sparse.spmatrix]) -> np.array:
+        """Predicts class labels of samples.
+
+        Args:
+            features: A dense or a sparse marks matrix of shape (n_samples, n_symptoms), or a single dense row.
+
+        Returns:
+            A numpy array of shape (n_samples,) of predicted class labels.
+        """
+        scores = self.decision_function(features)
+
+        if scores.shape[1] == 1:
+            class_ids = (scores[:, 0] > 0).astype(np.intp)
+        else:
+            class_ids = scores.argmax(axis=1)
+
+        return np.take(self.classes, class_ids)
@@ -2,10 +2,39 @@
 This page documents the classes used for extracting features from the text. It includes Anamnesis,
 DumbSymptomExtractor, SmartSymptomExtractor, Symptom, SymptomCollection, and SymptomStatus classes.
 These classes are used to extract symptoms from the text, represent them in a structured way,
-and transform them into a format suitable for machine learning models.
+and transform them into a format suitable for machine learning models. FeatureStore keeps
+the extracted features of datasets on disk.
 """
 
-from distool.feature_extraction.dumb_extractor import DumbSymptomExtractor
-from distool.feature_extraction.smart_extractor import SmartSymptomExtractor
+from typing import TYPE_CHECKING
 
-__all__ = ["SmartSymptomExtractor", "DumbSymptomExtractor"]
+from distool.base.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from distool.feature_extraction.dumb_extractor import DumbSymptomExtractor
+    from distool.feature_extraction.extraction_cache import ExtractionCache
+    from distool.feature_extraction.extractor_pool import SmartSymptomExtractorPool
+    from distool.feature_extraction.feature_encoder import SymptomFeatureEncoder
+    from distool.feature_extraction.feature_store import FeatureStore
+    from distool.feature_extraction.smart_extractor import SmartSymptomExtractor
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "DumbSymptomExtractor": "distool.feature_extraction.dumb_extractor",
+        "SmartSymptomExtractor": "distool.feature_extraction.smart_extractor",
+        "SmartSymptomExtractorPool": "distool.feature_extraction.extractor_pool",
+        "SymptomFeatureEncoder": "distool.feature_extraction.feature_encoder",
+        "ExtractionCache": "distool.feature_extraction.extraction_cache",
+        "FeatureStore": "distool.feature_extraction.feature_store",
+    },
+)
+
+__all__ = [
+    "SmartSymptomExtractor",
+    "DumbSymptomExtractor",
+    "SmartSymptomExtractorPool",
+    "SymptomFeatureEncoder",
+    "ExtractionCache",
+    "FeatureStore",
+]
@@ -0,0 +1,106 @@
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class AhoCorasickAutomaton:
+    """
+    An Aho–Corasick automaton that finds all occurrences of many patterns in a single pass over a text.
+
+    Matching costs O(len(text) + number of matches) regardless of the number of patterns,
+    and overlapping occurrences are reported as well, so the automaton finds exactly the patterns
+    for which ``pattern in text`` is True.
+
+    Attributes:
+        patterns: The list of patterns the automaton is built from.
+    """
+
+    ROOT_STATE: int = 0
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        """Initializes a new instance of the AhoCorasickAutomaton class.
+
+        Args:
+            patterns: The patterns to search for.
+        """
+        self.patterns: List[str] = list(patterns)
+
+        self._transitions: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [self.ROOT_STATE]
+        self._outputs: List[List[int]] = [[]]
+        # Empty patterns occur in every text, but they don't correspond to any transition
+        self._empty_pattern_ids: List[int] = []
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            if pattern:
+                self._add_pattern(pattern_id, pattern)
+            else:
+                self._empty_pattern_ids.append(pattern_id)
+
+        self._build_fail_links()
+
+    def _add_pattern(self, pattern_id: int, pattern: str):
+        """Adds a pattern to the trie of the automaton.
+
+        Args:
+            pattern_id: The index of the pattern.
+            pattern: The pattern.
+        """
+        state = self.ROOT_STATE
+        for char in pattern:
+            next_state = self._transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self._transitions)
+                self._transitions[state][char] = next_state
+                self._transitions.append({})
+                self._fail.append(self.ROOT_STATE)
+                self._outputs.append([])
+            state = next_state
+
+        self._outputs[state].append(pattern_id)
+
+    def _build_fail_links(self):
+        """Computes fail links in the breadth-first order and merges outputs along them."""
+        states = deque(self._transitions[self.ROOT_STATE].values())
+        while states:
+            state = states.popleft()
+            for char, next_state in self._transitions[state].items():
+                fail_state = self._fail[state]
+                while (
+                    fail_state != self.ROOT_STATE
+                    and char not in self._transitions[fail_state]
+                ):
+                    fail_state = self._fail[fail_state]
+
+                self._fail[next_state] = self._transitions[fail_state].get(
+                    char, self.ROOT_STATE
+                )
+                self._outputs[next_state] = (
+                    self._outputs[next_state] + self._outputs[self._fail[next_state]]
+                )
+                states.append(next_state)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Finds all occurrences of the patterns in the text.
+
+        Args:
+            text: The text to search in.
+
+        Yields:
+            Tuples of the pattern index and the start offset of the occurrence in the text.
+        """
+        for pattern_id in self._empty_pattern_ids:
+            yield pattern_id, 0
+
+        transitions = self._transitions
+        fail = self._fail
+        outputs = self._outputs
+        patterns = self.patterns
+
+        state = self.ROOT_STATE
+        for end, char in enumerate(text, start=1):
+            while state != self.ROOT_STATE and char not in transitions[state]:
+                state = fail[state]
+            state = transitions[state].get(char, self.ROOT_STATE)
+
+            for pattern_id in outputs[state]:
+                yield pattern_id, end - len(patterns[pattern_id])
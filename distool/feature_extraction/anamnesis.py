@@ -1,27 +1,89 @@
 from __future__ import annotations
 
-from typing import Dict, List, Tuple, Union
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
 
 import numpy as np
-from spacy.tokens import Span
 
 from distool.feature_extraction.symptom import Symptom
 from distool.feature_extraction.symptom_collection import SymptomCollection
 from distool.feature_extraction.symptom_status import SymptomStatus
 
+if TYPE_CHECKING:
+    from spacy.tokens import Span
 
-def _create_symptoms_marks() -> Dict[Symptom, SymptomStatus]:
-    return dict.fromkeys(SymptomCollection.get_symptoms(), SymptomStatus.NO_INFO)
+MARKS_DTYPE = np.int8
+
+_YES = SymptomStatus.YES.value
+_NO = SymptomStatus.NO.value
+_NO_INFO = SymptomStatus.NO_INFO.value
+_CONFUSED = SymptomStatus.CONFUSED.value
+
+
+def _create_symptoms_marks() -> np.array:
+    return np.full(len(SymptomCollection.get_symptoms()), _NO_INFO, dtype=MARKS_DTYPE)
+
+
+def _merge_status(old_value: int, new_value: int) -> int:
+    """Merges an old symptom status with a status from a new message.
+
+    Args:
+        old_value: The current status value of the symptom.
+        new_value: The status value of the symptom in the new message.
+
+    Returns:
+        The merged status value.
+    """
+    if (old_value == _YES and new_value == _NO) or (
+        old_value == _NO and new_value == _YES
+    ):
+        return _CONFUSED
+    if old_value in [_NO_INFO, _CONFUSED] and new_value != _NO_INFO:
+        return new_value
+    return old_value
+
+
+def _create_merge_table() -> np.array:
+    # Index 0 is not a status, it maps to itself to keep the table closed under composition
+    statuses = [status.value for status in SymptomStatus]
+    table = np.zeros((max(statuses) + 1, max(statuses) + 1), dtype=MARKS_DTYPE)
+    for old_value in statuses:
+        for new_value in statuses:
+            table[old_value, new_value] = _merge_status(old_value, new_value)
+
+    return table
+
+
+# Merged status value indexed by the old and the new status values
+_MERGE_TABLE: np.array = _create_merge_table()
 
 
 class Anamnesis:
     """
     Represents symptoms and it's statuses extracted from user messages.
+
+    Statuses are stored in a compact ``int8`` vector of SymptomStatus values
+    indexed by the symptom position in SymptomCollection.
     """
 
+    __slots__ = ("_marks",)
+
     def __init__(self) -> None:
         """Initializes a new instance of the Anamnesis class."""
-        self._symptoms_marks: Dict[Symptom, SymptomStatus] = _create_symptoms_marks()
+        self._marks: np.array = _create_symptoms_marks()
+
+    @classmethod
+    def from_marks(cls, marks: np.array) -> Anamnesis:
+        """Creates an Anamnesis instance from numeric symptom marks.
+
+        Args:
+            marks: A numpy array of symptom status values ordered as SymptomCollection symptoms.
+
+        Returns:
+            An Anamnesis instance.
+        """
+        anamnesis = cls.__new__(cls)
+        anamnesis._marks = np.array(marks, dtype=MARKS_DTYPE)
+        return anamnesis
 
     def update_symptom_status_by_entity(self, entity: Span):
         """Updates the status of a symptom based on a given entity.
@@ -29,18 +91,17 @@ class Anamnesis:
         Args:
             entity: A SpaCy Span object representing a symptom entity.
         """
-        entity_lemma = entity.lemma_
-        symptom = SymptomCollection.get_name_to_symptom_dict().get(entity_lemma)
-        if symptom:
-            old_value = self._symptoms_marks[symptom]
-            if (old_value == SymptomStatus.YES and not entity._.negex) or (
-                old_value == SymptomStatus.NO and entity._.negex
+        index = SymptomCollection.get_name_to_index_dict().get(entity.lemma_)
+        if index is not None:
+            old_value = self._marks[index]
+            if (old_value == _YES and not entity._.negex) or (
+                old_value == _NO and entity._.negex
             ):
-                self._symptoms_marks[symptom] = SymptomStatus.CONFUSED
-            elif old_value == SymptomStatus.NO_INFO and not entity._.negex:
-                self._symptoms_marks[symptom] = SymptomStatus.YES
-            elif old_value == SymptomStatus.NO_INFO and entity._.negex:
-                self._symptoms_marks[symptom] = SymptomStatus.NO
+                self._marks[index] = _CONFUSED
+            elif old_value == _NO_INFO and not entity._.negex:
+                self._marks[index] = _YES
+            elif old_value == _NO_INFO and entity._.negex:
+                self._marks[index] = _NO
 
     def update_symptom_status(self, symptom: Symptom):
         """Updates the status of a symptom.
@@ -48,53 +109,132 @@ class Anamnesis:
         Args:
             symptom: A Symptom object.
         """
-        if symptom in self._symptoms_marks:
-            self._symptoms_marks[symptom] = SymptomStatus.YES
+        index = SymptomCollection.get_name_to_index_dict().get(symptom.id_name)
+        if index is not None:
+            self._marks[index] = _YES
 
     def update_symptoms_statuses_by_new_anamnesis(self, new_anamnesis: Anamnesis):
         if not isinstance(new_anamnesis, Anamnesis):
             raise ValueError(
-                "Other anamnesis should be Anamnesis, but it is "
-                + new_anamnesis.__class__
+                f"Other anamnesis should be Anamnesis, but it is {new_anamnesis.__class__}"
             )
 
-        for (key, new_value) in new_anamnesis._symptoms_marks.items():
-            old_value = self._symptoms_marks[key]
-            if (old_value == SymptomStatus.YES and new_value == SymptomStatus.NO) or (
-                old_value == SymptomStatus.NO and new_value == SymptomStatus.YES
-            ):
-                self._symptoms_marks[key] = SymptomStatus.CONFUSED
-            elif (
-                old_value in [SymptomStatus.NO_INFO, SymptomStatus.CONFUSED]
-            ) and new_value != SymptomStatus.NO_INFO:
-                self._symptoms_marks[key] = new_value
+        self._marks = Anamnesis.merge_marks(self._marks, new_anamnesis._marks)
         return self
 
+    @staticmethod
+    def merge_marks(old_marks: np.array, new_marks: np.array) -> np.array:
+        """Merges symptom marks with marks of a new message by the status merge rules.
+
+        A symptom becomes CONFUSED when YES meets NO, a NO_INFO or CONFUSED status is
+        overwritten by any known new status, otherwise the old status is kept.
+
+        Args:
+            old_marks: A numpy array of current status values.
+            new_marks: A numpy array of status values of the new message, broadcastable to old_marks.
+
+        Returns:
+            A numpy array of merged status values.
+        """
+        return _MERGE_TABLE[old_marks, new_marks]
+
+    @staticmethod
+    def fold_marks(
+        marks: np.array, initial_marks: Optional[np.array] = None
+    ) -> np.array:
+        """Merges marks of all messages of a dialog into one session state.
+
+        The result is the same as merging the messages one by one with ``merge_marks``.
+        NO_INFO never changes a status, so messages and symptoms without any information are
+        dropped first, and the rest of the matrix is folded with one table lookup per message
+        vectorized over symptoms.
+
+        Args:
+            marks: A numpy array of shape (n_messages, n_symptoms) with status values of the messages in dialog order.
+            initial_marks: A numpy array with the status values before the dialog. Defaults to NO_INFO for all symptoms.
+
+        Returns:
+            A numpy array of shape (n_symptoms,) with the merged status values.
+        """
+        if initial_marks is None:
+            initial_marks = _create_symptoms_marks()
+
+        merged_marks = np.array(initial_marks, dtype=MARKS_DTYPE)
+        if len(marks) == 0:
+            return merged_marks
+
+        marks = np.asarray(marks)
+        has_info = marks != _NO_INFO
+        informative_marks = marks[has_info.any(axis=1)]
+        informative_symptoms = np.flatnonzero(has_info.any(axis=0))
+
+        symptoms_marks = merged_marks[informative_symptoms]
+        for message_marks in informative_marks[:, informative_symptoms]:
+            symptoms_marks = _MERGE_TABLE[symptoms_marks, message_marks]
+        merged_marks[informative_symptoms] = symptoms_marks
+
+        return merged_marks
+
+    @staticmethod
+    def accumulate_marks(
+        marks: np.array, initial_marks: Optional[np.array] = None
+    ) -> np.array:
+        """Merges marks of dialog messages one by one and keeps the session state after every message.
+
+        The last row of the result equals ``fold_marks`` of the same messages.
+
+        Args:
+            marks: A numpy array of shape (n_messages, n_symptoms) with status values of the messages in dialog order.
+            initial_marks: A numpy array with the status values before the messages. Defaults to NO_INFO for all symptoms.
+
+        Returns:
+            A numpy array of shape (n_messages, n_symptoms) with the session state after each message.
+        """
+        if initial_marks is None:
+            initial_marks = _create_symptoms_marks()
+
+        session_marks = np.asarray(initial_marks, dtype=MARKS_DTYPE)
+        accumulated_marks = np.empty(np.shape(marks), dtype=MARKS_DTYPE)
+        for i, message_marks in enumerate(marks):
+            session_marks = _MERGE_TABLE[session_marks, message_marks]
+            accumulated_marks[i] = session_marks
+
+        return accumulated_marks
+
     def get_symptom_status(self, symptom_name: str) -> SymptomStatus:
-        symptom = SymptomCollection.get_name_to_symptom_dict().get(symptom_name)
-        return self._symptoms_marks.get(symptom)
+        index = SymptomCollection.get_name_to_index_dict().get(symptom_name)
+        if index is None:
+            return None
+        return SymptomStatus(self._marks[index])
 
     def get_symptoms_status(self) -> List[SymptomStatus]:
-        return list(self._symptoms_marks.values())
+        return list(map(SymptomStatus, self._marks.tolist()))
 
     def __len__(self):
-        return len(self._symptoms_marks)
+        return len(self._marks)
 
     def reset(self):
-        self._symptoms_marks: Dict[Symptom, SymptomStatus] = _create_symptoms_marks()
+        # New vector, because marks returned by get_marks should not change
+        self._marks = _create_symptoms_marks()
 
     def get_marks(self, as_number: bool = True) -> Union[List[SymptomStatus], np.array]:
-        marks = list(self._symptoms_marks.values())
+        """Gets statuses of all symptoms.
 
+        Args:
+            as_number: A boolean indicating whether to return status values as a numpy array.
+
+        Returns:
+            The ``int8`` vector backing the anamnesis (without copying) or a list of SymptomStatus.
+        """
         if as_number:
-            marks = np.array([mark.value for mark in marks])
+            return self._marks
 
-        return marks
+        return self.get_symptoms_status()
 
     def get_marks_with_symptom_ids(
         self, as_number: bool = True
     ) -> List[Tuple[str, Union[SymptomStatus, int]]]:
         marks = self.get_marks(as_number)
-        symptom_ids = map(lambda x: x.id_name, list(self._symptoms_marks.keys()))
+        symptom_ids = map(lambda x: x.id_name, SymptomCollection.get_symptoms())
 
         return list(zip(symptom_ids, marks))
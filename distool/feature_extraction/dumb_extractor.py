@@ -1,10 +1,18 @@
-from concurrent.futures import ThreadPoolExecutor
-from typing import Iterable, List, Union
+from typing import Iterable, List, Tuple, Union
 
 import numpy as np
+from scipy import sparse
 
 from distool.base.estimators import BaseTransformer
+from distool.feature_extraction.aho_corasick import AhoCorasickAutomaton
 from distool.feature_extraction.anamnesis import Anamnesis
+from distool.feature_extraction.sparse_marks import (
+    DENSE_OUTPUT,
+    SPARSE_OUTPUT,
+    check_output_format,
+    rows_to_csr,
+)
+from distool.feature_extraction.symptom import Symptom
 from distool.feature_extraction.symptom_collection import SymptomCollection
 
 
@@ -12,8 +20,17 @@ class DumbSymptomExtractor(BaseTransformer):
     """A simple symptom extractor that checks for the presence of symptom names in a text.
 
     This class is a specific implementation of the BaseTransformer.
+    All symptom names are compiled into a single Aho–Corasick automaton,
+    so every message is scanned once regardless of the number of symptoms.
     """
 
+    def __init__(self) -> None:
+        """Initializes a new instance of the DumbSymptomExtractor class."""
+        self._symptoms: List[Symptom] = SymptomCollection.get_symptoms()
+        self._automaton: AhoCorasickAutomaton = AhoCorasickAutomaton(
+            symptom.id_name for symptom in self._symptoms
+        )
+
     def fit(self, x: Iterable[str]):
         """Fits the transformer according to the given training data.
 
@@ -22,6 +39,20 @@ class DumbSymptomExtractor(BaseTransformer):
         """
         pass
 
+    def find_symptoms(self, message: str) -> List[Tuple[Symptom, int]]:
+        """Finds all occurrences of symptom names in a message.
+
+        Args:
+            message: A string representing a user message.
+
+        Returns:
+            A list of tuples of the matched symptom and the start offset of its name in the message.
+        """
+        return [
+            (self._symptoms[symptom_id], start)
+            for symptom_id, start in self._automaton.iter_matches(message)
+        ]
+
     def _transform(self, message: str) -> Anamnesis:
         """Transforms a single message into an Anamnesis instance.
 
@@ -33,28 +64,39 @@ class DumbSymptomExtractor(BaseTransformer):
         """
         anamnesis: Anamnesis = Anamnesis()
 
-        for symptom in SymptomCollection.get_symptoms():
-            if symptom.id_name in message:
-                anamnesis.update_symptom_status(symptom)
+        for symptom, _ in self.find_symptoms(message):
+            anamnesis.update_symptom_status(symptom)
 
         return anamnesis
 
     def transform(
-        self, messages: List[str], as_anamnesis: bool = False
-    ) -> Union[List[Anamnesis], np.array]:
+        self,
+        messages: List[str],
+        as_anamnesis: bool = False,
+        output: str = DENSE_OUTPUT,
+    ) -> Union[List[Anamnesis], np.array, sparse.csr_matrix]:
         """Transforms a list of messages into a list of Anamnesis instances or a numpy array.
 
         Args:
             messages: A list of strings representing user messages.
             as_anamnesis: A boolean indicating whether to return the result as a list of Anamnesis instances. If False, the result is returned as a numpy array.
+            output: "dense" for a numpy array or "sparse" for a csr matrix in the encoding of ``sparse_marks``,
+                where NO_INFO is the implicit zero. Ignored if as_anamnesis is True.
 
         Returns:
-            A list of Anamnesis instances or a numpy array.
+            A list of Anamnesis instances, a numpy array or a sparse matrix.
         """
-        with ThreadPoolExecutor() as executor:
-            features = list(executor.map(self._transform, messages))
+        check_output_format(output)
+
+        # Matching is pure Python code serialized by the GIL, so there is no profit from threads
+        features = list(map(self._transform, messages))
 
-        if not as_anamnesis:
+        if output == SPARSE_OUTPUT and not as_anamnesis:
+            features = rows_to_csr(
+                (anamnesis.get_marks() for anamnesis in features),
+                len(SymptomCollection.get_symptoms()),
+            )
+        elif not as_anamnesis:
             features = np.array([anamnesis.get_marks() for anamnesis in features])
 
         return features
@@ -0,0 +1,245 @@
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from distool.feature_extraction.anamnesis import MARKS_DTYPE
+from distool.feature_extraction.symptom_collection import SymptomCollection
+
+
+class ExtractionCache:
+    """
+    A cache of symptom marks of messages with an in-memory LRU and an optional SQLite store on disk.
+
+    Entries map the hash of a normalized message to its compact marks vector. Marks depend on the
+    symptoms file, the Negex termsets and the SpaCy pipeline, so the cache is bound to the extractor
+    fingerprint. The on-disk store can be shared by extractors with different fingerprints, because
+    its entries are keyed by the fingerprint together with the message hash.
+
+    Attributes:
+        DEFAULT_MAX_MEMORY_ENTRIES: The default maximum number of entries in memory.
+        SQLITE_MAX_VARIABLES: The number of keys looked up on disk with one query.
+        fingerprint: The fingerprint of the extractor the marks are computed by.
+        path: The path of the SQLite file or None for an in-memory only cache.
+        max_memory_entries: The maximum number of entries in memory.
+    """
+
+    DEFAULT_MAX_MEMORY_ENTRIES: int = 100_000
+    SQLITE_MAX_VARIABLES: int = 500
+
+    def __init__(
+        self,
+        fingerprint: str,
+        path: Optional[Union[str, Path]] = None,
+        max_memory_entries: int = DEFAULT_MAX_MEMORY_ENTRIES,
+    ) -> None:
+        """Initializes a new instance of the ExtractionCache class.
+
+        Args:
+            fingerprint: The fingerprint of the extractor the marks are computed by.
+            path: The path of the SQLite file. The cache is kept in memory only if None.
+            max_memory_entries: The maximum number of entries in memory.
+        """
+        self.fingerprint = fingerprint
+        self.path = Path(path) if path is not None else None
+        self.max_memory_entries = max_memory_entries
+
+        self._memory: "OrderedDict[bytes, np.array]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+        self._connection: Optional[sqlite3.Connection] = None
+        if self.path is not None:
+            self._connection = self._open_connection()
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Opens the SQLite store.
+
+        Returns:
+            The SQLite connection.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Access is serialized by the lock, so the connection can be shared between threads
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        with connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS fingerprint_marks "
+                "(fingerprint TEXT, key BLOB, marks BLOB, PRIMARY KEY (fingerprint, key))"
+            )
+
+        return connection
+
+    @staticmethod
+    def normalize_message(message: str) -> str:
+        """Normalizes a message, so equal messages written differently share an entry.
+
+        Only the unicode form and the surrounding whitespace are normalized, because anything else,
+        like the case or the inner whitespace, can change the tokens SpaCy produces.
+
+        Args:
+            message: A string representing a user message.
+
+        Returns:
+            The normalized message.
+        """
+        return unicodedata.normalize("NFC", message).strip()
+
+    @staticmethod
+    def get_key(message: str) -> bytes:
+        """Gets the cache key of a message.
+
+        Args:
+            message: A string representing a user message.
+
+        Returns:
+            The sha256 digest of the normalized message.
+        """
+        normalized_message = ExtractionCache.normalize_message(message)
+        return hashlib.sha256(normalized_message.encode("utf8")).digest()
+
+    def _remember(self, key: bytes, marks: np.array):
+        self._memory[key] = marks
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _get_many(self, keys: Iterable[bytes]) -> Dict[bytes, np.array]:
+        """Looks up marks in memory and then on disk.
+
+        Args:
+            keys: The unique cache keys.
+
+        Returns:
+            A dictionary with marks of the found keys.
+        """
+        found = {}
+        disk_keys = []
+        for key in keys:
+            marks = self._memory.get(key)
+            if marks is None:
+                disk_keys.append(key)
+            else:
+                self._memory.move_to_end(key)
+                found[key] = marks
+
+        if self._connection is None:
+            return found
+
+        for start in range(0, len(disk_keys), ExtractionCache.SQLITE_MAX_VARIABLES):
+            chunk = disk_keys[start : start + ExtractionCache.SQLITE_MAX_VARIABLES]
+            rows = self._connection.execute(
+                "SELECT key, marks FROM fingerprint_marks "
+                f"WHERE fingerprint = ? AND key IN ({', '.join('?' * len(chunk))})",
+                [self.fingerprint, *chunk],
+            )
+            for key, marks_bytes in rows:
+                marks = np.frombuffer(marks_bytes, dtype=MARKS_DTYPE)
+                self._remember(key, marks)
+                found[key] = marks
+
+        return found
+
+    def _put_many(self, marks_by_key: Dict[bytes, np.array]):
+        """Stores marks in memory and on disk.
+
+        Args:
+            marks_by_key: A dictionary with marks of the cache keys.
+        """
+        for key, marks in marks_by_key.items():
+            self._remember(key, marks)
+
+        if self._connection is not None:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO fingerprint_marks VALUES (?, ?, ?)",
+                    [
+                        (
+                            self.fingerprint,
+                            key,
+                            np.asarray(marks, dtype=MARKS_DTYPE).tobytes(),
+                        )
+                        for key, marks in marks_by_key.items()
+                    ],
+                )
+
+    def get_or_compute(
+        self, messages: List[str], compute_marks: Callable[[List[str]], np.array]
+    ) -> np.array:
+        """Gets marks of messages from the cache and computes the missing ones in a single call.
+
+        Args:
+            messages: A list of strings representing user messages.
+            compute_marks: A function that transforms a list of messages into a matrix of marks.
+
+        Returns:
+            A numpy array of shape (n_messages, n_symptoms) with symptom status values.
+        """
+        keys = [ExtractionCache.get_key(message) for message in messages]
+
+        with self._lock:
+            found = self._get_many(set(keys))
+
+        # Repeated messages are computed once
+        missing_messages = {}
+        for key, message in zip(keys, messages):
+            if key not in found:
+                missing_messages.setdefault(key, message)
+
+        n_misses = sum(key not in found for key in keys)
+        if missing_messages:
+            computed_marks = compute_marks(list(missing_messages.values()))
+            computed = {
+                key: np.array(marks, dtype=MARKS_DTYPE)
+                for key, marks in zip(missing_messages, computed_marks)
+            }
+            found.update(computed)
+
+        with self._lock:
+            if missing_messages:
+                self._put_many(computed)
+            self._hits += len(keys) - n_misses
+            self._misses += n_misses
+
+        if not keys:
+            return np.empty(
+                (0, len(SymptomCollection.get_symptoms())), dtype=MARKS_DTYPE
+            )
+
+        return np.vstack([found[key] for key in keys])
+
+    def get_stats(self) -> Dict[str, int]:
+        """Gets the counters of the cache.
+
+        Returns:
+            A dictionary with the numbers of message hits and misses and of entries in memory.
+        """
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "memory_entries": len(self._memory),
+        }
+
+    def clear(self):
+        """Drops all entries of the fingerprint from memory and disk."""
+        with self._lock:
+            self._memory.clear()
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.execute(
+                        "DELETE FROM fingerprint_marks WHERE fingerprint = ?",
+                        (self.fingerprint,),
+                    )
+
+    def close(self):
+        """Closes the on-disk store, the in-memory entries remain available."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,120 @@
+import queue
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+from distool.feature_extraction.smart_extractor import SmartSymptomExtractor
+
+
+class SmartSymptomExtractorPool:
+    """
+    A bounded pool of SmartSymptomExtractor instances for concurrent callers.
+
+    SpaCy pipelines are not guaranteed to be thread-safe, so each caller borrows an extractor for
+    the time of the call and returns it to the pool afterwards. Extractors are private to the pool
+    and created lazily on demand, so the pool never holds more than ``size`` copies of the SpaCy model.
+
+    Attributes:
+        size: The maximum number of extractors in the pool.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        cache_dir: Optional[Union[str, Path]] = None,
+        use_compiled_cache: bool = True,
+    ) -> None:
+        """Initializes a new instance of the SmartSymptomExtractorPool class.
+
+        Args:
+            size: The maximum number of extractors in the pool.
+            cache_dir: The directory for compiled pipelines.
+            use_compiled_cache: A boolean indicating whether to load and save the compiled pipeline.
+        """
+        if size < 1:
+            raise ValueError(f"Pool size should be positive, but it is {size}")
+
+        self.size = size
+        self._cache_dir = cache_dir
+        self._use_compiled_cache = use_compiled_cache
+
+        self._extractors: List[SmartSymptomExtractor] = []
+        self._n_reserved = 0
+        self._available: "queue.Queue[SmartSymptomExtractor]" = queue.Queue()
+        self._lock = threading.Lock()
+
+    def _create_extractor(self) -> Optional[SmartSymptomExtractor]:
+        """Creates a new extractor if the pool is not full.
+
+        Returns:
+            The created extractor or None if the pool is full.
+        """
+        # The slot is reserved under the lock, the model is loaded outside of it
+        with self._lock:
+            if self._n_reserved >= self.size:
+                return None
+            self._n_reserved += 1
+
+        try:
+            extractor = SmartSymptomExtractor(
+                cache_dir=self._cache_dir,
+                use_compiled_cache=self._use_compiled_cache,
+            )
+        except BaseException:
+            with self._lock:
+                self._n_reserved -= 1
+            raise
+
+        with self._lock:
+            self._extractors.append(extractor)
+
+        return extractor
+
+    @contextmanager
+    def acquire(
+        self, timeout: Optional[float] = None
+    ) -> Iterator[SmartSymptomExtractor]:
+        """Borrows an extractor from the pool.
+
+        Args:
+            timeout: The maximum number of seconds to wait for a free extractor. Waits forever if None.
+
+        Yields:
+            The borrowed extractor, which is returned to the pool on exit.
+
+        Raises:
+            TimeoutError: If no extractor became free during the timeout.
+        """
+        try:
+            extractor = self._available.get_nowait()
+        except queue.Empty:
+            extractor = self._create_extractor()
+            if extractor is None:
+                try:
+                    extractor = self._available.get(timeout=timeout)
+                except queue.Empty:
+                    raise TimeoutError(
+                        f"No free extractor in the pool during {timeout} seconds"
+                    )
+
+        try:
+            yield extractor
+        finally:
+            self._available.put(extractor)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Gets the counts of the pool extractors.
+
+        Returns:
+            A dictionary with the pool size, the number of created, available and borrowed extractors.
+        """
+        created = len(self._extractors)
+        available = self._available.qsize()
+
+        return {
+            "size": self.size,
+            "created": created,
+            "available": available,
+            "in_use": created - available,
+        }
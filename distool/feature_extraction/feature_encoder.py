@@ -0,0 +1,129 @@
+from typing import Union
+
+import numpy as np
+from scipy import sparse
+
+from distool.feature_extraction.sparse_marks import marks_to_csr
+from distool.feature_extraction.symptom_status import SymptomStatus
+
+
+def _create_value_table(values: dict) -> np.array:
+    # Indexed by the status value, index 0 is the implicit zero of sparse marks
+    table = np.zeros(max(status.value for status in SymptomStatus) + 1, dtype=np.int8)
+    for status, value in values.items():
+        table[status.value] = value
+    return table
+
+
+class SymptomFeatureEncoder:
+    """
+    Encodes symptom marks into classifier features.
+
+    Status values are categories, so passing them to a linear model as numbers implies a fake order
+    of statuses. The encoder offers the following encodings:
+
+    * ``ordinal`` - the raw status values, the marks are returned as they are;
+    * ``signed`` - YES is +1, NO is -1, NO_INFO and CONFUSED are 0, one feature per symptom;
+    * ``onehot`` - a sparse indicator per symptom for each of YES, NO and CONFUSED,
+      NO_INFO is the all-zeros baseline.
+
+    Both dense marks and sparse marks of ``sparse_marks`` are accepted. The signed encoding keeps
+    the format of the input, the one-hot encoding always returns a csr matrix.
+
+    Attributes:
+        ENCODINGS: The names of the supported encodings.
+        ONEHOT_STATUSES: The statuses with an indicator feature in the one-hot encoding, in the feature order.
+        encoding: The name of the encoding.
+    """
+
+    ORDINAL: str = "ordinal"
+    SIGNED: str = "signed"
+    ONEHOT: str = "onehot"
+    ENCODINGS = (ORDINAL, SIGNED, ONEHOT)
+
+    ONEHOT_STATUSES = (SymptomStatus.YES, SymptomStatus.NO, SymptomStatus.CONFUSED)
+
+    _SIGNED_TABLE: np.array = _create_value_table(
+        {SymptomStatus.YES: 1, SymptomStatus.NO: -1}
+    )
+    # Position of the status indicator in the block of features of a symptom
+    _ONEHOT_TABLE: np.array = _create_value_table(
+        {status: i for i, status in enumerate(ONEHOT_STATUSES)}
+    )
+
+    def __init__(self, encoding: str = ORDINAL) -> None:
+        """Initializes a new instance of the SymptomFeatureEncoder class.
+
+        Args:
+            encoding: The name of the encoding, one of ENCODINGS.
+        """
+        if encoding not in self.ENCODINGS:
+            raise ValueError(
+                f"Encoding should be one of {self.ENCODINGS}, but it is {encoding!r}"
+            )
+
+        self.encoding = encoding
+
+    def get_n_features(self, n_symptoms: int) -> int:
+        """Gets the number of features produced for the given number of symptoms.
+
+        Args:
+            n_symptoms: The number of symptoms.
+
+        Returns:
+            The number of features.
+        """
+        if self.encoding == self.ONEHOT:
+            return n_symptoms * len(self.ONEHOT_STATUSES)
+        return n_symptoms
+
+    def transform(
+        self, marks: Union[np.array, sparse.spmatrix]
+    ) -> Union[np.array, sparse.csr_matrix]:
+        """Encodes symptom marks.
+
+        Args:
+            marks: A dense or a sparse marks matrix of shape (n_samples, n_symptoms).
+
+        Returns:
+            A numpy array or a csr matrix of shape (n_samples, n_features).
+        """
+        if self.encoding == self.ORDINAL:
+            return marks
+
+        if self.encoding == self.SIGNED:
+            return self._transform_signed(marks)
+
+        return self._transform_onehot(marks)
+
+    def _transform_signed(
+        self, marks: Union[np.array, sparse.spmatrix]
+    ) -> Union[np.array, sparse.csr_matrix]:
+        if not sparse.issparse(marks):
+            return self._SIGNED_TABLE[np.asarray(marks)]
+
+        features = sparse.csr_matrix(marks, copy=True)
+        features.data = self._SIGNED_TABLE[features.data]
+        # CONFUSED becomes an explicit zero, which should not be stored
+        features.eliminate_zeros()
+        return features
+
+    def _transform_onehot(
+        self, marks: Union[np.array, sparse.spmatrix]
+    ) -> sparse.csr_matrix:
+        if sparse.issparse(marks):
+            marks = sparse.csr_matrix(marks, copy=True)
+            marks.eliminate_zeros()
+        else:
+            marks = marks_to_csr(marks)
+
+        n_samples, n_symptoms = marks.shape
+        # Every stored mark turns into exactly one indicator, so the row structure is kept
+        indices = (
+            marks.indices * len(self.ONEHOT_STATUSES) + self._ONEHOT_TABLE[marks.data]
+        )
+
+        return sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int8), indices, marks.indptr.copy()),
+            shape=(n_samples, self.get_n_features(n_symptoms)),
+        )
@@ -0,0 +1,378 @@
+import hashlib
+import json
+import shutil
+import struct
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+
+from distool.feature_extraction.anamnesis import MARKS_DTYPE
+from distool.feature_extraction.extraction_cache import ExtractionCache
+from distool.feature_extraction.feature_encoder import SymptomFeatureEncoder
+from distool.feature_extraction.sparse_marks import (
+    DENSE_OUTPUT,
+    SPARSE_OUTPUT,
+    align_marks_format,
+    check_output_format,
+)
+from distool.feature_extraction.symptom_collection import SymptomCollection
+from distool.feature_extraction.symptom_status import SymptomStatus
+
+# Headers have a fixed length, so they are rewritten in place when rows are appended
+_NPY_HEADER_LENGTH = 128
+
+
+def _write_npy_header(f, dtype: np.dtype, shape: Tuple[int, ...]):
+    """Writes a .npy version 1.0 header of the fixed length at the start of a file."""
+    header = repr(
+        {
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": False,
+            "shape": shape,
+        }
+    )
+    preamble = np.lib.format.magic(1, 0)
+    header_length = _NPY_HEADER_LENGTH - len(preamble) - 2
+
+    f.seek(0)
+    f.write(preamble)
+    f.write(struct.pack("<H", header_length))
+    f.write((header.ljust(header_length - 1) + "\n").encode("latin1"))
+
+
+def _write_npy_rows(path: Path, rows: np.array, start: int):
+    """Writes rows into an appendable .npy file after its first ``start`` rows.
+
+    Anything stored after the first ``start`` rows, like rows of an interrupted append, is overwritten.
+    """
+    row_shape = rows.shape[1:]
+    row_size = rows.dtype.itemsize * int(np.prod(row_shape, dtype=np.int64))
+
+    with open(path, "r+b" if path.exists() else "w+b") as f:
+        f.seek(_NPY_HEADER_LENGTH + start * row_size)
+        f.write(np.ascontiguousarray(rows).tobytes())
+        f.truncate()
+        _write_npy_header(f, rows.dtype, (start + len(rows), *row_shape))
+
+
+def _open_npy(path: Path, n_rows: int) -> np.array:
+    """Memory-maps the first rows of an appendable .npy file read-only."""
+    return np.load(path, mmap_mode="r")[:n_rows]
+
+
+class FeatureStore:
+    """
+    A store of feature matrices of datasets in memory-mapped .npy files.
+
+    An entry is identified by the dataset and the extractor fingerprints, the encoding and the format
+    of the encoded marks, and keeps the features of the dataset rows in order. Reading an entry maps its files without copying them,
+    and when the dataset grows only its new rows are computed and appended to the files.
+
+    Dense features are stored in one 2D array. Sparse features are stored as the ``data``, ``indices``
+    and ``indptr`` arrays of a csr matrix. The hashes of the row messages are stored next to the features,
+    so an entry whose rows don't match the dataset is rebuilt instead of returning wrong features.
+    The manifest with the numbers of rows is written after the arrays, so an interrupted append
+    is ignored by readers and overwritten by the next append.
+
+    Attributes:
+        MANIFEST_FILE_NAME: The file name of the entry manifest.
+        ROW_HASHES_FILE_NAME: The file name of the hashes of the row messages.
+        DENSE_FILE_NAME: The file name of dense features.
+        SPARSE_FILE_NAMES: The file names of the csr arrays of sparse features.
+        path: The root directory of the store.
+    """
+
+    MANIFEST_FILE_NAME: str = "manifest.json"
+    ROW_HASHES_FILE_NAME: str = "row_hashes.npy"
+    DENSE_FILE_NAME: str = "features.npy"
+    SPARSE_FILE_NAMES: Dict[str, str] = {
+        "data": "data.npy",
+        "indices": "indices.npy",
+        "indptr": "indptr.npy",
+    }
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Initializes a new instance of the FeatureStore class.
+
+        Args:
+            path: The root directory of the store, it is created if it doesn't exist.
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def get_key(
+        dataset_fingerprint: str,
+        extractor_fingerprint: str,
+        encoding: str,
+        output: str = DENSE_OUTPUT,
+    ) -> str:
+        """Gets the key of an entry.
+
+        Args:
+            dataset_fingerprint: The identifier of the dataset, it should stay the same when the dataset grows.
+            extractor_fingerprint: The fingerprint of the extractor the marks are computed by.
+            encoding: The name of the encoding of marks into features.
+            output: The format of the marks the features are encoded from, "dense" or "sparse".
+
+        Returns:
+            A hex digest of the fingerprints.
+        """
+        fingerprints = json.dumps(
+            [dataset_fingerprint, extractor_fingerprint, encoding, output]
+        )
+        return hashlib.sha256(fingerprints.encode("utf8")).hexdigest()
+
+    @staticmethod
+    def get_row_hashes(messages: Sequence[str]) -> np.array:
+        """Gets the hashes of messages the rows of an entry are checked by.
+
+        Args:
+            messages: The messages of the dataset rows.
+
+        Returns:
+            A numpy array of uint64 hashes of the normalized messages.
+        """
+        digests = b"".join(ExtractionCache.get_key(message)[:8] for message in messages)
+        return np.frombuffer(digests, dtype="<u8")
+
+    def _get_entry_path(
+        self,
+        dataset_fingerprint: str,
+        extractor_fingerprint: str,
+        encoding: str,
+        output: str,
+    ) -> Path:
+        return self.path / self.get_key(
+            dataset_fingerprint, extractor_fingerprint, encoding, output
+        )
+
+    @classmethod
+    def _read_manifest(cls, entry_path: Path) -> Optional[Dict[str, Any]]:
+        manifest_path = entry_path / cls.MANIFEST_FILE_NAME
+        if not manifest_path.exists():
+            return None
+
+        with open(manifest_path, encoding="utf8") as f:
+            return json.load(f)
+
+    @classmethod
+    def _write_manifest(cls, entry_path: Path, manifest: Dict[str, Any]):
+        temp_path = entry_path / (cls.MANIFEST_FILE_NAME + ".tmp")
+        with open(temp_path, "w", encoding="utf8") as f:
+            json.dump(manifest, f)
+        temp_path.replace(entry_path / cls.MANIFEST_FILE_NAME)
+
+    @classmethod
+    def _open_features(
+        cls, entry_path: Path, manifest: Dict[str, Any]
+    ) -> Union[np.array, sparse.csr_matrix]:
+        n_rows = manifest["n_rows"]
+        if manifest["features_format"] == DENSE_OUTPUT:
+            return _open_npy(entry_path / cls.DENSE_FILE_NAME, n_rows)
+
+        nnz = manifest["nnz"]
+        return sparse.csr_matrix(
+            (
+                _open_npy(entry_path / cls.SPARSE_FILE_NAMES["data"], nnz),
+                _open_npy(entry_path / cls.SPARSE_FILE_NAMES["indices"], nnz),
+                _open_npy(entry_path / cls.SPARSE_FILE_NAMES["indptr"], n_rows + 1),
+            ),
+            shape=(n_rows, manifest["n_columns"]),
+            copy=False,
+        )
+
+    def read(
+        self,
+        dataset_fingerprint: str,
+        extractor_fingerprint: str,
+        encoding: str,
+        output: str = DENSE_OUTPUT,
+    ) -> Optional[Tuple[Union[np.array, sparse.csr_matrix], np.array]]:
+        """Reads an entry without copying its files into memory.
+
+        Args:
+            dataset_fingerprint: The identifier of the dataset.
+            extractor_fingerprint: The fingerprint of the extractor the marks are computed by.
+            encoding: The name of the encoding of marks into features.
+            output: The format of the marks the features are encoded from, "dense" or "sparse".
+
+        Returns:
+            A tuple of the memory-mapped features and row hashes, or None if there is no entry.
+        """
+        entry_path = self._get_entry_path(
+            dataset_fingerprint, extractor_fingerprint, encoding, output
+        )
+        manifest = self._read_manifest(entry_path)
+        if manifest is None:
+            return None
+
+        row_hashes = _open_npy(
+            entry_path / self.ROW_HASHES_FILE_NAME, manifest["n_rows"]
+        )
+        return self._open_features(entry_path, manifest), row_hashes
+
+    def append(
+        self,
+        dataset_fingerprint: str,
+        extractor_fingerprint: str,
+        encoding: str,
+        features: Union[np.array, sparse.spmatrix],
+        row_hashes: np.array,
+        output: str = DENSE_OUTPUT,
+    ):
+        """Appends rows of features to an entry, the entry is created if it doesn't exist.
+
+        Args:
+            dataset_fingerprint: The identifier of the dataset.
+            extractor_fingerprint: The fingerprint of the extractor the marks are computed by.
+            encoding: The name of the encoding of marks into features.
+            features: A dense or a sparse matrix of features of the new rows.
+            row_hashes: The hashes of the messages of the new rows from ``get_row_hashes``.
+            output: The format of the marks the features are encoded from, "dense" or "sparse".
+        """
+        entry_path = self._get_entry_path(
+            dataset_fingerprint, extractor_fingerprint, encoding, output
+        )
+        entry_path.mkdir(parents=True, exist_ok=True)
+
+        features_format = SPARSE_OUTPUT if sparse.issparse(features) else DENSE_OUTPUT
+        manifest = self._read_manifest(entry_path) or {
+            "dataset_fingerprint": dataset_fingerprint,
+            "extractor_fingerprint": extractor_fingerprint,
+            "encoding": encoding,
+            "output": output,
+            "features_format": features_format,
+            "n_columns": features.shape[1],
+            "n_rows": 0,
+            "nnz": 0,
+        }
+        if (
+            manifest["features_format"] != features_format
+            or manifest["n_columns"] != features.shape[1]
+        ):
+            raise ValueError(
+                f"Entry has {manifest['features_format']} features with {manifest['n_columns']} columns, "
+                f"but the appended ones are {features_format} with {features.shape[1]} columns"
+            )
+
+        n_rows, nnz = manifest["n_rows"], manifest["nnz"]
+        if features_format == DENSE_OUTPUT:
+            _write_npy_rows(
+                entry_path / self.DENSE_FILE_NAME, np.asarray(features), n_rows
+            )
+        else:
+            features = sparse.csr_matrix(features)
+            # scipy copies index arrays of other dtypes into int32 ones when they fit
+            if nnz + features.nnz > np.iinfo(np.int32).max:
+                raise ValueError("Entry can't store more than 2**31 - 1 nonzero values")
+            indptr = (features.indptr.astype(np.int64) + nnz).astype(np.int32)
+            # The first pointer of the appended rows is the last pointer of the stored ones
+            indptr_start = n_rows + 1 if n_rows else 0
+            arrays = {
+                "data": (features.data, nnz),
+                "indices": (features.indices.astype(np.int32), nnz),
+                "indptr": (indptr if not n_rows else indptr[1:], indptr_start),
+            }
+            for name, (array, start) in arrays.items():
+                _write_npy_rows(entry_path / self.SPARSE_FILE_NAMES[name], array, start)
+            manifest["nnz"] = nnz + features.nnz
+
+        _write_npy_rows(
+            entry_path / self.ROW_HASHES_FILE_NAME,
+            np.asarray(row_hashes, dtype="<u8"),
+            n_rows,
+        )
+
+        manifest["n_rows"] = n_rows + features.shape[0]
+        self._write_manifest(entry_path, manifest)
+
+    def delete(
+        self,
+        dataset_fingerprint: str,
+        extractor_fingerprint: str,
+        encoding: str,
+        output: str = DENSE_OUTPUT,
+    ):
+        """Deletes an entry.
+
+        Args:
+            dataset_fingerprint: The identifier of the dataset.
+            extractor_fingerprint: The fingerprint of the extractor the marks are computed by.
+            encoding: The name of the encoding of marks into features.
+            output: The format of the marks the features are encoded from, "dense" or "sparse".
+        """
+        shutil.rmtree(
+            self._get_entry_path(
+                dataset_fingerprint, extractor_fingerprint, encoding, output
+            ),
+            ignore_errors=True,
+        )
+
+    def get_or_compute(
+        self,
+        messages: Sequence[str],
+        compute_marks: Callable[[List[str]], Union[np.array, sparse.spmatrix]],
+        dataset_fingerprint: str,
+        extractor_fingerprint: str,
+        encoding: str = SymptomFeatureEncoder.ORDINAL,
+        output: str = DENSE_OUTPUT,
+    ) -> Union[np.array, sparse.csr_matrix]:
+        """Gets the features of the dataset messages, only messages added after the stored ones are computed.
+
+        Args:
+            messages: The messages of the dataset rows, a grown dataset should keep the order of its old rows.
+            compute_marks: A function that extracts dense or sparse marks of messages.
+            dataset_fingerprint: The identifier of the dataset, it should stay the same when the dataset grows.
+            extractor_fingerprint: The fingerprint of the extractor ``compute_marks`` uses.
+            encoding: The name of the encoding of marks into features.
+            output: The format the marks are converted to before encoding, "dense" or "sparse".
+                Features of the one-hot encoding are always sparse.
+
+        Returns:
+            The memory-mapped features of all messages.
+        """
+        check_output_format(output)
+        encoder = SymptomFeatureEncoder(encoding)
+        messages = list(messages)
+        if not messages:
+            marks = np.full(
+                (0, len(SymptomCollection.get_symptoms())),
+                SymptomStatus.NO_INFO.value,
+                dtype=MARKS_DTYPE,
+            )
+            return encoder.transform(align_marks_format(marks, output == SPARSE_OUTPUT))
+
+        row_hashes = self.get_row_hashes(messages)
+        entry = (dataset_fingerprint, extractor_fingerprint, encoding, output)
+
+        stored = self.read(*entry)
+        n_stored_rows = 0
+        if stored is not None:
+            stored_row_hashes = stored[1]
+            n_stored_rows = len(stored_row_hashes)
+            # The entry is rebuilt if its rows are not the first rows of the dataset
+            if n_stored_rows > len(messages) or not np.array_equal(
+                stored_row_hashes, row_hashes[:n_stored_rows]
+            ):
+                self.delete(*entry)
+                n_stored_rows = 0
+
+        if n_stored_rows < len(messages):
+            marks = compute_marks(messages[n_stored_rows:])
+            features = encoder.transform(
+                align_marks_format(marks, output == SPARSE_OUTPUT)
+            )
+            self.append(
+                dataset_fingerprint,
+                extractor_fingerprint,
+                encoding,
+                features,
+                row_hashes[n_stored_rows:],
+                output,
+            )
+
+        features, _ = self.read(*entry)
+        return features
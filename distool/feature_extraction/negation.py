@@ -0,0 +1,177 @@
+from bisect import bisect_right
+from typing import Dict, List, Tuple
+
+from spacy.language import Language
+from spacy.tokens import Doc, Span
+
+# Kinds of termset phrases
+_PSEUDO = "pseudo_negations"
+_PRECEDING = "preceding_negations"
+_FOLLOWING = "following_negations"
+_TERMINATION = "termination"
+
+TERMSET_KEYS = (_PSEUDO, _PRECEDING, _FOLLOWING, _TERMINATION)
+
+
+@Language.factory(
+    "native_negex",
+    default_config={
+        "neg_termset": {key: [] for key in TERMSET_KEYS},
+        "ent_types": [],
+        "extension_name": "negex",
+        "chunk_prefix": [],
+    },
+)
+class NegationScopeDetector:
+    """
+    A SpaCy pipeline component that marks negated entities with the rules of the Negex component of negspacy.
+
+    The termset phrases are compiled once into a trie over lowercased tokens, and the negation scope
+    of all entities of a doc is computed in a single pass over the doc tokens instead of scanning
+    the found phrases for every entity. The config and the results are the same as of Negex:
+
+    * a phrase that starts inside a pseudo negation (its end inclusive) is ignored;
+    * a doc is split into chunks at sentence starts and termination phrase starts;
+    * an entity which lies inside a chunk is negated if a preceding negation of the chunk starts before it,
+      or a following negation of the chunk ends after it, or its text starts with a chunk prefix.
+
+    Attributes:
+        ent_types: The entity labels to negate, all labels if empty.
+        extension_name: The name of the boolean Span extension set for negated entities.
+    """
+
+    def __init__(
+        self,
+        nlp: Language,
+        name: str,
+        neg_termset: Dict[str, List[str]],
+        ent_types: List[str],
+        extension_name: str,
+        chunk_prefix: List[str],
+    ) -> None:
+        """Initializes a new instance of the NegationScopeDetector class.
+
+        Args:
+            nlp: The SpaCy pipeline the component is added to.
+            name: The name of the component.
+            neg_termset: A dictionary with lists of pseudo, preceding, following negation and termination phrases.
+            ent_types: The entity labels to negate, all labels if empty.
+            extension_name: The name of the boolean Span extension set for negated entities.
+            chunk_prefix: Phrases that negate an entity whose text starts with them.
+        """
+        if set(neg_termset) != set(TERMSET_KEYS):
+            raise KeyError(
+                f"Unexpected or missing keys in 'neg_termset', expected: {list(TERMSET_KEYS)}, "
+                f"instead got: {list(neg_termset)}"
+            )
+
+        if not Span.has_extension(extension_name):
+            Span.set_extension(extension_name, default=False, force=True)
+
+        self.ent_types = set(ent_types)
+        self.extension_name = extension_name
+        self._chunk_prefix = [
+            prefix_doc.text.lower() for prefix_doc in nlp.tokenizer.pipe(chunk_prefix)
+        ]
+
+        # A node is a pair of children by the lowercased token and kinds of phrases ending at the node
+        self._trie: Tuple[Dict, set] = ({}, set())
+        for kind in TERMSET_KEYS:
+            for phrase_doc in nlp.tokenizer.pipe(neg_termset[kind]):
+                self._add_phrase([token.lower_ for token in phrase_doc], kind)
+
+    def _add_phrase(self, tokens: List[str], kind: str):
+        if not tokens:
+            return
+
+        node = self._trie
+        for token in tokens:
+            node = node[0].setdefault(token, ({}, set()))
+        node[1].add(kind)
+
+    def _find_phrases(self, doc: Doc) -> List[Tuple[str, int, int]]:
+        """Finds all occurrences of the termset phrases in a doc.
+
+        Args:
+            doc: A SpaCy doc.
+
+        Returns:
+            A list of tuples of the phrase kind, the start and the end token indexes.
+        """
+        lowers = [token.lower_ for token in doc]
+        matches = []
+        for start in range(len(lowers)):
+            node = self._trie
+            for end in range(start, len(lowers)):
+                node = node[0].get(lowers[end])
+                if node is None:
+                    break
+                for kind in node[1]:
+                    matches.append((kind, start, end + 1))
+
+        return matches
+
+    def __call__(self, doc: Doc) -> Doc:
+        """Marks negated entities of a doc.
+
+        Args:
+            doc: A SpaCy doc with entities and sentence boundaries.
+
+        Returns:
+            The same doc.
+        """
+        if not doc.ents:
+            return doc
+
+        n_tokens = len(doc)
+        matches = self._find_phrases(doc)
+
+        # Phrases starting inside a pseudo negation, including its end, are ignored
+        pseudo_covered = [False] * (n_tokens + 1)
+        for kind, start, end in matches:
+            if kind == _PSEUDO:
+                for position in range(start, end + 1):
+                    pseudo_covered[position] = True
+
+        chunk_starts = {sent.start for sent in doc.sents}
+        chunk_starts.update(
+            start
+            for kind, start, _ in matches
+            if kind == _TERMINATION and not pseudo_covered[start]
+        )
+        chunk_starts = sorted(chunk_starts)
+        chunk_ends = chunk_starts[1:] + [n_tokens]
+
+        # The earliest preceding negation start and the latest following negation end of every chunk
+        first_preceding_starts = [n_tokens] * len(chunk_starts)
+        last_following_ends = [0] * len(chunk_starts)
+        for kind, start, end in matches:
+            if pseudo_covered[start] or kind not in (_PRECEDING, _FOLLOWING):
+                continue
+            chunk = bisect_right(chunk_starts, start) - 1
+            if kind == _PRECEDING:
+                first_preceding_starts[chunk] = min(
+                    first_preceding_starts[chunk], start
+                )
+            else:
+                last_following_ends[chunk] = max(last_following_ends[chunk], end)
+
+        for entity in doc.ents:
+            if self.ent_types and entity.label_ not in self.ent_types:
+                continue
+
+            chunk = bisect_right(chunk_starts, entity.start) - 1
+            if chunk < 0 or entity.end > chunk_ends[chunk]:
+                continue
+
+            if (
+                first_preceding_starts[chunk] < entity.start
+                or last_following_ends[chunk] > entity.end
+                or any(
+                    entity.text.lower().startswith(prefix)
+                    for prefix in self._chunk_prefix
+                )
+            ):
+                entity._.set(self.extension_name, True)
+
+        return doc
@@ -1,16 +1,42 @@
-from concurrent.futures import ThreadPoolExecutor
-from typing import Iterable, List, Union
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import spacy
 from negspacy.negation import Negex
+from scipy import sparse
 from spacy import Language
 from spacy.tokens import Doc
 
 from distool.base.estimators import BaseTransformer
-from distool.feature_extraction.anamnesis import Anamnesis
+from distool.feature_extraction.anamnesis import MARKS_DTYPE, Anamnesis
+from distool.feature_extraction.extraction_cache import ExtractionCache
+
+# Registers the native_negex spaCy factory
+from distool.feature_extraction.negation import NegationScopeDetector  # noqa: F401
+from distool.feature_extraction.sparse_marks import (
+    DENSE_OUTPUT,
+    SPARSE_OUTPUT,
+    check_output_format,
+    marks_to_csr,
+    rows_to_csr,
+)
 from distool.feature_extraction.symptom_collection import SymptomCollection
 
+# Registers the symptom_matcher spaCy factory
+from distool.feature_extraction.symptom_matcher import SymptomMatcher  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
 
 class SmartSymptomExtractor(BaseTransformer):
     """
@@ -20,16 +46,50 @@ class SmartSymptomExtractor(BaseTransformer):
 
     Attributes:
         SPACY_LANG_MODEL_NAME: The name of the SpaCy language model to use.
+        SPACY_DISABLED_PIPES: The pipes of the SpaCy language model that are not used for extraction.
         NEGEX_EXTENSION_NAME: The name of the Negex extension.
+        NEGEX_FACTORY: The factory of the Negex component of negspacy.
+        NATIVE_NEGEX_FACTORY: The factory of the built-in negation component with the same rules as Negex.
+        NEGATION_FACTORIES: The factories that can be used for the negation pipe.
+        ENTITY_RULER_FACTORY: The factory of the SpaCy entity ruler.
+        SYMPTOM_MATCHER_FACTORY: The factory of the built-in symptom matcher with compiled lemma patterns.
+        MATCHER_FACTORIES: The factories that can be used for the symptom matching pipe.
+        MATCHING_PIPES: The pipes that find and negate symptoms, skipped for messages without symptom lemmas.
+        CACHE_DIR_ENV_NAME: The environment variable that overrides the default cache directory.
+        DEFAULT_CACHE_DIR: The default directory for compiled extractor pipelines.
+        COMPILED_PIPELINES_DIR_NAME: The subdirectory of the cache directory with compiled pipelines.
+        EXTRACTION_CACHE_FILE_NAME: The file of the cache directory with cached marks of messages.
+        DEFAULT_BATCH_SIZE: The default number of messages processed at once.
         pseudo_negations: A list of phrases that are considered pseudo negations.
         preceding_negations: A list of phrases that are considered preceding negations.
         following_negations: A list of phrases that are considered following negations.
         termination: A list of phrases that are considered termination phrases.
         russian_termset: A dictionary containing the Russian termset for Negex.
+        extraction_cache: The cache of marks of already transformed messages or None if it is disabled.
     """
 
     SPACY_LANG_MODEL_NAME: str = "ru_core_news_md"
+    SPACY_DISABLED_PIPES: List[str] = [
+        "tok2vec",
+        "morphologizer",
+        "attribute_ruler",
+        "ner",
+    ]
     NEGEX_EXTENSION_NAME: str = "negex"
+    NEGEX_FACTORY: str = "negex"
+    NATIVE_NEGEX_FACTORY: str = "native_negex"
+    NEGATION_FACTORIES: Tuple[str, ...] = (NEGEX_FACTORY, NATIVE_NEGEX_FACTORY)
+    ENTITY_RULER_FACTORY: str = "entity_ruler"
+    SYMPTOM_MATCHER_FACTORY: str = "symptom_matcher"
+    MATCHER_FACTORIES: Tuple[str, ...] = (SYMPTOM_MATCHER_FACTORY, ENTITY_RULER_FACTORY)
+    MATCHING_PIPES: List[str] = ["entity_ruler", "negex"]
+
+    CACHE_DIR_ENV_NAME: str = "DISTOOL_CACHE_DIR"
+    DEFAULT_CACHE_DIR: Path = Path.home() / ".cache" / "distool"
+    COMPILED_PIPELINES_DIR_NAME: str = "compiled_extractors"
+    EXTRACTION_CACHE_FILE_NAME: str = "extractions.sqlite3"
+
+    DEFAULT_BATCH_SIZE: int = 1000
 
     # Following list of words is auto-translated list of words from negspacy/termsets.py
     pseudo_negations = [
@@ -106,15 +166,222 @@ class SmartSymptomExtractor(BaseTransformer):
         "termination": termination,
     }
 
-    def __init__(self) -> None:
-        """Initializes a new instance of the SmartSymptomExtractor class."""
-        self._spacy_lang_model: Language = spacy.load(
+    _shared_instances: Dict[Tuple, "SmartSymptomExtractor"] = {}
+    _shared_instances_lock: threading.Lock = threading.Lock()
+    _live_instances: "weakref.WeakSet[SmartSymptomExtractor]" = weakref.WeakSet()
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        use_compiled_cache: bool = True,
+        use_extraction_cache: bool = False,
+        use_lemma_prefilter: bool = True,
+        negation_factory: str = NEGEX_FACTORY,
+        matcher_factory: str = SYMPTOM_MATCHER_FACTORY,
+    ) -> None:
+        """Initializes a new instance of the SmartSymptomExtractor class.
+
+        Building the pipeline (loading the SpaCy model, validating and adding every symptom pattern and
+        configuring Negex) is slow, so the built pipeline is saved to the cache directory as a compiled
+        artifact and later constructions load it instead of rebuilding. The artifact is keyed by
+        the extractor fingerprint, so any change of the symptoms file or the termsets invalidates it.
+
+        Args:
+            cache_dir: The directory for compiled pipelines. Defaults to the ``DISTOOL_CACHE_DIR``
+                environment variable or ``~/.cache/distool``.
+            use_compiled_cache: A boolean indicating whether to load and save the compiled pipeline.
+            use_extraction_cache: A boolean indicating whether to cache marks of transformed messages
+                in memory and in the cache directory, so repeated messages are not parsed again.
+            use_lemma_prefilter: A boolean indicating whether to skip the entity ruler and Negex for messages
+                without any lemma a symptom pattern starts with.
+            negation_factory: The factory of the negation pipe, one of NEGATION_FACTORIES.
+                ``native_negex`` gives the same results as Negex in a single pass over the doc.
+            matcher_factory: The factory of the symptom matching pipe, one of MATCHER_FACTORIES.
+                ``symptom_matcher`` gives the same results as the entity ruler, but matches lemma patterns
+                in time independent of the number of patterns.
+        """
+        if negation_factory not in SmartSymptomExtractor.NEGATION_FACTORIES:
+            raise ValueError(
+                f"Negation factory should be one of {SmartSymptomExtractor.NEGATION_FACTORIES}, "
+                f"but it is {negation_factory!r}"
+            )
+        if matcher_factory not in SmartSymptomExtractor.MATCHER_FACTORIES:
+            raise ValueError(
+                f"Matcher factory should be one of {SmartSymptomExtractor.MATCHER_FACTORIES}, "
+                f"but it is {matcher_factory!r}"
+            )
+
+        self._cache_dir: Path = SmartSymptomExtractor.get_cache_dir(cache_dir)
+        self._use_compiled_cache: bool = use_compiled_cache
+        self._negation_factory: str = negation_factory
+        self._matcher_factory: str = matcher_factory
+
+        if use_compiled_cache:
+            self._spacy_lang_model: Language = self._load_compiled_lang_model()
+        else:
+            self._spacy_lang_model: Language = self._build_lang_model()
+
+        self._use_lemma_prefilter: bool = use_lemma_prefilter
+        self._messages_count: int = 0
+        self._fast_path_messages_count: int = 0
+
+        self.extraction_cache: Optional[ExtractionCache] = None
+        if use_extraction_cache:
+            self.extraction_cache = ExtractionCache(
+                self.fingerprint(negation_factory, matcher_factory),
+                path=self._cache_dir / SmartSymptomExtractor.EXTRACTION_CACHE_FILE_NAME,
+            )
+
+        SmartSymptomExtractor._live_instances.add(self)
+
+    @classmethod
+    def shared(
+        cls,
+        cache_dir: Optional[Union[str, Path]] = None,
+        use_compiled_cache: bool = True,
+        use_lemma_prefilter: bool = True,
+        negation_factory: str = NEGEX_FACTORY,
+        matcher_factory: str = SYMPTOM_MATCHER_FACTORY,
+    ) -> "SmartSymptomExtractor":
+        """Gets the process-wide extractor instance for the given options.
+
+        Every extractor holds its own copy of the SpaCy model vectors, so the places of a service that need
+        an extractor should reuse the shared one instead of constructing a new instance. The instance is
+        created once per options and fingerprint; concurrent first calls wait for a single construction.
+        For concurrent extraction from many threads use ``SmartSymptomExtractorPool``.
+
+        Args:
+            cache_dir: The directory for compiled pipelines.
+            use_compiled_cache: A boolean indicating whether to load and save the compiled pipeline.
+            use_lemma_prefilter: A boolean indicating whether to skip the entity ruler and Negex for messages
+                without any lemma a symptom pattern starts with.
+            negation_factory: The factory of the negation pipe.
+            matcher_factory: The factory of the symptom matching pipe.
+
+        Returns:
+            The shared SmartSymptomExtractor instance.
+        """
+        key = (
+            str(cls.get_cache_dir(cache_dir)),
+            use_compiled_cache,
+            use_lemma_prefilter,
+            cls.fingerprint(negation_factory, matcher_factory),
+        )
+        with cls._shared_instances_lock:
+            instance = cls._shared_instances.get(key)
+            if instance is None:
+                instance = cls(
+                    cache_dir=cache_dir,
+                    use_compiled_cache=use_compiled_cache,
+                    use_lemma_prefilter=use_lemma_prefilter,
+                    negation_factory=negation_factory,
+                    matcher_factory=matcher_factory,
+                )
+                cls._shared_instances[key] = instance
+
+        return instance
+
+    @classmethod
+    def clear_shared(cls):
+        """Drops the shared instances, so they can be garbage collected."""
+        with cls._shared_instances_lock:
+            cls._shared_instances.clear()
+
+    @classmethod
+    def get_instances_stats(cls) -> Dict[str, int]:
+        """Gets the counts and the memory held by the extractor instances of the process.
+
+        Returns:
+            A dictionary with the number of live and shared instances and the total size in bytes
+            of the SpaCy model vectors held by the live instances.
+        """
+        live_instances = list(cls._live_instances)
+        vectors_by_id = {
+            id(
+                instance._spacy_lang_model.vocab.vectors
+            ): instance._spacy_lang_model.vocab.vectors
+            for instance in live_instances
+        }
+        vectors_bytes = sum(vectors.data.nbytes for vectors in vectors_by_id.values())
+
+        return {
+            "live_instances": len(live_instances),
+            "shared_instances": len(cls._shared_instances),
+            "vectors_bytes": int(vectors_bytes),
+        }
+
+    @classmethod
+    def get_cache_dir(cls, cache_dir: Optional[Union[str, Path]] = None) -> Path:
+        """Gets the directory for compiled extractor artifacts.
+
+        Args:
+            cache_dir: The explicitly requested cache directory.
+
+        Returns:
+            The cache directory path.
+        """
+        if cache_dir is None:
+            cache_dir = os.environ.get(cls.CACHE_DIR_ENV_NAME, cls.DEFAULT_CACHE_DIR)
+
+        return Path(cache_dir)
+
+    @classmethod
+    def fingerprint(
+        cls,
+        negation_factory: str = NEGEX_FACTORY,
+        matcher_factory: str = SYMPTOM_MATCHER_FACTORY,
+    ) -> str:
+        """Gets the fingerprint of everything the extraction pipeline is built from.
+
+        Args:
+            negation_factory: The factory of the negation pipe.
+            matcher_factory: The factory of the symptom matching pipe.
+
+        Returns:
+            A hex digest of the symptoms file, the Negex termsets and the SpaCy model and library versions.
+        """
+        pipeline_inputs = {
+            "symptoms": SymptomCollection.get_fingerprint(),
+            "termset": cls.russian_termset,
+            "model": cls.SPACY_LANG_MODEL_NAME,
+            "model_version": spacy.util.get_package_version(cls.SPACY_LANG_MODEL_NAME),
+            "disabled": cls.SPACY_DISABLED_PIPES,
+            "negation": negation_factory,
+            "matcher": matcher_factory,
+            "spacy_version": spacy.__version__,
+        }
+        serialized_inputs = json.dumps(
+            pipeline_inputs, sort_keys=True, ensure_ascii=False
+        )
+
+        return hashlib.sha256(serialized_inputs.encode("utf8")).hexdigest()
+
+    def get_compiled_lang_model_path(self) -> Path:
+        """Gets the path of the compiled pipeline artifact for the current fingerprint.
+
+        Returns:
+            The directory path of the compiled pipeline.
+        """
+        return (
+            self._cache_dir
+            / SmartSymptomExtractor.COMPILED_PIPELINES_DIR_NAME
+            / self.fingerprint(self._negation_factory, self._matcher_factory)
+        )
+
+    def _build_lang_model(self) -> Language:
+        """Builds the SpaCy pipeline with the symptom entity ruler and Negex.
+
+        Returns:
+            The built SpaCy pipeline.
+        """
+        spacy_lang_model = spacy.load(
             SmartSymptomExtractor.SPACY_LANG_MODEL_NAME,
-            disable=["tok2vec", "morphologizer", "attribute_ruler", "ner"],
+            disable=SmartSymptomExtractor.SPACY_DISABLED_PIPES,
         )
 
-        ruler = self._spacy_lang_model.add_pipe(
-            "entity_ruler", config={"validate": True}
+        # The pipe is named entity_ruler for any factory, as the negation pipe is named negex
+        ruler = spacy_lang_model.add_pipe(
+            self._matcher_factory, name="entity_ruler", config={"validate": True}
         )
         ruler.add_patterns(SymptomCollection.get_spacy_model_patterns())
 
@@ -124,10 +391,65 @@ class SmartSymptomExtractor(BaseTransformer):
             "extension_name": SmartSymptomExtractor.NEGEX_EXTENSION_NAME,
             "chunk_prefix": [],
         }
-        self._spacy_lang_model.add_pipe(
-            factory_name="negex", name="negex", last=True, config=negex_config
+        # The pipe is named negex for any factory, so the pipeline structure doesn't depend on it
+        spacy_lang_model.add_pipe(
+            factory_name=self._negation_factory,
+            name="negex",
+            last=True,
+            config=negex_config,
         )
 
+        return spacy_lang_model
+
+    def _load_compiled_lang_model(self) -> Language:
+        """Loads the compiled pipeline from the cache or builds and saves it.
+
+        Returns:
+            The SpaCy pipeline.
+        """
+        compiled_path = self.get_compiled_lang_model_path()
+        if compiled_path.is_dir():
+            try:
+                return spacy.load(compiled_path)
+            except Exception as e:
+                logger.warning(
+                    "Failed to load compiled pipeline %s, rebuilding: %r",
+                    compiled_path,
+                    e,
+                )
+
+        spacy_lang_model = self._build_lang_model()
+        self._save_compiled_lang_model(spacy_lang_model, compiled_path)
+
+        return spacy_lang_model
+
+    @staticmethod
+    def _save_compiled_lang_model(spacy_lang_model: Language, compiled_path: Path):
+        """Saves the compiled pipeline atomically, so concurrent workers never see a partial artifact.
+
+        Args:
+            spacy_lang_model: The built SpaCy pipeline.
+            compiled_path: The target directory of the compiled pipeline.
+        """
+        try:
+            compiled_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = Path(tempfile.mkdtemp(dir=compiled_path.parent))
+        except OSError as e:
+            logger.warning("Failed to save compiled pipeline %s: %r", compiled_path, e)
+            return
+
+        try:
+            spacy_lang_model.to_disk(tmp_path)
+            # Fails if another worker has already saved the same artifact
+            os.replace(tmp_path, compiled_path)
+        except OSError as e:
+            if not compiled_path.is_dir():
+                logger.warning(
+                    "Failed to save compiled pipeline %s: %r", compiled_path, e
+                )
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
     def fit(self, x: Iterable[str]):
         """Fits the transformer according to the given training data.
 
@@ -136,6 +458,62 @@ class SmartSymptomExtractor(BaseTransformer):
         """
         pass
 
+    def get_prefilter_stats(self) -> Dict[str, int]:
+        """Gets the counts of messages processed by the extractor.
+
+        Returns:
+            A dictionary with the number of parsed messages and of messages that took the fast path,
+            skipping the entity ruler and Negex because they have no symptom lemma.
+        """
+        return {
+            "messages": self._messages_count,
+            "fast_path_messages": self._fast_path_messages_count,
+        }
+
+    def _pipe(self, messages: Iterable[str], batch_size: int) -> Iterator[Doc]:
+        """Parses messages with the SpaCy pipeline.
+
+        The entity ruler and Negex run only for messages that have a lemma some symptom pattern starts with,
+        the rest of messages have no entities, so they turn into NO_INFO for all symptoms.
+
+        Args:
+            messages: An iterable over strings representing user messages.
+            batch_size: The number of messages SpaCy processes at once.
+
+        Yields:
+            SpaCy docs of the messages in the input order.
+        """
+        first_token_lemmas = None
+        if self._use_lemma_prefilter:
+            first_token_lemmas = SymptomCollection.get_first_token_lemmas()
+
+        if first_token_lemmas is None:
+            for model_doc in self._spacy_lang_model.pipe(
+                messages, batch_size=batch_size
+            ):
+                self._messages_count += 1
+                yield model_doc
+            return
+
+        matching_pipes = [
+            pipe
+            for name, pipe in self._spacy_lang_model.pipeline
+            if name in SmartSymptomExtractor.MATCHING_PIPES
+        ]
+        model_docs = self._spacy_lang_model.pipe(
+            messages,
+            batch_size=batch_size,
+            disable=SmartSymptomExtractor.MATCHING_PIPES,
+        )
+        for model_doc in model_docs:
+            self._messages_count += 1
+            if first_token_lemmas.isdisjoint(token.lemma_ for token in model_doc):
+                self._fast_path_messages_count += 1
+            else:
+                for pipe in matching_pipes:
+                    model_doc = pipe(model_doc)
+            yield model_doc
+
     def _transform(self, message: str) -> Anamnesis:
         """Transforms a single message into an Anamnesis instance.
 
@@ -145,9 +523,10 @@ class SmartSymptomExtractor(BaseTransformer):
         Returns:
             An Anamnesis instance.
         """
-        model_doc: Doc = self._spacy_lang_model(message)
+        model_doc: Doc = next(self._pipe([message], batch_size=1))
         return SmartSymptomExtractor._transform_inner(model_doc)
 
+    @staticmethod
     def _transform_inner(doc: Doc) -> Anamnesis:
         anamnesis: Anamnesis = Anamnesis()
         symptom_entities = [
@@ -161,25 +540,200 @@ class SmartSymptomExtractor(BaseTransformer):
 
         return anamnesis
 
+    def _transform_batch(self, messages: List[str], batch_size: int) -> np.array:
+        """Transforms a batch of messages into a compact matrix of symptom marks.
+
+        Args:
+            messages: A list of strings representing user messages.
+            batch_size: The number of messages SpaCy processes at once.
+
+        Returns:
+            A numpy array of shape (n_messages, n_symptoms) with symptom status values.
+        """
+        marks = np.empty(
+            (len(messages), len(SymptomCollection.get_symptoms())), dtype=MARKS_DTYPE
+        )
+        model_docs = self._pipe(messages, batch_size=batch_size)
+        for i, model_doc in enumerate(model_docs):
+            marks[i] = SmartSymptomExtractor._transform_inner(model_doc).get_marks()
+
+        return marks
+
+    def _transform_multiprocess(
+        self,
+        messages: List[str],
+        n_process: int,
+        batch_size: int,
+        as_sparse: bool = False,
+    ) -> Union[np.array, sparse.csr_matrix]:
+        """Transforms messages in a process pool.
+
+        Every worker process owns an extractor and sends back only compact numeric marks,
+        so neither SpaCy docs nor Anamnesis instances are pickled between processes.
+
+        Args:
+            messages: A list of strings representing user messages.
+            n_process: The number of worker processes.
+            batch_size: The number of messages sent to a worker at once.
+            as_sparse: A boolean indicating whether to return marks in the sparse encoding.
+
+        Returns:
+            A numpy array or a sparse matrix of shape (n_messages, n_symptoms) with symptom marks in the input order.
+        """
+        batches = [
+            messages[start : start + batch_size]
+            for start in range(0, len(messages), batch_size)
+        ]
+        if not batches:
+            marks = np.empty(
+                (0, len(SymptomCollection.get_symptoms())), dtype=MARKS_DTYPE
+            )
+            return marks_to_csr(marks) if as_sparse else marks
+
+        with ProcessPoolExecutor(
+            max_workers=min(n_process, len(batches)),
+            initializer=_init_transform_worker,
+            initargs=(
+                self._cache_dir,
+                self._use_compiled_cache,
+                self._use_lemma_prefilter,
+                self._negation_factory,
+                self._matcher_factory,
+            ),
+        ) as executor:
+            marks_batches = self._count_worker_messages(
+                executor.map(
+                    _transform_batch_in_worker, batches, [batch_size] * len(batches)
+                )
+            )
+            if as_sparse:
+                # Batches are converted as they arrive, so the dense matrix is never materialized
+                return sparse.vstack(
+                    [marks_to_csr(marks) for marks in marks_batches], format="csr"
+                )
+            return np.vstack(list(marks_batches))
+
+    def _count_worker_messages(
+        self, worker_results: Iterable[Tuple[np.array, int]]
+    ) -> Iterator[np.array]:
+        """Adds the counts of messages processed by worker processes to the counts of the extractor.
+
+        Args:
+            worker_results: An iterable over marks of batches and numbers of their fast path messages.
+
+        Yields:
+            Marks of the batches.
+        """
+        for marks, fast_path_messages_count in worker_results:
+            self._messages_count += len(marks)
+            self._fast_path_messages_count += fast_path_messages_count
+            yield marks
+
+    def _transform_marks(
+        self, messages: List[str], n_process: int, batch_size: int
+    ) -> np.array:
+        """Transforms messages into a matrix of symptom marks in the current or in worker processes.
+
+        Args:
+            messages: A list of strings representing user messages.
+            n_process: The number of worker processes.
+            batch_size: The number of messages processed at once by SpaCy and sent to a worker process.
+
+        Returns:
+            A numpy array of shape (n_messages, n_symptoms) with symptom status values.
+        """
+        if n_process > 1:
+            return self._transform_multiprocess(messages, n_process, batch_size)
+        return self._transform_batch(messages, batch_size)
+
     def transform(
-        self, messages: List[str], as_anamnesis: bool = False
-    ) -> Union[List[Anamnesis], np.array]:
+        self,
+        messages: List[str],
+        as_anamnesis: bool = False,
+        n_process: int = 1,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        output: str = DENSE_OUTPUT,
+    ) -> Union[List[Anamnesis], np.array, sparse.csr_matrix]:
         """Transforms a list of messages into a list of Anamnesis instances or a numpy array.
 
         Args:
             messages: A list of strings representing user messages.
             as_anamnesis: A boolean indicating whether to return the result as a list of Anamnesis instances. If False, the result is returned as a numpy array.
+            n_process: The number of processes to spread the extraction over. -1 means the number of CPUs.
+            batch_size: The number of messages processed at once by SpaCy and sent to a worker process.
+            output: "dense" for a numpy array or "sparse" for a csr matrix in the encoding of ``sparse_marks``,
+                where NO_INFO is the implicit zero. Ignored if as_anamnesis is True.
 
         Returns:
-            A list of Anamnesis instances or a numpy array.
+            A list of Anamnesis instances, a numpy array or a sparse matrix.
         """
-        model_docs: List[Doc] = self._spacy_lang_model.pipe(messages)
+        check_output_format(output)
+        as_sparse = output == SPARSE_OUTPUT and not as_anamnesis
+
+        if n_process == -1:
+            n_process = os.cpu_count() or 1
+
+        if self.extraction_cache is not None:
+            marks = self.extraction_cache.get_or_compute(
+                list(messages),
+                lambda missing_messages: self._transform_marks(
+                    missing_messages, n_process, batch_size
+                ),
+            )
+            if as_anamnesis:
+                return [Anamnesis.from_marks(row) for row in marks]
+            return marks_to_csr(marks) if as_sparse else marks
+
+        if n_process > 1:
+            marks = self._transform_multiprocess(
+                list(messages), n_process, batch_size, as_sparse
+            )
+            if as_anamnesis:
+                return [Anamnesis.from_marks(row) for row in marks]
+            return marks
+
+        model_docs: Iterator[Doc] = self._pipe(messages, batch_size=batch_size)
         with ThreadPoolExecutor() as executor:
             features = list(
                 executor.map(SmartSymptomExtractor._transform_inner, model_docs)
             )
 
-        if not as_anamnesis:
+        if as_sparse:
+            features = rows_to_csr(
+                (anamnesis.get_marks() for anamnesis in features),
+                len(SymptomCollection.get_symptoms()),
+            )
+        elif not as_anamnesis:
             features = np.array([anamnesis.get_marks() for anamnesis in features])
 
         return features
+
+
+# Extractor of a worker process of SmartSymptomExtractor.transform
+_worker_extractor: Optional[SmartSymptomExtractor] = None
+
+
+def _init_transform_worker(
+    cache_dir: Path,
+    use_compiled_cache: bool,
+    use_lemma_prefilter: bool,
+    negation_factory: str,
+    matcher_factory: str,
+):
+    global _worker_extractor
+    # Forked workers inherit the shared extractor of the parent process without loading it again
+    _worker_extractor = SmartSymptomExtractor.shared(
+        cache_dir=cache_dir,
+        use_compiled_cache=use_compiled_cache,
+        use_lemma_prefilter=use_lemma_prefilter,
+        negation_factory=negation_factory,
+        matcher_factory=matcher_factory,
+    )
+
+
+def _transform_batch_in_worker(
+    messages: List[str], batch_size: int
+) -> Tuple[np.array, int]:
+    fast_path_messages_count = _worker_extractor._fast_path_messages_count
+    marks = _worker_extractor._transform_batch(messages, batch_size)
+    return marks, _worker_extractor._fast_path_messages_count - fast_path_messages_count
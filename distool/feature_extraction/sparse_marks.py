@@ -0,0 +1,117 @@
+"""
+Sparse encoding of symptom marks.
+
+A sparse marks matrix is a ``scipy.sparse.csr_matrix`` of shape (n_messages, n_symptoms) and ``int8`` dtype.
+Stored values are SymptomStatus values of YES (1), NO (2) and CONFUSED (4),
+NO_INFO (3) is not stored and is represented by the implicit zero.
+"""
+
+from typing import Iterable, Union
+
+import numpy as np
+from scipy import sparse
+
+from distool.feature_extraction.anamnesis import MARKS_DTYPE
+from distool.feature_extraction.symptom_status import SymptomStatus
+
+_NO_INFO = SymptomStatus.NO_INFO.value
+
+DENSE_OUTPUT: str = "dense"
+SPARSE_OUTPUT: str = "sparse"
+OUTPUT_FORMATS = (DENSE_OUTPUT, SPARSE_OUTPUT)
+
+
+def check_output_format(output: str):
+    """Checks that the requested output format of extractors is supported.
+
+    Args:
+        output: The name of the output format.
+
+    Raises:
+        ValueError: If the output format is not supported.
+    """
+    if output not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"Output should be one of {OUTPUT_FORMATS}, but it is {output!r}"
+        )
+
+
+def marks_to_csr(marks: np.array) -> sparse.csr_matrix:
+    """Converts a dense matrix of symptom marks into the sparse marks encoding.
+
+    Args:
+        marks: A numpy array of shape (n_messages, n_symptoms) with status values.
+
+    Returns:
+        A sparse marks matrix.
+    """
+    marks = np.asarray(marks, dtype=MARKS_DTYPE)
+    has_info = marks != _NO_INFO
+    rows, columns = np.nonzero(has_info)
+    indptr = np.zeros(marks.shape[0] + 1, dtype=np.int64)
+    np.cumsum(has_info.sum(axis=1), out=indptr[1:])
+
+    return sparse.csr_matrix((marks[rows, columns], columns, indptr), shape=marks.shape)
+
+
+def rows_to_csr(rows: Iterable[np.array], n_symptoms: int) -> sparse.csr_matrix:
+    """Builds a sparse marks matrix from marks of messages without materializing the dense matrix.
+
+    Args:
+        rows: An iterable over numpy arrays of shape (n_symptoms,) with status values.
+        n_symptoms: The number of symptoms.
+
+    Returns:
+        A sparse marks matrix with a row per message.
+    """
+    data, indices, indptr = [], [], [0]
+    for row in rows:
+        columns = np.flatnonzero(row != _NO_INFO)
+        indices.append(columns)
+        data.append(row[columns])
+        indptr.append(indptr[-1] + len(columns))
+
+    if not data:
+        return sparse.csr_matrix((0, n_symptoms), dtype=MARKS_DTYPE)
+
+    return sparse.csr_matrix(
+        (
+            np.concatenate(data).astype(MARKS_DTYPE),
+            np.concatenate(indices),
+            np.array(indptr),
+        ),
+        shape=(len(indptr) - 1, n_symptoms),
+    )
+
+
+def csr_to_marks(matrix: sparse.spmatrix) -> np.array:
+    """Converts a sparse marks matrix into the dense matrix of symptom marks.
+
+    Args:
+        matrix: A sparse marks matrix.
+
+    Returns:
+        A numpy array of shape (n_messages, n_symptoms) with status values.
+    """
+    marks = matrix.toarray().astype(MARKS_DTYPE)
+    marks[marks == 0] = _NO_INFO
+    return marks
+
+
+def align_marks_format(
+    marks: Union[np.array, sparse.spmatrix], as_sparse: bool
+) -> Union[np.array, sparse.csr_matrix]:
+    """Converts symptom marks into the dense or the sparse encoding if they are in the other one.
+
+    Args:
+        marks: A dense or a sparse marks matrix.
+        as_sparse: A boolean indicating whether the sparse encoding is required.
+
+    Returns:
+        The marks in the required encoding.
+    """
+    if as_sparse and not sparse.issparse(marks):
+        return marks_to_csr(marks)
+    if not as_sparse and sparse.issparse(marks):
+        return csr_to_marks(marks)
+    return marks
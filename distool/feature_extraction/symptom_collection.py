@@ -1,7 +1,8 @@
+import hashlib
 import json
 import os
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, FrozenSet, List, Optional
 
 from distool.feature_extraction.symptom import Symptom
 
@@ -12,6 +13,9 @@ from distool.feature_extraction.symptom import Symptom
 
 BASE_DIR = Path(__file__).parent.parent
 
+# Marks lazily computed attributes whose computed value can be None
+_NOT_COMPUTED = object()
+
 
 class SymptomCollection:
     """
@@ -40,7 +44,10 @@ class SymptomCollection:
 
     _symptoms: List[Symptom] = None
     _name_to_symptom_dict: Dict[str, Symptom] = None
+    _name_to_index_dict: Dict[str, int] = None
     _symptoms_spacy_model_patterns: List[Dict] = None
+    _fingerprint: str = None
+    _first_token_lemmas: Optional[FrozenSet[str]] = _NOT_COMPUTED
 
     @classmethod
     def get_symptoms(cls):
@@ -85,6 +92,67 @@ class SymptomCollection:
 
         return cls._name_to_symptom_dict
 
+    @classmethod
+    def get_name_to_index_dict(cls) -> Dict[str, int]:
+        """Gets a dictionary that maps symptom names to symptom positions in the collection.
+
+        Returns:
+            A dictionary that maps symptom names to indexes of symptoms.
+        """
+        if cls._name_to_index_dict is None:
+            cls._name_to_index_dict = {
+                symptom.id_name: index
+                for index, symptom in enumerate(cls.get_symptoms())
+            }
+
+        return cls._name_to_index_dict
+
+    @classmethod
+    def get_fingerprint(cls) -> str:
+        """Gets the fingerprint of the symptoms file.
+
+        The fingerprint changes whenever the content of the symptoms file changes,
+        so it can be used as a key for artifacts derived from the symptoms.
+
+        Returns:
+            A hex digest of the symptoms file content.
+        """
+        if cls._fingerprint is None:
+            with open(cls.SYMPTOMS_FILE_PATH, "rb") as f:
+                cls._fingerprint = hashlib.sha256(f.read()).hexdigest()
+
+        return cls._fingerprint
+
+    @classmethod
+    def get_first_token_lemmas(cls) -> Optional[FrozenSet[str]]:
+        """Gets the lemmas that symptom patterns start with.
+
+        A message can contain a symptom only if one of its tokens has one of these lemmas.
+
+        Returns:
+            A set of lemmas or None if some pattern doesn't start with a token matched by an exact lemma.
+        """
+        if cls._first_token_lemmas is _NOT_COMPUTED:
+            cls._first_token_lemmas = cls._collect_first_token_lemmas()
+
+        return cls._first_token_lemmas
+
+    @classmethod
+    def _collect_first_token_lemmas(cls) -> Optional[FrozenSet[str]]:
+        first_token_lemmas = set()
+        for symptom in cls.get_symptoms():
+            for pattern in symptom.patterns:
+                first_token = pattern[0] if isinstance(pattern, list) else None
+                if (
+                    not isinstance(first_token, dict)
+                    or list(first_token) != ["LEMMA"]
+                    or not isinstance(first_token["LEMMA"], str)
+                ):
+                    return None
+                first_token_lemmas.add(first_token["LEMMA"])
+
+        return frozenset(first_token_lemmas)
+
     @classmethod
     def get_spacy_model_patterns(cls) -> List[Dict]:
         if cls._symptoms_spacy_model_patterns is None:
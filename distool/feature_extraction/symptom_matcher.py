@@ -0,0 +1,174 @@
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Union
+
+from spacy.language import Language
+from spacy.matcher import Matcher, PhraseMatcher
+from spacy.tokens import Doc, Span
+from spacy.util import filter_spans
+
+from distool.feature_extraction.symptom_collection import SymptomCollection
+
+
+@Language.factory("symptom_matcher", default_config={"validate": False})
+class SymptomMatcher:
+    """
+    A SpaCy pipeline component that finds symptom entities like the entity ruler, but compiles lemma patterns.
+
+    Most symptom patterns are plain sequences of ``{"LEMMA": ...}`` tokens. They are matched by
+    a PhraseMatcher on the LEMMA attribute, which works in time proportional to the doc length
+    regardless of the number of patterns. Phrase patterns are matched by text as in the entity ruler,
+    and the rest of patterns are matched by the token Matcher.
+    Overlapping matches are resolved as in the entity ruler: the longest and then the first match wins.
+
+    Attributes:
+        PATTERNS_FILE_NAME: The file with patterns in the serialized component directory.
+        validate: A boolean indicating whether token patterns are validated.
+    """
+
+    PATTERNS_FILE_NAME: str = "patterns.json"
+
+    def __init__(self, nlp: Language, name: str, validate: bool) -> None:
+        """Initializes a new instance of the SymptomMatcher class.
+
+        Args:
+            nlp: The SpaCy pipeline the component is added to.
+            name: The name of the component.
+            validate: A boolean indicating whether token patterns are validated.
+        """
+        self.validate = validate
+
+        self._vocab = nlp.vocab
+        self._make_doc = nlp.make_doc
+        self._patterns: List[Dict] = []
+        self._lemma_matcher = PhraseMatcher(nlp.vocab, attr="LEMMA")
+        self._phrase_matcher = PhraseMatcher(nlp.vocab)
+        self._matcher = Matcher(nlp.vocab, validate=validate)
+        # Label and id of a match by the match key
+        self._match_entities: Dict[int, tuple] = {}
+
+    @staticmethod
+    def get_pattern_lemmas(pattern: Union[str, List[Dict]]) -> Union[List[str], None]:
+        """Gets lemmas of a pattern that consists only of exact lemma tokens.
+
+        Args:
+            pattern: A phrase or a token pattern.
+
+        Returns:
+            The lemmas of the pattern tokens or None if the pattern can't be matched by lemmas.
+        """
+        if not isinstance(pattern, list) or not pattern:
+            return None
+
+        lemmas = []
+        for token in pattern:
+            if (
+                not isinstance(token, dict)
+                or list(token) != ["LEMMA"]
+                or not isinstance(token["LEMMA"], str)
+            ):
+                return None
+            lemmas.append(token["LEMMA"])
+
+        return lemmas
+
+    def add_patterns(self, patterns: Iterable[Dict]):
+        """Adds patterns in the format of the entity ruler.
+
+        Args:
+            patterns: Dictionaries with the label, the pattern and optionally the id of entities.
+        """
+        for pattern_record in patterns:
+            label = pattern_record[SymptomCollection.SYMPTOM_ENTITY_LABEL_ID]
+            pattern = pattern_record[SymptomCollection.SYMPTOM_ENTITY_PATTERN_ID]
+            entity_id = pattern_record.get(SymptomCollection.SYMPTOM_ENTITY_ID, "")
+
+            key = f"{label}|{entity_id}"
+            self._match_entities[self._vocab.strings.add(key)] = (label, entity_id)
+
+            lemmas = SymptomMatcher.get_pattern_lemmas(pattern)
+            if lemmas is not None:
+                self._lemma_matcher.add(
+                    key, [Doc(self._vocab, words=lemmas, lemmas=lemmas)]
+                )
+            elif isinstance(pattern, str):
+                self._phrase_matcher.add(key, [self._make_doc(pattern)])
+            else:
+                self._matcher.add(key, [pattern])
+
+            self._patterns.append(pattern_record)
+
+    @property
+    def patterns(self) -> List[Dict]:
+        """Gets all added patterns."""
+        return list(self._patterns)
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def __call__(self, doc: Doc) -> Doc:
+        """Sets symptom entities of a doc.
+
+        Args:
+            doc: A SpaCy doc with lemmas.
+
+        Returns:
+            The same doc.
+        """
+        matches = [
+            match
+            for matcher in (self._lemma_matcher, self._phrase_matcher, self._matcher)
+            # Empty matchers warn on every call
+            if len(matcher)
+            for match in matcher(doc)
+        ]
+        if not matches:
+            return doc
+
+        spans = []
+        for match_key, start, end in set(matches):
+            label, entity_id = self._match_entities[match_key]
+            spans.append(Span(doc, start, end, label=label, span_id=entity_id))
+
+        # Existing entities have priority, as in the entity ruler without overwriting
+        entities = list(doc.ents)
+        taken_tokens = {
+            i for entity in entities for i in range(entity.start, entity.end)
+        }
+        new_entities = [
+            span
+            for span in filter_spans(spans)
+            if taken_tokens.isdisjoint(range(span.start, span.end))
+        ]
+        doc.ents = sorted(entities + new_entities, key=lambda span: span.start)
+
+        return doc
+
+    def to_disk(self, path: Union[str, Path], exclude: Iterable[str] = ()):
+        """Saves the patterns of the component.
+
+        Args:
+            path: The directory of the component.
+            exclude: Unused, required by SpaCy serialization.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        with open(path / SymptomMatcher.PATTERNS_FILE_NAME, "w", encoding="utf8") as f:
+            json.dump(self._patterns, f, ensure_ascii=False)
+
+    def from_disk(
+        self, path: Union[str, Path], exclude: Iterable[str] = ()
+    ) -> "SymptomMatcher":
+        """Loads the patterns of the component.
+
+        Args:
+            path: The directory of the component.
+            exclude: Unused, required by SpaCy serialization.
+
+        Returns:
+            The component.
+        """
+        with open(Path(path) / SymptomMatcher.PATTERNS_FILE_NAME, encoding="utf8") as f:
+            self.add_patterns(json.load(f))
+
+        return self
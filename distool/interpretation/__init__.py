@@ -1,4 +1,43 @@
 """This page documents the classes used for interpreting the results of the disease classification.
-It includes BaseExplainer, FedotBasedExplainer, and SymptomBasedExplainer classes.
+It includes BaseExplainer, ContributionBasedExplainer, FedotBasedExplainer, and SymptomBasedExplainer classes,
+and the ContributionExplanation, RuleExplanation and SymptomExplanation structures returned by batch explanations.
 These classes are used to provide explanations for the predictions made by the classifiers.
 """
+
+from typing import TYPE_CHECKING
+
+from distool.base.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from distool.interpretation.explainer import (
+        BaseExplainer,
+        ContributionBasedExplainer,
+        ContributionExplanation,
+        FedotBasedExplainer,
+        RuleExplanation,
+        SymptomBasedExplainer,
+        SymptomExplanation,
+    )
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "BaseExplainer": "distool.interpretation.explainer",
+        "ContributionBasedExplainer": "distool.interpretation.explainer",
+        "ContributionExplanation": "distool.interpretation.explainer",
+        "FedotBasedExplainer": "distool.interpretation.explainer",
+        "RuleExplanation": "distool.interpretation.explainer",
+        "SymptomBasedExplainer": "distool.interpretation.explainer",
+        "SymptomExplanation": "distool.interpretation.explainer",
+    },
+)
+
+__all__ = [
+    "BaseExplainer",
+    "ContributionBasedExplainer",
+    "ContributionExplanation",
+    "FedotBasedExplainer",
+    "RuleExplanation",
+    "SymptomBasedExplainer",
+    "SymptomExplanation",
+]
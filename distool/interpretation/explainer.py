@@ -1,9 +1,15 @@
+import time
 from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
+from attr import dataclass
+from scipy import sparse
+from sklearn.tree import DecisionTreeClassifier
 
 from distool.estimators.classifiers import DiseaseClassifier, FedotDiseaseClassifier
-from distool.feature_extraction import SmartSymptomExtractor
+from distool.estimators.linear_scorer import LinearScorer
+from distool.feature_extraction import SmartSymptomExtractor, SymptomFeatureEncoder
 from distool.feature_extraction.symptom_collection import SymptomCollection
 from distool.feature_extraction.symptom_status import SymptomStatus
 
@@ -14,6 +20,50 @@ class BaseExplainer(ABC):
         pass
 
 
+@dataclass(frozen=True)
+class SymptomExplanation:
+    """
+    A structured explanation of a disease prediction.
+
+    Args:
+        disease: The predicted disease.
+        probability: The probability of the predicted disease.
+        present_symptoms: The names of symptoms the patient has.
+        absent_symptoms: The names of symptoms the patient denies.
+    """
+
+    disease: Any
+    probability: float
+    present_symptoms: List[str]
+    absent_symptoms: List[str]
+
+    def to_text(self) -> str:
+        """Renders the explanation for the patient.
+
+        Returns:
+            A string representing the explanation.
+        """
+        return (
+            f"Наблюдается {self.disease} с вероятностью {round(self.probability * 100)}%.\n"
+            f"Это потому что у вас наблюдаются следующие симптомы: "
+            f"{''.join(self.present_symptoms)}\n"
+            f"И отрицаются следующие: "
+            f"{''.join(self.absent_symptoms)}"
+        )
+
+
+def _group_symptoms_by_rows(
+    marks: Union[np.array, sparse.csr_matrix],
+    status: SymptomStatus,
+    symptom_names: np.array,
+) -> List[List[str]]:
+    """Gets the names of symptoms with the given status for every row of marks."""
+    # Positions are ordered by rows for both dense and csr marks
+    rows, columns = (marks == status.value).nonzero()
+    row_bounds = np.searchsorted(rows, np.arange(1, marks.shape[0]))
+    return [names.tolist() for names in np.split(symptom_names[columns], row_bounds)]
+
+
 class SymptomBasedExplainer(BaseExplainer):
     """
     An explainer based on symptoms.
@@ -36,34 +86,283 @@ class SymptomBasedExplainer(BaseExplainer):
         """
         self._vectorizer = vectorizer
         self._classifier = classifier
+        self._symptom_names = np.array(
+            [symptom.id_name for symptom in SymptomCollection.get_symptoms()],
+            dtype=object,
+        )
 
     def explain(self, feature: np.array) -> str:
         """Explains the given feature.
 
         Args:
-            feature: A numpy array representing the feature to explain.
+            feature: A numpy array or a sparse marks matrix row representing the feature to explain.
 
         Returns:
             A string representing the explanation.
         """
-        symptom_analysis = list(zip(SymptomCollection.get_symptoms(), feature))
-        predict_proba = self._classifier.predict_proba([feature])[0]
+        if not sparse.issparse(feature):
+            feature = np.asarray(feature)[np.newaxis, :]
 
-        disease_proba = predict_proba[np.argmax(predict_proba)]
-        disease_name = self._classifier.log_reg.classes_[np.argmax(predict_proba)]
-        has_symptoms = [
-            s.id_name for s, f in symptom_analysis if f == SymptomStatus.YES.value
+        return self.explain_batch(feature)[0].to_text()
+
+    def explain_batch(
+        self, features: Union[np.array, sparse.spmatrix], as_text: bool = False
+    ) -> Union[List[SymptomExplanation], List[str]]:
+        """Explains the predictions for a matrix of features.
+
+        The classifier is called once for the whole matrix and the symptoms of all rows
+        are found with vectorized masks, so explaining a batch is much faster than explaining its rows.
+
+        Args:
+            features: A dense or a sparse marks matrix of shape (n_samples, n_symptoms).
+            as_text: Whether to render the explanations into strings.
+
+        Returns:
+            A list of SymptomExplanation objects, or of strings if as_text is True.
+        """
+        if sparse.issparse(features):
+            features = sparse.csr_matrix(features)
+        else:
+            features = np.asarray(features)
+
+        predict_proba = self._classifier.predict_proba(features)
+        class_ids = np.argmax(predict_proba, axis=1)
+        diseases = np.take(self._classifier.get_classes(), class_ids).tolist()
+        probabilities = predict_proba[np.arange(len(class_ids)), class_ids].tolist()
+
+        present_symptoms = _group_symptoms_by_rows(
+            features, SymptomStatus.YES, self._symptom_names
+        )
+        absent_symptoms = _group_symptoms_by_rows(
+            features, SymptomStatus.NO, self._symptom_names
+        )
+
+        explanations = [
+            SymptomExplanation(*explanation)
+            for explanation in zip(
+                diseases, probabilities, present_symptoms, absent_symptoms
+            )
         ]
-        no_symptoms = [
-            s.id_name for s, f in symptom_analysis if f == SymptomStatus.NO.value
+        if as_text:
+            return [explanation.to_text() for explanation in explanations]
+
+        return explanations
+
+
+@dataclass(frozen=True)
+class ContributionExplanation:
+    """
+    An explanation of a linear model prediction by the contributions of symptoms.
+
+    Args:
+        disease: The predicted disease.
+        probability: The probability of the predicted disease.
+        positive_symptoms: Pairs of symptom names and contributions in favour of the disease,
+            ordered by decreasing contribution.
+        negative_symptoms: Pairs of symptom names and contributions against the disease,
+            ordered by increasing contribution.
+    """
+
+    disease: Any
+    probability: float
+    positive_symptoms: List[Tuple[str, float]]
+    negative_symptoms: List[Tuple[str, float]]
+
+    def to_text(self) -> str:
+        """Renders the explanation for the patient.
+
+        Returns:
+            A string representing the explanation.
+        """
+        return (
+            f"Наблюдается {self.disease} с вероятностью {round(self.probability * 100)}%.\n"
+            f"В пользу этого говорят симптомы: "
+            f"{', '.join(name for name, _ in self.positive_symptoms)}\n"
+            f"Против этого говорят: "
+            f"{', '.join(name for name, _ in self.negative_symptoms)}"
+        )
+
+
+class ContributionBasedExplainer(BaseExplainer):
+    """
+    An explainer of linear classifiers by the contributions of symptoms.
+
+    The contribution of a symptom to the score of a disease is the product of the disease coefficients
+    and the difference between the encoded features of the symptom and those of the NO_INFO status.
+    So a symptom the patient didn't mention contributes nothing, whatever the encoding is.
+    The coefficients are reshaped into blocks per symptom once, when the explainer is created,
+    so explaining a batch takes one einsum and a partial sort, and only the top symptoms that drove
+    every prediction are returned.
+
+    Attributes:
+        top_n: The maximum number of positive and of negative symptoms in an explanation.
+        _scorer: The NumPy-only scorer of the classifier.
+    """
+
+    def __init__(
+        self,
+        vectorizer: SmartSymptomExtractor,
+        classifier: Union[DiseaseClassifier, LinearScorer],
+        top_n: int = 5,
+    ) -> None:
+        """Initializes a new instance of the ContributionBasedExplainer class.
+
+        Args:
+            vectorizer: The symptom extractor.
+            classifier: A fitted linear classifier with ``export_scorer``, or a LinearScorer.
+            top_n: The maximum number of positive and of negative symptoms in an explanation.
+        """
+        if top_n < 1:
+            raise ValueError(f"Top N should be positive, but it is {top_n}")
+
+        self._vectorizer = vectorizer
+        self._scorer = (
+            classifier
+            if isinstance(classifier, LinearScorer)
+            else classifier.export_scorer()
+        )
+        self.top_n = top_n
+        self._symptom_names = np.array(
+            [symptom.id_name for symptom in SymptomCollection.get_symptoms()],
+            dtype=object,
+        )
+
+        coef = np.asarray(self._scorer.coef, dtype=float)
+        # A binary model has the coefficients of the positive class only
+        if coef.shape[0] == 1 and len(self._scorer.classes) == 2:
+            coef = np.vstack([-coef, coef])
+
+        n_symptoms = len(self._symptom_names)
+        self._features_per_symptom = coef.shape[1] // n_symptoms
+        self._coef = coef.reshape(len(coef), n_symptoms, self._features_per_symptom)
+
+        no_info_marks = np.full((1, n_symptoms), SymptomStatus.NO_INFO.value, np.int8)
+        self._no_info_encoded = self._encode(no_info_marks)[0]
+
+    def _encode(self, features: Union[np.array, sparse.spmatrix]) -> np.array:
+        """Encodes marks into dense features of shape (n_samples, n_symptoms, n_features_per_symptom)."""
+        encoded = self._scorer.encode(features)
+        if sparse.issparse(encoded):
+            encoded = encoded.toarray()
+        return encoded.reshape(len(encoded), *self._coef.shape[1:])
+
+    def get_contributions(
+        self, features: Union[np.array, sparse.spmatrix]
+    ) -> Tuple[np.array, np.array]:
+        """Computes the contributions of symptoms to the predicted disease scores.
+
+        Args:
+            features: A dense or a sparse marks matrix of shape (n_samples, n_symptoms).
+
+        Returns:
+            A tuple of the class probabilities of shape (n_samples, n_classes)
+            and the contributions of shape (n_samples, n_symptoms), relative to a message without symptoms.
+        """
+        predict_proba = self._scorer.predict_proba(features)
+        class_ids = np.argmax(predict_proba, axis=1)
+
+        encoded = self._encode(features) - self._no_info_encoded
+        contributions = np.einsum("nsk,nsk->ns", encoded, self._coef[class_ids])
+        return predict_proba, contributions
+
+    def _get_top_symptoms(
+        self, contributions: np.array, sign: int
+    ) -> List[List[Tuple[str, float]]]:
+        """Gets the symptoms with the largest contributions of the given sign for every row."""
+        signed_contributions = sign * contributions
+        top_n = min(self.top_n, contributions.shape[1])
+
+        top_ids = np.argpartition(-signed_contributions, top_n - 1, axis=1)[:, :top_n]
+        top_contributions = np.take_along_axis(signed_contributions, top_ids, axis=1)
+        order = np.argsort(-top_contributions, axis=1, kind="stable")
+        top_ids = np.take_along_axis(top_ids, order, axis=1)
+        top_contributions = np.take_along_axis(top_contributions, order, axis=1)
+
+        top_symptoms = []
+        for ids, values in zip(top_ids, top_contributions):
+            has_sign = values > 0
+            top_symptoms.append(
+                list(
+                    zip(
+                        self._symptom_names[ids[has_sign]].tolist(),
+                        (sign * values[has_sign]).tolist(),
+                    )
+                )
+            )
+
+        return top_symptoms
+
+    def explain(self, feature: np.array) -> str:
+        """Explains the given feature.
+
+        Args:
+            feature: A numpy array or a sparse marks matrix row representing the feature to explain.
+
+        Returns:
+            A string representing the explanation.
+        """
+        if not sparse.issparse(feature):
+            feature = np.asarray(feature)[np.newaxis, :]
+
+        return self.explain_batch(feature)[0].to_text()
+
+    def explain_batch(
+        self, features: Union[np.array, sparse.spmatrix], as_text: bool = False
+    ) -> Union[List[ContributionExplanation], List[str]]:
+        """Explains the predictions for a matrix of features.
+
+        Args:
+            features: A dense or a sparse marks matrix of shape (n_samples, n_symptoms).
+            as_text: Whether to render the explanations into strings.
+
+        Returns:
+            A list of ContributionExplanation objects, or of strings if as_text is True.
+        """
+        predict_proba, contributions = self.get_contributions(features)
+        class_ids = np.argmax(predict_proba, axis=1)
+        diseases = np.take(self._scorer.classes, class_ids).tolist()
+        probabilities = predict_proba[np.arange(len(class_ids)), class_ids].tolist()
+
+        explanations = [
+            ContributionExplanation(*explanation)
+            for explanation in zip(
+                diseases,
+                probabilities,
+                self._get_top_symptoms(contributions, 1),
+                self._get_top_symptoms(contributions, -1),
+            )
         ]
+        if as_text:
+            return [explanation.to_text() for explanation in explanations]
+
+        return explanations
+
+
+@dataclass(frozen=True)
+class RuleExplanation:
+    """
+    An explanation of a prediction by the decision rules of a surrogate tree.
+
+    Args:
+        disease: The predicted disease.
+        probability: The share of training samples of the disease in the surrogate leaf.
+        rules: Triples of a feature name, a comparison operator and a threshold on the decision path.
+    """
+
+    disease: Any
+    probability: float
+    rules: List[Tuple[str, str, float]]
 
+    def to_text(self) -> str:
+        """Renders the explanation for the patient.
+
+        Returns:
+            A string representing the explanation.
+        """
         return (
-            f"Наблюдается {disease_name} с вероятностью {round(disease_proba * 100)}%.\n"
-            f"Это потому что у вас наблюдаются следующие симптомы: "
-            f"{''.join(has_symptoms)}\n"
-            f"И отрицаются следующие: "
-            f"{''.join(no_symptoms)}"
+            f"Наблюдается {self.disease} с вероятностью {round(self.probability * 100)}%.\n"
+            f"Это потому что: "
+            f"{', '.join(f'{name} {operator} {threshold:g}' for name, operator, threshold in self.rules)}"
         )
 
 
@@ -71,21 +370,35 @@ class FedotBasedExplainer(BaseExplainer):
     """
     An explainer based on the FEDOT framework.
 
-    This class is a specific implementation of the BaseExplainer.
+    This class is a specific implementation of the BaseExplainer. In the visual mode every call runs
+    the explanation machinery of FEDOT and plots it. Otherwise predictions are explained by the decision
+    paths of the surrogate tree fitted once after ``FedotDiseaseClassifier.fit``, which is fast enough
+    for a service, accepts batches and can be bounded in time.
 
     Attributes:
+        CHUNK_SIZE: The number of rows explained between checks of the time budget.
+        visualization: Whether to explain with the plotting machinery of FEDOT.
+        time_budget_seconds: The default maximum time of a batch explanation, unlimited if None.
         _vectorizer: The symptom extractor.
         _classifier: The classifier.
     """
 
+    CHUNK_SIZE: int = 1000
+
     def __init__(
-        self, vectorizer: SmartSymptomExtractor, classifier: FedotDiseaseClassifier
+        self,
+        vectorizer: SmartSymptomExtractor,
+        classifier: FedotDiseaseClassifier,
+        visualization: bool = True,
+        time_budget_seconds: Optional[float] = None,
     ) -> None:
         """Initializes a new instance of the FedotBasedExplainer class.
 
         Args:
             vectorizer: The symptom extractor.
             classifier: The classifier.
+            visualization: Whether to explain with the plotting machinery of FEDOT.
+            time_budget_seconds: The default maximum time of a batch explanation, unlimited if None.
         """
         assert isinstance(
             classifier, FedotDiseaseClassifier
@@ -93,6 +406,55 @@ class FedotBasedExplainer(BaseExplainer):
 
         self._vectorizer = vectorizer
         self._classifier = classifier
+        self.visualization = visualization
+        self.time_budget_seconds = time_budget_seconds
+
+    def _get_surrogate(self) -> DecisionTreeClassifier:
+        if self._classifier.surrogate is None:
+            raise ValueError(
+                "Classifier has no surrogate, it should be fitted or call fit_surrogate"
+            )
+
+        return self._classifier.surrogate
+
+    def get_feature_names(self) -> np.array:
+        """Gets the names of the classifier features, a feature of the one-hot encoding has the status name.
+
+        Returns:
+            A numpy array of feature names.
+        """
+        symptom_names = [
+            symptom.id_name for symptom in SymptomCollection.get_symptoms()
+        ]
+        if self._classifier.encoder.encoding != SymptomFeatureEncoder.ONEHOT:
+            return np.array(symptom_names, dtype=object)
+
+        return np.array(
+            [
+                f"{name}={status.name}"
+                for name in symptom_names
+                for status in SymptomFeatureEncoder.ONEHOT_STATUSES
+            ],
+            dtype=object,
+        )
+
+    def get_symptom_importances(self) -> Dict[str, float]:
+        """Gets the importances of symptoms in the surrogate tree.
+
+        Returns:
+            A dictionary that maps names of symptoms used by the surrogate to their importances,
+            ordered by decreasing importance.
+        """
+        symptom_names = np.array(
+            [symptom.id_name for symptom in SymptomCollection.get_symptoms()]
+        )
+        feature_importances = self._get_surrogate().feature_importances_
+        # Importances of the features of a symptom are summed up
+        importances = feature_importances.reshape(len(symptom_names), -1).sum(axis=1)
+
+        order = np.argsort(-importances, kind="stable")
+        order = order[importances[order] > 0]
+        return dict(zip(symptom_names[order].tolist(), importances[order].tolist()))
 
     def explain(self, feature: np.array) -> str:
         """Explains the given feature.
@@ -101,9 +463,104 @@ class FedotBasedExplainer(BaseExplainer):
             feature: A numpy array representing the feature to explain.
 
         Returns:
-            A string representing the explanation.
+            A string representing the explanation, or a FEDOT explainer in the visual mode.
+        """
+        if self.visualization:
+            explainer = self._classifier.model.explain(
+                features=feature[np.newaxis, :], visualization=True
+            )
+            return explainer
+
+        if not sparse.issparse(feature):
+            feature = np.asarray(feature)[np.newaxis, :]
+
+        return self.explain_batch(feature)[0].to_text()
+
+    def explain_batch(
+        self,
+        features: Union[np.array, sparse.spmatrix],
+        time_budget_seconds: Optional[float] = None,
+        as_text: bool = False,
+    ) -> Union[List[RuleExplanation], List[str]]:
+        """Explains the predictions for a matrix of features by the surrogate tree.
+
+        Args:
+            features: A dense or a sparse marks matrix of shape (n_samples, n_symptoms).
+            time_budget_seconds: The maximum time of the explanation, the default budget of the explainer if None.
+            as_text: Whether to render the explanations into strings.
+
+        Returns:
+            A list of RuleExplanation objects, or of strings if as_text is True.
+
+        Raises:
+            TimeoutError: If the explanation doesn't fit the time budget.
         """
-        explainer = self._classifier.model.explain(
-            features=feature[np.newaxis, :], visualization=True
+        if time_budget_seconds is None:
+            time_budget_seconds = self.time_budget_seconds
+        deadline = (
+            None
+            if time_budget_seconds is None
+            else time.perf_counter() + time_budget_seconds
+        )
+
+        surrogate = self._get_surrogate()
+        feature_names = self.get_feature_names()
+        encoded = self._classifier.encode(features)
+
+        explanations = []
+        for start in range(0, encoded.shape[0], self.CHUNK_SIZE):
+            if deadline is not None and time.perf_counter() > deadline:
+                raise TimeoutError(
+                    f"Explained {start} of {encoded.shape[0]} rows "
+                    f"in the time budget of {time_budget_seconds} seconds"
+                )
+
+            explanations.extend(
+                self._explain_chunk(
+                    surrogate, encoded[start : start + self.CHUNK_SIZE], feature_names
+                )
+            )
+
+        if as_text:
+            return [explanation.to_text() for explanation in explanations]
+
+        return explanations
+
+    @staticmethod
+    def _explain_chunk(
+        surrogate: DecisionTreeClassifier, encoded: np.array, feature_names: np.array
+    ) -> List[RuleExplanation]:
+        """Explains rows of encoded features by their decision paths in the surrogate tree."""
+        predict_proba = surrogate.predict_proba(encoded)
+        class_ids = np.argmax(predict_proba, axis=1)
+        diseases = np.take(surrogate.classes_, class_ids).tolist()
+        probabilities = predict_proba[np.arange(len(class_ids)), class_ids].tolist()
+
+        # Nodes of all decision paths at once, ordered by rows and then from the root
+        paths = surrogate.decision_path(encoded)
+        rows = np.repeat(np.arange(len(encoded)), np.diff(paths.indptr))
+        nodes = paths.indices
+
+        tree = surrogate.tree_
+        is_split = tree.children_left[nodes] != tree.children_right[nodes]
+        rows, nodes = rows[is_split], nodes[is_split]
+        split_features = tree.feature[nodes]
+        thresholds = tree.threshold[nodes]
+        operators = np.where(encoded[rows, split_features] <= thresholds, "<=", ">")
+
+        rules = list(
+            zip(
+                feature_names[split_features].tolist(),
+                operators.tolist(),
+                thresholds.tolist(),
+            )
         )
-        return explainer
+        row_bounds = np.searchsorted(rows, np.arange(1, len(encoded)))
+        rule_bounds = [0, *row_bounds.tolist(), len(rules)]
+
+        return [
+            RuleExplanation(disease, probability, rules[start:end])
+            for disease, probability, start, end in zip(
+                diseases, probabilities, rule_bounds[:-1], rule_bounds[1:]
+            )
+        ]
@@ -0,0 +1,62 @@
+import ast
+import time
+from itertools import cycle, islice
+from pathlib import Path
+from typing import List, Sequence
+
+import pandas as pd
+
+from distool.feature_extraction import SmartSymptomExtractor
+
+BASE_DIR = Path(__file__).parent.parent
+
+PATH_TO_SHOWCASE_DF = BASE_DIR / "../data/showcase.csv"
+
+N_MESSAGES = 100_000
+PROCESS_COUNTS = (1, 2, 4, 8)
+BATCH_SIZE = 1000
+
+
+def load_corpus(n_messages: int) -> List[str]:
+    """Builds a corpus of the given size by cycling over the sentences of the showcase cases."""
+    df_showcase = pd.read_csv(PATH_TO_SHOWCASE_DF)
+    sentences = [
+        sentence
+        for case in df_showcase.case
+        for sentence in ast.literal_eval(case)
+        if sentence.strip()
+    ]
+    return list(islice(cycle(sentences), n_messages))
+
+
+def benchmark_extraction_throughput(
+    messages: List[str],
+    process_counts: Sequence[int] = PROCESS_COUNTS,
+    batch_size: int = BATCH_SIZE,
+) -> pd.DataFrame:
+    extractor = SmartSymptomExtractor.shared()
+
+    results = []
+    for n_process in process_counts:
+        start = time.perf_counter()
+        extractor.transform(messages, n_process=n_process, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+
+        results.append(
+            {
+                "n_process": n_process,
+                "seconds": round(elapsed, 2),
+                "messages_per_second": round(len(messages) / elapsed),
+            }
+        )
+
+    return pd.DataFrame(results)
+
+
+def main():
+    messages = load_corpus(N_MESSAGES)
+    print(benchmark_extraction_throughput(messages).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import random
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from distool.estimators import DiseaseClassifier
+from distool.feature_extraction import SmartSymptomExtractor, SymptomFeatureEncoder
+
+BASE_DIR = Path(__file__).parent.parent
+
+PATH_TO_SYMPTOMS_DATASET = BASE_DIR / "../data/symptoms_datasets/symptoms_dataset.csv"
+
+N_CASES_PER_DISEASE = 30
+MAX_CASE_SYMPTOMS = 5
+DENIAL_PROBABILITY = 0.5
+TEST_SIZE = 0.3
+RANDOM_STATE = 42
+
+
+def load_cases(
+    n_cases_per_disease: int = N_CASES_PER_DISEASE, random_state: int = RANDOM_STATE
+) -> Tuple[List[str], List[str]]:
+    """Generates patient messages from the diseases and their symptoms of the symptoms dataset.
+
+    Every case mentions a random subset of the disease symptoms and sometimes denies a symptom of another disease.
+    """
+    rng = random.Random(random_state)
+    df_dataset = pd.read_csv(PATH_TO_SYMPTOMS_DATASET)
+    disease_symptoms = {
+        disease: sorted(set(symptoms.split(";")))
+        for disease, symptoms in zip(df_dataset["Болезнь"], df_dataset["Симптомы"])
+    }
+    all_symptoms = sorted(set().union(*disease_symptoms.values()))
+
+    texts, diseases = [], []
+    for disease, symptoms in disease_symptoms.items():
+        for _ in range(n_cases_per_disease):
+            n_symptoms = rng.randint(1, min(MAX_CASE_SYMPTOMS, len(symptoms)))
+            text = "У меня " + ", ".join(rng.sample(symptoms, n_symptoms))
+            if rng.random() < DENIAL_PROBABILITY:
+                text += ", но нет " + rng.choice(all_symptoms)
+
+            texts.append(text)
+            diseases.append(disease)
+
+    return texts, diseases
+
+
+def benchmark_feature_encoding(texts: List[str], diseases: List[str]) -> pd.DataFrame:
+    features = SmartSymptomExtractor.shared().transform(texts)
+    train_features, test_features, train_diseases, test_diseases = train_test_split(
+        features,
+        np.array(diseases),
+        test_size=TEST_SIZE,
+        stratify=diseases,
+        random_state=RANDOM_STATE,
+    )
+
+    results = []
+    for encoding in SymptomFeatureEncoder.ENCODINGS:
+        classifier = DiseaseClassifier(encoding=encoding)
+
+        start = time.perf_counter()
+        classifier.fit(train_features, train_diseases)
+        fit_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        predicted = classifier.predict(test_features)
+        predict_elapsed = time.perf_counter() - start
+
+        results.append(
+            {
+                "encoding": encoding,
+                "accuracy": round((predicted == test_diseases).mean(), 3),
+                "fit_seconds": round(fit_elapsed, 3),
+                "predict_seconds": round(predict_elapsed, 4),
+            }
+        )
+
+    return pd.DataFrame(results)
+
+
+def main():
+    texts, diseases = load_cases()
+    print(benchmark_feature_encoding(texts, diseases).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import time
+from typing import Callable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from distool.estimators import DiseaseClassifier
+from distool.feature_extraction import SmartSymptomExtractor
+from distool.metrics.benchmark.feature_encoding import load_cases
+
+BATCH_SIZES = (1, 10_000)
+N_REPEATS = 200
+N_LARGE_BATCH_REPEATS = 5
+RANDOM_STATE = 42
+
+
+def measure_latency(predict: Callable, features: np.array, n_repeats: int) -> float:
+    """Measures the median latency of a prediction call in seconds."""
+    latencies = []
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        predict(features)
+        latencies.append(time.perf_counter() - start)
+
+    return float(np.median(latencies))
+
+
+def benchmark_linear_scorer_latency(
+    features: np.array,
+    diseases: Sequence[str],
+    batch_sizes: Sequence[int] = BATCH_SIZES,
+    n_repeats: int = N_REPEATS,
+) -> pd.DataFrame:
+    classifier = DiseaseClassifier().fit(features, np.array(diseases))
+    scorer = classifier.export_scorer()
+
+    rng = np.random.default_rng(RANDOM_STATE)
+    results = []
+    for batch_size in batch_sizes:
+        batch = features[rng.integers(0, len(features), size=batch_size)]
+        # Large batches take long enough to be measured with a few calls
+        batch_repeats = n_repeats if batch_size == 1 else N_LARGE_BATCH_REPEATS
+
+        for engine, predict in [
+            ("sklearn", classifier.predict),
+            ("numpy", scorer.predict),
+        ]:
+            latency = measure_latency(predict, batch, batch_repeats)
+            results.append(
+                {
+                    "batch_size": batch_size,
+                    "engine": engine,
+                    "latency_ms": round(latency * 1000, 4),
+                    "rows_per_second": round(batch_size / latency),
+                }
+            )
+
+    return pd.DataFrame(results)
+
+
+def main():
+    texts, diseases = load_cases()
+    features = SmartSymptomExtractor.shared().transform(texts)
+    print(benchmark_linear_scorer_latency(features, diseases).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import time
+from typing import List
+
+import pandas as pd
+from spacy.tokens import Doc
+
+from distool.feature_extraction import SmartSymptomExtractor
+from distool.metrics.benchmark.extraction_throughput import load_corpus
+
+N_MESSAGES = 20_000
+N_REPEATS = 3
+
+
+def parse_without_negation(
+    extractor: SmartSymptomExtractor, messages: List[str]
+) -> List[Doc]:
+    """Parses messages up to the negation pipe, so only the negation is timed."""
+    return list(extractor._spacy_lang_model.pipe(messages, disable=["negex"]))
+
+
+def benchmark_negation_speed(messages: List[str]) -> pd.DataFrame:
+    results = []
+    for negation_factory in SmartSymptomExtractor.NEGATION_FACTORIES:
+        extractor = SmartSymptomExtractor.shared(negation_factory=negation_factory)
+        negation_pipe = extractor._spacy_lang_model.get_pipe("negex")
+        docs = parse_without_negation(extractor, messages)
+
+        elapsed = float("inf")
+        for _ in range(N_REPEATS):
+            start = time.perf_counter()
+            for doc in docs:
+                negation_pipe(doc)
+            elapsed = min(elapsed, time.perf_counter() - start)
+
+        results.append(
+            {
+                "negation_factory": negation_factory,
+                "seconds": round(elapsed, 3),
+                "messages_per_second": round(len(messages) / elapsed),
+            }
+        )
+
+    df_results = pd.DataFrame(results)
+    df_results["speedup"] = (df_results.seconds.iloc[0] / df_results.seconds).round(2)
+    return df_results
+
+
+def main():
+    messages = load_corpus(N_MESSAGES)
+    print(benchmark_negation_speed(messages).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
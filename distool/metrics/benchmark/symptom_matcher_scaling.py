@@ -0,0 +1,83 @@
+import random
+import time
+from typing import Dict, List, Sequence
+
+import pandas as pd
+import spacy
+
+from distool.feature_extraction import SmartSymptomExtractor
+from distool.feature_extraction.symptom_collection import SymptomCollection
+from distool.metrics.benchmark.extraction_throughput import load_corpus
+
+N_MESSAGES = 5_000
+VOCABULARY_SIZES = (500, 1_000, 2_500, 5_000, 10_000)
+RANDOM_STATE = 42
+
+
+def create_patterns(n_patterns: int, random_state: int = RANDOM_STATE) -> List[Dict]:
+    """Grows the symptom patterns to the given number with made up lemma sequences of real symptom lemmas."""
+    rng = random.Random(random_state)
+    patterns = list(SymptomCollection.get_spacy_model_patterns())[:n_patterns]
+    lemmas = sorted(
+        {token["LEMMA"] for pattern in patterns for token in pattern["pattern"]}
+    )
+
+    while len(patterns) < n_patterns:
+        pattern_lemmas = rng.sample(lemmas, rng.randint(2, 4))
+        patterns.append(
+            {
+                "label": SymptomCollection.SYMPTOM_ENTITY_LABEL_VALUE,
+                "pattern": [{"LEMMA": lemma} for lemma in pattern_lemmas],
+                "id": " ".join(pattern_lemmas),
+            }
+        )
+
+    return patterns
+
+
+def benchmark_symptom_matcher_scaling(
+    messages: List[str], vocabulary_sizes: Sequence[int] = VOCABULARY_SIZES
+) -> pd.DataFrame:
+    nlp = spacy.load(
+        SmartSymptomExtractor.SPACY_LANG_MODEL_NAME,
+        disable=SmartSymptomExtractor.SPACY_DISABLED_PIPES,
+    )
+    docs = list(nlp.pipe(messages))
+
+    results = []
+    for n_patterns in vocabulary_sizes:
+        patterns = create_patterns(n_patterns)
+        for matcher_factory in SmartSymptomExtractor.MATCHER_FACTORIES:
+            matcher_nlp = spacy.blank(nlp.lang, vocab=nlp.vocab)
+
+            start = time.perf_counter()
+            matcher = matcher_nlp.add_pipe(matcher_factory, config={"validate": True})
+            matcher.add_patterns(patterns)
+            build_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for doc in docs:
+                doc.ents = []
+                matcher(doc)
+            match_elapsed = time.perf_counter() - start
+
+            results.append(
+                {
+                    "n_patterns": n_patterns,
+                    "matcher_factory": matcher_factory,
+                    "build_seconds": round(build_elapsed, 3),
+                    "match_seconds": round(match_elapsed, 3),
+                    "messages_per_second": round(len(docs) / match_elapsed),
+                }
+            )
+
+    return pd.DataFrame(results)
+
+
+def main():
+    messages = load_corpus(N_MESSAGES)
+    print(benchmark_symptom_matcher_scaling(messages).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
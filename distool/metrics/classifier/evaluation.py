@@ -0,0 +1,237 @@
+import time
+import tracemalloc
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import StratifiedKFold
+
+from distool.estimators.classifiers import (
+    BaseDiseaseClassifier,
+    DiseaseClassifier,
+    FedotDiseaseClassifier,
+    OnlineDiseaseClassifier,
+)
+from distool.feature_extraction.feature_encoder import SymptomFeatureEncoder
+from distool.feature_extraction.feature_store import FeatureStore
+from distool.feature_extraction.smart_extractor import SmartSymptomExtractor
+from distool.metrics.benchmark.feature_encoding import load_cases
+
+BASE_DIR = Path(__file__).parent.parent
+
+PATH_TO_PREVIOUS_PROJECT_DATASET = (
+    BASE_DIR / "../data/symptoms_datasets/symptoms_dataset_from_previous_project.csv"
+)
+
+N_SPLITS = 5
+N_JOBS = -1
+RANDOM_STATE = 42
+
+ClassifierFactory = Callable[[], BaseDiseaseClassifier]
+
+
+def load_previous_project_dataset() -> Tuple[List[str], List[str]]:
+    """Loads the patient complaints and the diagnoses of the previous project dataset."""
+    df_dataset = pd.read_csv(PATH_TO_PREVIOUS_PROJECT_DATASET, sep=";")
+    return df_dataset["симптомы"].tolist(), df_dataset["диагноз"].tolist()
+
+
+# The showcase has marked symptoms but no diseases, so it can't be a classification benchmark
+BENCHMARKS: Dict[str, Callable[[], Tuple[List[str], List[str]]]] = {
+    "symptoms_dataset": load_cases,
+    "previous_project": load_previous_project_dataset,
+}
+
+
+def get_default_classifiers(
+    include_fedot: bool = False,
+) -> Dict[str, ClassifierFactory]:
+    """Gets the factories of the compared classifiers.
+
+    Args:
+        include_fedot: Whether to compare the FEDOT classifier, its search takes minutes per fold.
+
+    Returns:
+        A dictionary that maps classifier names to picklable factories.
+    """
+    classifiers = {
+        f"logreg_{encoding}": partial(DiseaseClassifier, encoding=encoding)
+        for encoding in SymptomFeatureEncoder.ENCODINGS
+    }
+    classifiers["online_signed"] = partial(
+        OnlineDiseaseClassifier, encoding=SymptomFeatureEncoder.SIGNED
+    )
+    if include_fedot:
+        # Jobs of the search would compete with the folds evaluated in parallel
+        classifiers["fedot_ordinal"] = partial(FedotDiseaseClassifier, n_jobs=1)
+
+    return classifiers
+
+
+def extract_features(texts: List[str], dataset_name: str) -> np.array:
+    """Extracts symptom marks of texts of a dataset.
+
+    The marks are kept in the feature store of the extractor cache directory, so only the texts added
+    to the dataset since the previous run are extracted, and marks of texts extracted before
+    in other datasets are read from the extraction cache.
+
+    Args:
+        texts: The texts of the dataset.
+        dataset_name: The name the marks of the dataset are stored by.
+
+    Returns:
+        A read-only memory-mapped marks matrix of shape (n_samples, n_symptoms).
+    """
+    feature_store = FeatureStore(
+        SmartSymptomExtractor.get_cache_dir() / "feature_store"
+    )
+    extractor = None
+
+    def compute_marks(new_texts: List[str]) -> np.array:
+        nonlocal extractor
+        extractor = SmartSymptomExtractor(use_extraction_cache=True)
+        return extractor.transform(new_texts)
+
+    try:
+        return feature_store.get_or_compute(
+            texts,
+            compute_marks,
+            dataset_fingerprint=dataset_name,
+            extractor_fingerprint=SmartSymptomExtractor.fingerprint(),
+        )
+    finally:
+        if extractor is not None:
+            extractor.extraction_cache.close()
+
+
+def evaluate_fold(
+    classifier_factory: ClassifierFactory,
+    features: np.array,
+    y: np.array,
+    train_index: np.array,
+    test_index: np.array,
+) -> Dict[str, float]:
+    """Fits a classifier on the train part of a fold and scores it on the test part.
+
+    Returns:
+        A dictionary with the accuracy, the macro-F1, the fit time, the predict latency per row
+        and the peak memory allocated while fitting and predicting.
+    """
+    tracemalloc.start()
+    try:
+        classifier = classifier_factory()
+
+        start = time.perf_counter()
+        classifier.fit(features[train_index], y[train_index])
+        fit_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        predicted = classifier.predict(features[test_index])
+        predict_elapsed = time.perf_counter() - start
+
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "accuracy": accuracy_score(y[test_index], predicted),
+        "macro_f1": f1_score(y[test_index], predicted, average="macro"),
+        "fit_seconds": fit_elapsed,
+        "predict_ms_per_row": predict_elapsed * 1000 / len(test_index),
+        "peak_memory_mb": peak_memory / 2**20,
+    }
+
+
+def evaluate_classifiers(
+    features: np.array,
+    y: Sequence[str],
+    classifiers: Optional[Dict[str, ClassifierFactory]] = None,
+    n_splits: int = N_SPLITS,
+    n_jobs: int = N_JOBS,
+    random_state: int = RANDOM_STATE,
+) -> pd.DataFrame:
+    """Compares classifiers by stratified k-fold cross-validation on extracted features.
+
+    Every pair of a classifier and a fold is evaluated as a separate job of a process pool.
+
+    Args:
+        features: A marks matrix of shape (n_samples, n_symptoms).
+        y: The disease labels of the samples.
+        classifiers: A dictionary that maps classifier names to picklable factories, the defaults if None.
+        n_splits: The number of folds.
+        n_jobs: The number of parallel processes, all CPUs if -1.
+        random_state: The seed of shuffling samples into folds.
+
+    Returns:
+        A DataFrame with the mean and the standard deviation of every metric over folds per classifier.
+    """
+    if classifiers is None:
+        classifiers = get_default_classifiers()
+
+    y = np.asarray(y)
+    folds = list(
+        StratifiedKFold(n_splits, shuffle=True, random_state=random_state).split(
+            features, y
+        )
+    )
+
+    jobs = [
+        (name, classifier_factory, train_index, test_index)
+        for name, classifier_factory in classifiers.items()
+        for train_index, test_index in folds
+    ]
+    # Large feature matrices are memory-mapped into the workers by joblib instead of being copied
+    fold_results = Parallel(n_jobs=n_jobs)(
+        delayed(evaluate_fold)(classifier_factory, features, y, train_index, test_index)
+        for _, classifier_factory, train_index, test_index in jobs
+    )
+
+    df_results = pd.DataFrame(fold_results)
+    df_results.insert(0, "classifier", [name for name, _, _, _ in jobs])
+
+    df_summary = df_results.groupby("classifier", sort=False).agg(["mean", "std"])
+    df_summary.columns = [f"{metric}_{stat}" for metric, stat in df_summary.columns]
+    return df_summary.round(4).reset_index()
+
+
+def evaluate_benchmarks(
+    benchmarks: Sequence[str] = tuple(BENCHMARKS),
+    classifiers: Optional[Dict[str, ClassifierFactory]] = None,
+    n_splits: int = N_SPLITS,
+    n_jobs: int = N_JOBS,
+) -> pd.DataFrame:
+    """Compares classifiers on the built-in benchmarks.
+
+    Args:
+        benchmarks: The names of benchmarks, the keys of BENCHMARKS.
+        classifiers: A dictionary that maps classifier names to picklable factories, the defaults if None.
+        n_splits: The number of folds.
+        n_jobs: The number of parallel processes, all CPUs if -1.
+
+    Returns:
+        A DataFrame with the cross-validation summary of every classifier on every benchmark.
+    """
+    summaries = []
+    for benchmark in benchmarks:
+        texts, diseases = BENCHMARKS[benchmark]()
+        features = extract_features(texts, benchmark)
+
+        df_summary = evaluate_classifiers(
+            features, diseases, classifiers, n_splits=n_splits, n_jobs=n_jobs
+        )
+        df_summary.insert(0, "benchmark", benchmark)
+        summaries.append(df_summary)
+
+    return pd.concat(summaries, ignore_index=True)
+
+
+def main():
+    print(evaluate_benchmarks().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -46,13 +46,8 @@ def create_extractor_showcase(
 
     transformed_symptoms = []
     for case in df_showcase.case:
-        anamnesis = Anamnesis()
-        anamnesis_list = extractor.transform(case, True)
-        for new_anamnesis in anamnesis_list:
-            anamnesis = anamnesis.update_symptoms_statuses_by_new_anamnesis(
-                new_anamnesis
-            )
-        transformed_symptoms.append(anamnesis.get_marks(True))
+        case_marks = extractor.transform(case)
+        transformed_symptoms.append(Anamnesis.fold_marks(case_marks))
 
     extractor_symptom_column_labels = get_extractor_symptom_column_labels(
         existed_symptoms_id
@@ -200,5 +195,5 @@ def symptom_id_to_extractor_column_name(id):
 
 
 if __name__ == "__main__":
-    create_extractor_showcase(SmartSymptomExtractor(), PATH_TO_SMART_SHOWCASE_DF)
+    create_extractor_showcase(SmartSymptomExtractor.shared(), PATH_TO_SMART_SHOWCASE_DF)
     create_extractor_showcase(DumbSymptomExtractor(), PATH_TO_DUMB_SHOWCASE_DF)
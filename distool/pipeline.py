@@ -0,0 +1,301 @@
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from distool.base.estimators import BaseTransformer
+from distool.estimators.classifiers import DiseaseClassifier
+from distool.feature_extraction.feature_encoder import SymptomFeatureEncoder
+from distool.feature_extraction.symptom_collection import SymptomCollection
+from distool.interpretation.explainer import SymptomBasedExplainer
+
+
+class IntakePipeline:
+    """
+    An end-to-end pipeline of symptom extraction, disease classification and explanation.
+
+    The pipeline owns the extractor config, the feature encoding, the classifier and the explainer,
+    and saves them to one versioned bundle directory. The classifier weights are stored as NumPy files,
+    so a worker loads the bundle by memory-mapping them instead of retraining or unpickling the model.
+    Every save writes the weights to a new directory of the bundle and then replaces the manifest
+    that points to it, so files mapped by workers are never overwritten.
+
+    Attributes:
+        FORMAT_VERSION: The version of the bundle format, it is increased on incompatible changes.
+        MANIFEST_FILE_NAME: The file name of the bundle manifest.
+        WEIGHT_NAMES: The names of the classifier weights, every weight is stored in its own .npy file.
+        WEIGHTS_DIR_PREFIX: The name prefix of the bundle directories with weights.
+        SMART_EXTRACTOR: The name of the SpaCy based extractor.
+        DUMB_EXTRACTOR: The name of the substring matching extractor.
+        EXTRACTORS: The names of all supported extractors.
+        extractor_name: The name of the extractor.
+        extractor_options: The options of the extractor.
+        encoding: The name of the encoding of symptom marks.
+        classifier: The disease classifier.
+    """
+
+    FORMAT_VERSION: int = 1
+    MANIFEST_FILE_NAME: str = "manifest.json"
+    WEIGHT_NAMES: List[str] = ["coef", "intercept", "classes"]
+    WEIGHTS_DIR_PREFIX: str = "weights-"
+
+    SMART_EXTRACTOR: str = "smart"
+    DUMB_EXTRACTOR: str = "dumb"
+    EXTRACTORS: List[str] = [SMART_EXTRACTOR, DUMB_EXTRACTOR]
+
+    def __init__(
+        self,
+        extractor: str = SMART_EXTRACTOR,
+        encoding: str = SymptomFeatureEncoder.ORDINAL,
+        **extractor_options,
+    ) -> None:
+        """Initializes a new instance of the IntakePipeline class.
+
+        Args:
+            extractor: The name of the extractor, one of IntakePipeline.EXTRACTORS.
+            encoding: The name of the encoding of symptom marks, one of SymptomFeatureEncoder.ENCODINGS.
+            **extractor_options: Options of the extractor, for the smart one they are passed
+                to ``SmartSymptomExtractor.shared``.
+        """
+        if extractor not in IntakePipeline.EXTRACTORS:
+            raise ValueError(
+                f"Unknown extractor {extractor}, expected one of {IntakePipeline.EXTRACTORS}"
+            )
+        if extractor == IntakePipeline.DUMB_EXTRACTOR and extractor_options:
+            raise ValueError("Dumb extractor has no options")
+
+        self.extractor_name = extractor
+        self.extractor_options = extractor_options
+        self.encoding = encoding
+        self.classifier: Optional[DiseaseClassifier] = None
+
+        self._extractor: Optional[BaseTransformer] = None
+        self._explainer: Optional[SymptomBasedExplainer] = None
+
+    @property
+    def extractor(self) -> BaseTransformer:
+        """The symptom extractor, it is created on first access."""
+        if self._extractor is None:
+            if self.extractor_name == IntakePipeline.SMART_EXTRACTOR:
+                from distool.feature_extraction.smart_extractor import (
+                    SmartSymptomExtractor,
+                )
+
+                self._extractor = SmartSymptomExtractor.shared(**self.extractor_options)
+            else:
+                from distool.feature_extraction.dumb_extractor import (
+                    DumbSymptomExtractor,
+                )
+
+                self._extractor = DumbSymptomExtractor()
+
+        return self._extractor
+
+    @property
+    def explainer(self) -> SymptomBasedExplainer:
+        """The explainer of predictions, it is created on first access."""
+        self._check_fitted()
+        if self._explainer is None:
+            self._explainer = SymptomBasedExplainer(self.extractor, self.classifier)
+
+        return self._explainer
+
+    def _check_fitted(self):
+        if self.classifier is None:
+            raise ValueError("Pipeline is not fitted")
+
+    def transform(self, texts: Iterable[str]) -> np.array:
+        """Extracts symptom marks of texts.
+
+        Args:
+            texts: Iterable over user messages.
+
+        Returns:
+            A numpy array of symptom marks.
+        """
+        return self.extractor.transform(texts)
+
+    def fit(self, texts: Iterable[str], diseases: Iterable[Any]) -> "IntakePipeline":
+        """Fits the classifier on the symptom marks of texts.
+
+        Args:
+            texts: Iterable over user messages.
+            diseases: The disease labels of the messages.
+
+        Returns:
+            self: object
+        """
+        self.classifier = DiseaseClassifier(self.encoding)
+        self.classifier.fit(self.transform(texts), np.asarray(diseases))
+        self._explainer = None
+
+        return self
+
+    def predict_proba(self, texts: Iterable[str]) -> np.array:
+        """Predicts probabilities of diseases for texts.
+
+        Args:
+            texts: Iterable over user messages.
+
+        Returns:
+            A numpy array of shape (n_texts, n_classes) of class probabilities.
+        """
+        self._check_fitted()
+        return self.classifier.predict_proba(self.transform(texts))
+
+    def predict(self, texts: Iterable[str]) -> np.array:
+        """Predicts diseases for texts.
+
+        Args:
+            texts: Iterable over user messages.
+
+        Returns:
+            A numpy array of predicted class labels.
+        """
+        self._check_fitted()
+        return self.classifier.predict(self.transform(texts))
+
+    def explain(self, text: str) -> str:
+        """Explains the prediction for a text.
+
+        Args:
+            text: A user message.
+
+        Returns:
+            A string representing the explanation.
+        """
+        return self.explainer.explain(self.transform([text])[0])
+
+    def get_manifest(self) -> Dict[str, Any]:
+        """Gets the description of the pipeline saved next to the weights.
+
+        Returns:
+            A dictionary with the format version, the extractor config, the encoding and
+            the fingerprint of the symptoms the classifier was fitted on. The directory of weights
+            is added to it on save.
+        """
+        self._check_fitted()
+        return {
+            "format_version": IntakePipeline.FORMAT_VERSION,
+            "extractor": self.extractor_name,
+            # Paths, like the cache directory, are stored as strings
+            "extractor_options": {
+                name: str(value) if isinstance(value, Path) else value
+                for name, value in self.extractor_options.items()
+            },
+            "encoding": self.encoding,
+            "fitted_on_sparse": self.classifier._fitted_on_sparse,
+            "symptoms_fingerprint": SymptomCollection.get_fingerprint(),
+        }
+
+    def save(self, path: Union[str, Path]):
+        """Saves the pipeline to a bundle directory.
+
+        The weights are written to a new directory and the manifest pointing to it replaces the previous one
+        atomically, so a save interrupted midway leaves the previous bundle intact. Weights of previous saves
+        are deleted afterwards, workers that have already memory-mapped them keep reading the old files,
+        and ``load`` that read the previous manifest before the weights were deleted reads the new one again.
+
+        Args:
+            path: The directory path of the bundle, it is created if it doesn't exist.
+        """
+        self._check_fitted()
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        manifest = self.get_manifest()
+
+        weights_path = Path(
+            tempfile.mkdtemp(prefix=IntakePipeline.WEIGHTS_DIR_PREFIX, dir=path)
+        )
+        manifest_tmp_path = path / (IntakePipeline.MANIFEST_FILE_NAME + ".tmp")
+        try:
+            for name, weight in self.classifier.get_weights().items():
+                # Labels are saved as unicode strings, because object arrays can't be memory-mapped
+                if weight.dtype == object:
+                    weight = weight.astype(str)
+                np.save(weights_path / f"{name}.npy", weight, allow_pickle=False)
+
+            manifest["weights_dir"] = weights_path.name
+            with open(manifest_tmp_path, "w", encoding="utf8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            os.replace(manifest_tmp_path, path / IntakePipeline.MANIFEST_FILE_NAME)
+        except BaseException:
+            shutil.rmtree(weights_path, ignore_errors=True)
+            raise
+
+        for previous_weights_path in path.glob(f"{IntakePipeline.WEIGHTS_DIR_PREFIX}*"):
+            if previous_weights_path != weights_path:
+                shutil.rmtree(previous_weights_path, ignore_errors=True)
+
+    @staticmethod
+    def _read_manifest(path: Path) -> Dict[str, Any]:
+        """Reads the manifest of a bundle and checks that the bundle can be loaded.
+
+        Raises:
+            ValueError: If the bundle has another format version or was fitted on another set of symptoms.
+        """
+        with open(path / IntakePipeline.MANIFEST_FILE_NAME, encoding="utf8") as f:
+            manifest = json.load(f)
+
+        if manifest["format_version"] != IntakePipeline.FORMAT_VERSION:
+            raise ValueError(
+                f"Bundle format version is {manifest['format_version']}, "
+                f"but only {IntakePipeline.FORMAT_VERSION} is supported"
+            )
+        if manifest["symptoms_fingerprint"] != SymptomCollection.get_fingerprint():
+            raise ValueError(
+                "Bundle was fitted on another set of symptoms, the pipeline should be refitted"
+            )
+
+        return manifest
+
+    @staticmethod
+    def _load_weights(
+        path: Path, manifest: Dict[str, Any], mmap: bool
+    ) -> Dict[str, np.array]:
+        """Loads the weights of a bundle from the directory its manifest points to."""
+        weights_path = path / manifest["weights_dir"]
+        return {
+            name: np.load(
+                weights_path / f"{name}.npy",
+                mmap_mode="r" if mmap else None,
+                allow_pickle=False,
+            )
+            for name in IntakePipeline.WEIGHT_NAMES
+        }
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "IntakePipeline":
+        """Loads a pipeline from a bundle directory.
+
+        Args:
+            path: The directory path of the bundle.
+            mmap: Whether to memory-map the weights read-only instead of reading them into memory.
+
+        Returns:
+            An IntakePipeline instance.
+
+        Raises:
+            ValueError: If the bundle has another format version or was fitted on another set of symptoms.
+        """
+        path = Path(path)
+        manifest = cls._read_manifest(path)
+        try:
+            weights = cls._load_weights(path, manifest, mmap)
+        except FileNotFoundError:
+            # A concurrent save has replaced the manifest and deleted the weights it pointed to
+            manifest = cls._read_manifest(path)
+            weights = cls._load_weights(path, manifest, mmap)
+
+        pipeline = cls(
+            manifest["extractor"], manifest["encoding"], **manifest["extractor_options"]
+        )
+        pipeline.classifier = DiseaseClassifier.from_weights(
+            weights, manifest["encoding"], manifest["fitted_on_sparse"]
+        )
+
+        return pipeline
@@ -0,0 +1,24 @@
+"""This page documents the classes used for serving the models in asyncio applications.
+It includes AsyncIntakePipeline, MicroBatcher and LatencyHistogram classes.
+These classes gather concurrent requests into batches and measure their latencies.
+"""
+
+from typing import TYPE_CHECKING
+
+from distool.base.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from distool.serving.async_pipeline import AsyncIntakePipeline
+    from distool.serving.latency import LatencyHistogram
+    from distool.serving.micro_batcher import MicroBatcher
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "AsyncIntakePipeline": "distool.serving.async_pipeline",
+        "LatencyHistogram": "distool.serving.latency",
+        "MicroBatcher": "distool.serving.micro_batcher",
+    },
+)
+
+__all__ = ["AsyncIntakePipeline", "LatencyHistogram", "MicroBatcher"]
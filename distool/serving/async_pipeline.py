@@ -0,0 +1,111 @@
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from distool.base.estimators import BaseEstimator, BaseTransformer
+from distool.serving.micro_batcher import MicroBatcher
+
+
+class AsyncIntakePipeline:
+    """
+    An asyncio facade of symptom extraction and disease prediction for single user messages.
+
+    Concurrent calls are gathered into micro-batches, so the extractor processes them with a single
+    batched call instead of a call per message, and the blocking work runs in an executor without blocking
+    the event loop. By default the executor has a single thread, so the extractor and the classifier
+    are never used by two threads at once.
+
+    Attributes:
+        extract_batcher: The micro-batcher of extraction requests.
+        predict_batcher: The micro-batcher of prediction requests.
+    """
+
+    def __init__(
+        self,
+        extractor: BaseTransformer,
+        classifier: Optional[BaseEstimator] = None,
+        max_batch_size: int = 32,
+        max_wait_seconds: float = 0.005,
+        max_queue_size: int = 1024,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """Initializes a new instance of the AsyncIntakePipeline class.
+
+        Args:
+            extractor: The symptom extractor.
+            classifier: The fitted disease classifier, required only for predictions.
+            max_batch_size: The maximum number of messages in a batch.
+            max_wait_seconds: The maximum time a message waits for the batch to fill.
+            max_queue_size: The maximum number of waiting messages of every kind of requests.
+            executor: The executor to run batches in. A single-thread executor is created if None.
+        """
+        self._extractor = extractor
+        self._classifier = classifier
+
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="distool-intake"
+        )
+
+        batcher_options = dict(
+            max_batch_size=max_batch_size,
+            max_wait_seconds=max_wait_seconds,
+            max_queue_size=max_queue_size,
+            executor=self._executor,
+        )
+        self.extract_batcher = MicroBatcher(self._extract_batch, **batcher_options)
+        self.predict_batcher = MicroBatcher(self._predict_batch, **batcher_options)
+
+    def _extract_batch(self, messages: List[str]) -> List[np.array]:
+        return list(self._extractor.transform(messages))
+
+    def _predict_batch(self, messages: List[str]) -> List[Any]:
+        return list(self._classifier.predict(self._extractor.transform(messages)))
+
+    async def aextract(self, message: str) -> np.array:
+        """Extracts symptom marks of a message.
+
+        Args:
+            message: A string representing a user message.
+
+        Returns:
+            A numpy array of symptom status values.
+
+        Raises:
+            asyncio.QueueFull: If too many extraction requests are waiting.
+        """
+        return await self.extract_batcher.submit(message)
+
+    async def apredict(self, message: str) -> Any:
+        """Predicts the disease of a message.
+
+        Args:
+            message: A string representing a user message.
+
+        Returns:
+            The predicted class label.
+
+        Raises:
+            asyncio.QueueFull: If too many prediction requests are waiting.
+        """
+        if self._classifier is None:
+            raise ValueError("Pipeline has no classifier for predictions")
+
+        return await self.predict_batcher.submit(message)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Gets the counters of the batchers.
+
+        Returns:
+            A dictionary with the stats of the extraction and the prediction batchers.
+        """
+        return {
+            "extract": self.extract_batcher.get_stats(),
+            "predict": self.predict_batcher.get_stats(),
+        }
+
+    def close(self):
+        """Shuts down the executor if it was created by the pipeline."""
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
@@ -0,0 +1,101 @@
+import math
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Sequence
+
+
+class LatencyHistogram:
+    """
+    A histogram of latencies with fixed buckets.
+
+    Observations are counted in the first bucket whose upper bound is not less than the latency,
+    so memory doesn't depend on the number of observations, and quantiles are estimated
+    by the upper bound of the bucket they fall into.
+
+    Attributes:
+        DEFAULT_BUCKETS: The default upper bounds of buckets in seconds.
+        buckets: The upper bounds of buckets in seconds, the last one is infinite.
+    """
+
+    DEFAULT_BUCKETS: Sequence[float] = (
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+    )
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """Initializes a new instance of the LatencyHistogram class.
+
+        Args:
+            buckets: The increasing upper bounds of buckets in seconds.
+        """
+        self.buckets: List[float] = sorted(buckets) + [math.inf]
+
+        self._counts: List[int] = [0] * len(self.buckets)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        """Adds a latency to the histogram.
+
+        Args:
+            seconds: The latency in seconds.
+        """
+        with self._lock:
+            self._counts[bisect_left(self.buckets, seconds)] += 1
+            self._count += 1
+            self._sum += seconds
+
+    def get_counts(self) -> Dict[float, int]:
+        """Gets the numbers of observations by buckets.
+
+        Returns:
+            A dictionary that maps upper bounds of buckets to numbers of observations in them.
+        """
+        return dict(zip(self.buckets, self._counts))
+
+    def quantile(self, q: float) -> float:
+        """Estimates a quantile of latencies.
+
+        Args:
+            q: The quantile level from 0 to 1.
+
+        Returns:
+            The upper bound of the bucket with the quantile or NaN if there are no observations.
+        """
+        if self._count == 0:
+            return math.nan
+
+        rank = q * self._count
+        cumulative_count = 0
+        for upper_bound, count in zip(self.buckets, self._counts):
+            cumulative_count += count
+            if cumulative_count >= rank and count:
+                return upper_bound
+
+        return self.buckets[-1]
+
+    def get_stats(self) -> Dict[str, float]:
+        """Gets the summary of latencies.
+
+        Returns:
+            A dictionary with the number of observations, the mean latency and estimates of p50, p95 and p99.
+        """
+        return {
+            "count": self._count,
+            "mean": self._sum / self._count if self._count else math.nan,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
@@ -0,0 +1,163 @@
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from distool.serving.latency import LatencyHistogram
+
+
+class MicroBatcher:
+    """
+    Gathers concurrent asyncio requests into batches processed by a blocking function in an executor.
+
+    A batch is sent as soon as it has ``max_batch_size`` items or its first item has waited ``max_wait_seconds``.
+    Batches are processed one at a time, because SpaCy pipelines and models are not guaranteed to be thread-safe.
+
+    Attributes:
+        max_batch_size: The maximum number of items in a batch.
+        max_wait_seconds: The maximum time an item waits for the batch to fill.
+        max_queue_size: The maximum number of submitted and not yet resolved items.
+        latency: The histogram of latencies from submitting an item to its result.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 32,
+        max_wait_seconds: float = 0.005,
+        max_queue_size: int = 1024,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """Initializes a new instance of the MicroBatcher class.
+
+        Args:
+            process_batch: A blocking function that returns a result for every item of a batch in the same order.
+            max_batch_size: The maximum number of items in a batch.
+            max_wait_seconds: The maximum time an item waits for the batch to fill.
+            max_queue_size: The maximum number of submitted and not yet resolved items.
+            executor: The executor to run batches in. The default executor of the loop is used if None.
+        """
+        if max_batch_size < 1:
+            raise ValueError(
+                f"Max batch size should be positive, but it is {max_batch_size}"
+            )
+
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.max_queue_size = max_queue_size
+        self.latency = LatencyHistogram()
+
+        self._process_batch = process_batch
+        self._executor = executor
+
+        self._pending: List[Tuple[Any, asyncio.Future, float]] = []
+        self._queue_depth = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._batch_lock: Optional[asyncio.Lock] = None
+        # The loop keeps only weak references to tasks
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self._batches_count = 0
+        self._items_count = 0
+
+    async def submit(self, item: Any) -> Any:
+        """Submits an item and waits for its result.
+
+        Args:
+            item: The item to process.
+
+        Returns:
+            The result of the item.
+
+        Raises:
+            asyncio.QueueFull: If max_queue_size items are already waiting.
+        """
+        if self._queue_depth >= self.max_queue_size:
+            raise asyncio.QueueFull(
+                f"{self._queue_depth} items are waiting, the limit is {self.max_queue_size}"
+            )
+
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._batch_lock = asyncio.Lock()
+
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+        self._queue_depth += 1
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush(loop)
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                self.max_wait_seconds, self._flush, loop
+            )
+
+        try:
+            return await future
+        finally:
+            self._queue_depth -= 1
+
+    def _flush(self, loop: asyncio.AbstractEventLoop):
+        """Sends the pending items as batches."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        while self._pending:
+            batch = self._pending[: self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size :]
+            task = loop.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future, float]]):
+        """Processes a batch in the executor and resolves the futures of its items."""
+        # Items of requests that were cancelled while waiting are not processed
+        batch = [request for request in batch if not request[1].done()]
+        if not batch:
+            return
+
+        loop = asyncio.get_running_loop()
+        async with self._batch_lock:
+            try:
+                results = await loop.run_in_executor(
+                    self._executor,
+                    self._process_batch,
+                    [item for item, _, _ in batch],
+                )
+                if len(results) != len(batch):
+                    raise ValueError(
+                        f"Batch of {len(batch)} items got {len(results)} results"
+                    )
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+        self._batches_count += 1
+        self._items_count += len(batch)
+
+        finish_time = time.perf_counter()
+        for (_, future, submit_time), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+            self.latency.observe(finish_time - submit_time)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gets the counters of the batcher.
+
+        Returns:
+            A dictionary with the current queue depth, the numbers of processed batches and items,
+            the mean batch size and the latency summary.
+        """
+        return {
+            "queue_depth": self._queue_depth,
+            "batches": self._batches_count,
+            "items": self._items_count,
+            "mean_batch_size": (
+                self._items_count / self._batches_count if self._batches_count else 0.0
+            ),
+            "latency": self.latency.get_stats(),
+        }
@@ -23,3 +23,18 @@ def complex_data():
     ]
     diseases = ["a", "b", "a", "b", "a", "b", "b", "a"]
     return texts, diseases
+
+
+@pytest.fixture
+def count_calls():
+
+    def wrap(compute_marks):
+        calls = []
+
+        def counted(messages):
+            calls.append(list(messages))
+            return compute_marks(messages)
+
+        return counted, calls
+
+    return wrap
@@ -1,5 +1,11 @@
+import pickle
+
+import numpy as np
+import pytest
+
 from distool.estimators import DiseaseClassifier
-from distool.feature_extraction import SmartSymptomExtractor
+from distool.estimators.classifiers import UrgencyClassifier
+from distool.feature_extraction import SmartSymptomExtractor, SymptomFeatureEncoder
 
 
 def test_classifier(simple_data):
@@ -12,3 +18,105 @@ def test_classifier(simple_data):
     classifier.fit(features, diseases)
 
     assert (classifier.predict(features) == diseases).all()
+
+
+def test_classifier_on_sparse_features(complex_data):
+    texts, diseases = complex_data
+
+    symptom_vectorizer = SmartSymptomExtractor()
+    features = symptom_vectorizer.transform(texts, output="sparse")
+
+    classifier = DiseaseClassifier()
+    classifier.fit(features, diseases)
+
+    dense_features = symptom_vectorizer.transform(texts)
+    assert (
+        classifier.predict_proba(dense_features) == classifier.predict_proba(features)
+    ).all()
+
+
+@pytest.mark.parametrize("encoding", SymptomFeatureEncoder.ENCODINGS)
+def test_classifier_encoding_is_persisted(encoding, complex_data):
+    texts, diseases = complex_data
+
+    symptom_vectorizer = SmartSymptomExtractor()
+    features = symptom_vectorizer.transform(texts)
+
+    classifier = DiseaseClassifier(encoding=encoding)
+    classifier.fit(features, diseases)
+    loaded_classifier = pickle.loads(pickle.dumps(classifier))
+
+    assert loaded_classifier.encoder.encoding == encoding
+    assert (
+        loaded_classifier.predict_proba(features) == classifier.predict_proba(features)
+    ).all()
+
+
+@pytest.fixture(scope="module")
+def three_class_marks():
+    rng = np.random.default_rng(42)
+    marks = rng.integers(1, 5, size=(60, 8)).astype(np.int8)
+    y = np.array(["a", "b", "c"])[marks[:, 0] % 3]
+    return marks, y
+
+
+def test_predict_topk_ranks_classes_by_probability(three_class_marks):
+    marks, y = three_class_marks
+    classifier = DiseaseClassifier().fit(marks, y)
+    classifier.threshold = 0.0
+
+    topk = classifier.predict_topk(marks, k=2)
+
+    proba = classifier.predict_proba(marks)
+    assert topk.labels.shape == topk.probabilities.shape == (len(marks), 2)
+    assert (topk.labels[:, 0] == classifier.predict(marks)).all()
+    np.testing.assert_allclose(topk.probabilities[:, 0], proba.max(axis=1))
+    np.testing.assert_allclose(topk.probabilities[:, 1], np.sort(proba, axis=1)[:, -2])
+
+
+def test_predict_topk_limits_k_by_number_of_classes(three_class_marks):
+    marks, y = three_class_marks
+    classifier = DiseaseClassifier().fit(marks, y)
+    classifier.threshold = 0.0
+
+    topk = classifier.predict_topk(marks, k=10)
+
+    assert topk.labels.shape == (len(marks), 3)
+    np.testing.assert_allclose(topk.probabilities.sum(axis=1), 1.0)
+
+
+def test_predict_topk_abstains_below_threshold(three_class_marks):
+    marks, y = three_class_marks
+    classifier = DiseaseClassifier().fit(marks, y)
+    top_proba = classifier.predict_proba(marks).max(axis=1)
+    classifier.threshold = np.median(top_proba)
+
+    topk = classifier.predict_topk(marks, k=2)
+
+    abstained = top_proba < classifier.threshold
+    assert (topk.labels[abstained] == DiseaseClassifier.ABSTAIN_LABEL).all()
+    assert (topk.probabilities[abstained] == 0).all()
+    assert (topk.labels[~abstained, 0] != DiseaseClassifier.ABSTAIN_LABEL).all()
+
+
+def test_predict_topk_drops_candidates_below_min_proba(three_class_marks):
+    marks, y = three_class_marks
+    classifier = DiseaseClassifier().fit(marks, y)
+    classifier.threshold = 0.0
+
+    topk = classifier.predict_topk(marks, k=3, min_proba=0.2)
+
+    dropped = topk.labels == DiseaseClassifier.ABSTAIN_LABEL
+    assert (topk.probabilities[dropped] == 0).all()
+    assert (topk.probabilities[~dropped] >= 0.2).all()
+
+
+def test_urgency_classifier_predict_topk(three_class_marks):
+    marks, _ = three_class_marks
+    urgency = marks[:, 1] % 2
+    classifier = UrgencyClassifier().fit(marks, urgency)
+    classifier.threshold = 0.0
+
+    topk = classifier.predict_topk(marks, k=1)
+
+    assert (topk.labels[:, 0] == classifier.predict(marks)).all()
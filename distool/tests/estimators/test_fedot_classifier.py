@@ -1,29 +1,66 @@
-import time
-
+import numpy as np
 from sklearn.metrics import accuracy_score
 
 from distool.estimators import FedotDiseaseClassifier
 from distool.feature_extraction import SmartSymptomExtractor
 
+FEDOT_OPTIONS = dict(timeout=0.5, n_jobs=1, early_stopping_iterations=2)
+FIT_ATTEMPTS = 3
+
+
+def fit_with_retries(classifier, features, diseases):
+    # FEDOT search sometimes fails with nans in the composed pipelines
+    for attempt in range(FIT_ATTEMPTS):
+        try:
+            return classifier.fit(features, diseases)
+        except ValueError:
+            if attempt == FIT_ATTEMPTS - 1:
+                raise
 
-def test_classifier(complex_data):
+
+def test_classifier(complex_data, tmp_path, monkeypatch):
     texts, diseases = complex_data
 
     symptom_vectorizer = SmartSymptomExtractor()
     features = symptom_vectorizer.transform(texts)
 
-    classifier = FedotDiseaseClassifier(early_stopping_iterations=2)
-
-    # bug with nans
-    for _ in range(100):
-        try:
-            classifier.fit(features, diseases)
-            break
-        except ValueError as e:
-            print(repr(e), "Trying...")
-            time.sleep(1)
+    classifier = FedotDiseaseClassifier(warm_start=True, **FEDOT_OPTIONS)
+    fit_with_retries(classifier, features, diseases)
 
     accuracy = accuracy_score(classifier.predict(features), diseases)
 
     # TODO: accuracy and time complexity trade off
     assert accuracy >= 0.5
+
+    classifier.threshold = 0.0
+    topk = classifier.predict_topk(features, k=2)
+    assert (topk.labels[:, 0] == classifier.predict(features)).all()
+
+    classifier.save(tmp_path)
+    loaded_classifier = FedotDiseaseClassifier.load(tmp_path)
+
+    np.testing.assert_allclose(
+        loaded_classifier.predict_proba(features), classifier.predict_proba(features)
+    )
+    assert loaded_classifier.options == classifier.options
+    assert loaded_classifier.surrogate_score == classifier.surrogate_score
+
+    # The search of the loaded classifier starts from the saved pipeline
+    previous_structure = loaded_classifier.model.current_pipeline.descriptive_id
+    initial_assumptions = []
+    create_model = FedotDiseaseClassifier._create_model
+
+    def record_create_model(self, initial_assumption=None):
+        model = create_model(self, initial_assumption)
+        initial_assumptions.append(model.params.get("initial_assumption"))
+        return model
+
+    monkeypatch.setattr(FedotDiseaseClassifier, "_create_model", record_create_model)
+    fit_with_retries(loaded_classifier, features, diseases)
+
+    assert initial_assumptions
+    assert all(
+        assumption.descriptive_id == previous_structure
+        for assumption in initial_assumptions
+    )
+    assert accuracy_score(loaded_classifier.predict(features), diseases) >= 0.5
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from distool.estimators import DiseaseClassifier
+from distool.feature_extraction import SymptomFeatureEncoder
+from distool.feature_extraction.sparse_marks import marks_to_csr
+from distool.feature_extraction.symptom_status import SymptomStatus
+
+
+@pytest.fixture(scope="module")
+def random_marks():
+    rng = np.random.default_rng(42)
+    statuses = [status.value for status in SymptomStatus]
+    return rng.choice(statuses, size=(60, 12)).astype(np.int8)
+
+
+@pytest.mark.parametrize("n_classes", [2, 3])
+@pytest.mark.parametrize("encoding", SymptomFeatureEncoder.ENCODINGS)
+def test_scorer_matches_classifier(random_marks, n_classes, encoding):
+    y = np.array([f"disease_{i % n_classes}" for i in range(len(random_marks))])
+    classifier = DiseaseClassifier(encoding=encoding).fit(random_marks, y)
+
+    scorer = classifier.export_scorer()
+
+    np.testing.assert_allclose(
+        scorer.predict_proba(random_marks), classifier.predict_proba(random_marks)
+    )
+    np.testing.assert_array_equal(
+        scorer.predict(random_marks), classifier.predict(random_marks)
+    )
+
+
+def test_scorer_accepts_sparse_marks_and_single_row(random_marks):
+    y = np.array([f"disease_{i % 3}" for i in range(len(random_marks))])
+    classifier = DiseaseClassifier().fit(marks_to_csr(random_marks), y)
+
+    scorer = classifier.export_scorer()
+
+    np.testing.assert_allclose(
+        scorer.predict_proba(random_marks),
+        classifier.predict_proba(marks_to_csr(random_marks)),
+    )
+    np.testing.assert_array_equal(
+        scorer.predict(random_marks[0]), classifier.predict(random_marks[:1])
+    )
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from distool.estimators import OnlineDiseaseClassifier
+from distool.feature_extraction import SymptomFeatureEncoder
+from distool.feature_extraction.sparse_marks import marks_to_csr
+
+
+@pytest.fixture(scope="module")
+def stream_marks():
+    rng = np.random.default_rng(42)
+    marks = rng.integers(1, 5, size=(300, 8)).astype(np.int8)
+    # YES, NO and the other statuses of the first symptom define the disease
+    y = np.array(["c", "a", "b", "c", "c"])[marks[:, 0]]
+    return marks, y
+
+
+@pytest.mark.parametrize("encoding", SymptomFeatureEncoder.ENCODINGS)
+def test_partial_fit_learns_from_batches(stream_marks, encoding):
+    marks, y = stream_marks
+    classifier = OnlineDiseaseClassifier(encoding=encoding)
+
+    for start in range(0, len(marks), 50):
+        classifier.partial_fit(marks[start : start + 50], y[start : start + 50])
+
+    assert (classifier.predict(marks) == y).mean() > 0.7
+    np.testing.assert_allclose(classifier.predict_proba(marks).sum(axis=1), 1.0)
+
+
+def test_partial_fit_adds_new_labels(stream_marks):
+    marks, y = stream_marks
+    first_batch = np.isin(y, ["a", "b"])
+    classifier = OnlineDiseaseClassifier().partial_fit(
+        marks[first_batch], y[first_batch]
+    )
+
+    assert list(classifier.id2class.values()) == ["a", "b"]
+
+    classifier.partial_fit(marks, y)
+
+    assert list(classifier.id2class.values()) == ["a", "b", "c"]
+    assert classifier.predict_proba(marks).shape == (len(marks), 3)
+    assert "c" in set(classifier.predict(marks))
+
+
+def test_partial_fit_adds_classes_in_advance(stream_marks):
+    marks, y = stream_marks
+    classifier = OnlineDiseaseClassifier().partial_fit(
+        marks[:10], y[:10], classes=["c", "b", "a", "d"]
+    )
+
+    assert list(classifier.id2class.values()) == ["c", "b", "a", "d"]
+
+
+def test_partial_fit_rejects_other_number_of_features(stream_marks):
+    marks, y = stream_marks
+    classifier = OnlineDiseaseClassifier().partial_fit(marks, y)
+
+    with pytest.raises(ValueError):
+        classifier.partial_fit(marks[:, :5], y)
+
+
+def test_checkpoint_round_trip(stream_marks, tmp_path):
+    marks, y = stream_marks
+    classifier = OnlineDiseaseClassifier(encoding=SymptomFeatureEncoder.SIGNED)
+    classifier.partial_fit(marks_to_csr(marks[:150]), y[:150])
+    checkpoint_path = tmp_path / "online.npz"
+
+    classifier.save(checkpoint_path)
+    loaded_classifier = OnlineDiseaseClassifier.load(checkpoint_path)
+
+    np.testing.assert_allclose(
+        loaded_classifier.predict_proba(marks), classifier.predict_proba(marks)
+    )
+    assert loaded_classifier.n_steps == classifier.n_steps
+
+    # Learning continues from the checkpoint as if the model was never saved
+    classifier.partial_fit(marks_to_csr(marks[150:]), y[150:])
+    loaded_classifier.partial_fit(marks_to_csr(marks[150:]), y[150:])
+    np.testing.assert_allclose(loaded_classifier.coef, classifier.coef)
@@ -0,0 +1,42 @@
+import ast
+
+import pandas as pd
+
+from distool.feature_extraction import DumbSymptomExtractor
+from distool.feature_extraction.aho_corasick import AhoCorasickAutomaton
+from distool.feature_extraction.symptom_collection import BASE_DIR, SymptomCollection
+
+
+def test_automaton_finds_overlapping_patterns():
+    automaton = AhoCorasickAutomaton(["he", "she", "his", "hers", ""])
+
+    matches = sorted(automaton.iter_matches("ushers"))
+
+    assert matches == [(0, 2), (1, 1), (3, 2), (4, 0)]
+
+
+def test_dumb_extractor_matches_substring_search():
+    df_showcase = pd.read_csv(BASE_DIR / "data/showcase.csv")
+    messages = [
+        sentence
+        for case in df_showcase.case[:20]
+        for sentence in ast.literal_eval(case)
+    ]
+    extractor = DumbSymptomExtractor()
+
+    for message in messages:
+        found_symptoms = {symptom for symptom, _ in extractor.find_symptoms(message)}
+        expected_symptoms = {
+            symptom
+            for symptom in SymptomCollection.get_symptoms()
+            if symptom.id_name in message
+        }
+        assert found_symptoms == expected_symptoms
+
+
+def test_dumb_extractor_reports_offsets():
+    message = "у я температура и боль в горло"
+    extractor = DumbSymptomExtractor()
+
+    for symptom, start in extractor.find_symptoms(message):
+        assert message[start : start + len(symptom.id_name)] == symptom.id_name
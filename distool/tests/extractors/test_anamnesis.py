@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from distool.feature_extraction.anamnesis import Anamnesis
+from distool.feature_extraction.symptom_collection import SymptomCollection
+from distool.feature_extraction.symptom_status import SymptomStatus
+
+SYMPTOM_NAME = "температура"
+
+
+def _entity(lemma: str, negex: bool):
+    return SimpleNamespace(lemma_=lemma, _=SimpleNamespace(negex=negex))
+
+
+def test_marks_are_compact_and_not_copied():
+    anamnesis = Anamnesis()
+
+    marks = anamnesis.get_marks()
+
+    assert marks.dtype == np.int8
+    assert len(marks) == len(SymptomCollection.get_symptoms())
+    assert (marks == SymptomStatus.NO_INFO.value).all()
+    assert anamnesis.get_marks() is marks
+
+
+def test_update_symptom_status_by_entity():
+    anamnesis = Anamnesis()
+
+    anamnesis.update_symptom_status_by_entity(_entity(SYMPTOM_NAME, negex=True))
+    assert anamnesis.get_symptom_status(SYMPTOM_NAME) == SymptomStatus.NO
+
+    anamnesis.update_symptom_status_by_entity(_entity(SYMPTOM_NAME, negex=True))
+    assert anamnesis.get_symptom_status(SYMPTOM_NAME) == SymptomStatus.CONFUSED
+
+    anamnesis.update_symptom_status_by_entity(_entity("неизвестный", negex=False))
+    assert anamnesis.get_symptom_status("неизвестный") is None
+
+
+def test_marks_with_symptom_ids():
+    anamnesis = Anamnesis()
+    symptom = SymptomCollection.get_name_to_symptom_dict()[SYMPTOM_NAME]
+
+    anamnesis.update_symptom_status(symptom)
+
+    marks = dict(anamnesis.get_marks_with_symptom_ids(as_number=False))
+    assert marks[SYMPTOM_NAME] == SymptomStatus.YES
+    assert len(marks) == len(anamnesis)
+
+
+def test_update_symptoms_statuses_by_new_anamnesis():
+    statuses = list(SymptomStatus)
+    old_marks = np.array([s.value for s in statuses for _ in statuses])
+    new_marks = np.array([s.value for _ in statuses for s in statuses])
+    expected = {
+        (SymptomStatus.YES, SymptomStatus.NO): SymptomStatus.CONFUSED,
+        (SymptomStatus.NO, SymptomStatus.YES): SymptomStatus.CONFUSED,
+        (SymptomStatus.NO_INFO, SymptomStatus.YES): SymptomStatus.YES,
+        (SymptomStatus.NO_INFO, SymptomStatus.NO): SymptomStatus.NO,
+        (SymptomStatus.NO_INFO, SymptomStatus.CONFUSED): SymptomStatus.CONFUSED,
+        (SymptomStatus.CONFUSED, SymptomStatus.YES): SymptomStatus.YES,
+        (SymptomStatus.CONFUSED, SymptomStatus.NO): SymptomStatus.NO,
+    }
+
+    n_symptoms = len(SymptomCollection.get_symptoms())
+    padding = np.full(n_symptoms - len(old_marks), SymptomStatus.NO_INFO.value)
+    anamnesis = Anamnesis.from_marks(np.concatenate([old_marks, padding]))
+    new_anamnesis = Anamnesis.from_marks(np.concatenate([new_marks, padding]))
+
+    merged = anamnesis.update_symptoms_statuses_by_new_anamnesis(new_anamnesis)
+
+    for i, (old, new) in enumerate(zip(old_marks, new_marks)):
+        old, new = SymptomStatus(old), SymptomStatus(new)
+        assert merged.get_symptoms_status()[i] == expected.get((old, new), old)
+
+
+def test_fold_marks_matches_sequential_merge():
+    rng = np.random.default_rng(0)
+    statuses = [status.value for status in SymptomStatus]
+    n_symptoms = len(SymptomCollection.get_symptoms())
+
+    for n_messages in [0, 1, 2, 5, 16, 33]:
+        marks = rng.choice(statuses, size=(n_messages, n_symptoms)).astype(np.int8)
+        initial_marks = rng.choice(statuses, size=n_symptoms).astype(np.int8)
+
+        anamnesis = Anamnesis.from_marks(initial_marks)
+        for message_marks in marks:
+            anamnesis.update_symptoms_statuses_by_new_anamnesis(
+                Anamnesis.from_marks(message_marks)
+            )
+
+        folded_marks = Anamnesis.fold_marks(marks, initial_marks)
+        assert (folded_marks == anamnesis.get_marks()).all()
+
+
+def test_merge_marks_overwrites_confused():
+    merged = Anamnesis.merge_marks(
+        np.array([SymptomStatus.CONFUSED.value] * 2),
+        np.array([SymptomStatus.NO.value, SymptomStatus.NO_INFO.value]),
+    )
+
+    assert merged.tolist() == [SymptomStatus.NO.value, SymptomStatus.CONFUSED.value]
+
+
+def test_accumulate_marks_ends_with_fold():
+    yes, no, no_info = (
+        SymptomStatus.YES.value,
+        SymptomStatus.NO.value,
+        SymptomStatus.NO_INFO.value,
+    )
+    marks = np.array([[yes, no_info], [no, no_info], [no_info, no]], dtype=np.int8)
+
+    accumulated_marks = Anamnesis.accumulate_marks(marks, marks[2])
+
+    assert (accumulated_marks[0] == [yes, no]).all()
+    assert (accumulated_marks[-1] == Anamnesis.fold_marks(marks, marks[2])).all()
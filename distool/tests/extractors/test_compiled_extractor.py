@@ -0,0 +1,41 @@
+from distool.feature_extraction import SmartSymptomExtractor
+
+MESSAGES = [
+    "У меня нет температуры, но есть недомогание и не болит голова.",
+    "болит и кружится голова",
+]
+
+
+def test_compiled_pipeline_is_saved_and_reused(tmp_path, monkeypatch):
+    extractor = SmartSymptomExtractor(cache_dir=tmp_path)
+    assert extractor.get_compiled_lang_model_path().is_dir()
+
+    def fail_to_build(self):
+        raise AssertionError("Compiled pipeline should be loaded from the cache")
+
+    monkeypatch.setattr(SmartSymptomExtractor, "_build_lang_model", fail_to_build)
+    compiled_extractor = SmartSymptomExtractor(cache_dir=tmp_path)
+
+    assert (
+        compiled_extractor.transform(MESSAGES) == extractor.transform(MESSAGES)
+    ).all()
+
+
+def test_compiled_pipeline_matches_built_pipeline(tmp_path):
+    SmartSymptomExtractor(cache_dir=tmp_path)
+    compiled_extractor = SmartSymptomExtractor(cache_dir=tmp_path)
+    built_extractor = SmartSymptomExtractor(use_compiled_cache=False)
+
+    assert (
+        compiled_extractor.transform(MESSAGES) == built_extractor.transform(MESSAGES)
+    ).all()
+
+
+def test_fingerprint_changes_with_termset(monkeypatch):
+    fingerprint = SmartSymptomExtractor.fingerprint()
+
+    changed_termset = dict(SmartSymptomExtractor.russian_termset)
+    changed_termset["termination"] = changed_termset["termination"] + ["зато"]
+    monkeypatch.setattr(SmartSymptomExtractor, "russian_termset", changed_termset)
+
+    assert SmartSymptomExtractor.fingerprint() != fingerprint
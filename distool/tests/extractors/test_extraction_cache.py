@@ -0,0 +1,83 @@
+import numpy as np
+
+from distool.feature_extraction import ExtractionCache, SmartSymptomExtractor
+from distool.feature_extraction.sparse_marks import csr_to_marks
+
+MESSAGES = [
+    "У меня нет температуры, но есть недомогание и не болит голова.",
+    "болит и кружится голова",
+    "У меня нет температуры, но есть недомогание и не болит голова.",
+]
+
+
+def test_repeated_messages_are_computed_once(count_calls):
+    cache = ExtractionCache("fingerprint")
+    compute_marks, calls = count_calls(lambda messages: np.ones((len(messages), 2)))
+
+    cache.get_or_compute(MESSAGES, compute_marks)
+    marks = cache.get_or_compute([" болит и кружится голова "], compute_marks)
+
+    assert calls == [MESSAGES[:2]]
+    assert marks.shape == (1, 2)
+    assert cache.get_stats() == {"hits": 1, "misses": 3, "memory_entries": 2}
+
+
+def test_disk_store_is_keyed_by_fingerprint(tmp_path, count_calls):
+    path = tmp_path / "extractions.sqlite3"
+    compute_marks, calls = count_calls(lambda messages: np.ones((len(messages), 2)))
+
+    ExtractionCache("old", path=path).get_or_compute(MESSAGES, compute_marks)
+    ExtractionCache("old", path=path).get_or_compute(MESSAGES, compute_marks)
+    assert len(calls) == 1
+
+    ExtractionCache("new", path=path).get_or_compute(MESSAGES, compute_marks)
+    assert len(calls) == 2
+
+
+def test_fingerprints_share_disk_store(tmp_path):
+    path = tmp_path / "extractions.sqlite3"
+    cache_a = ExtractionCache("fp_A", path=path)
+    cache_b = ExtractionCache("fp_B", path=path)
+
+    cache_a.get_or_compute(MESSAGES[:1], lambda messages: np.ones((1, 3)))
+    marks_b = ExtractionCache("fp_B", path=path).get_or_compute(
+        MESSAGES[:1], lambda messages: np.full((1, 3), 2)
+    )
+    assert (marks_b == 2).all()
+
+    cache_b.get_or_compute(MESSAGES[1:2], lambda messages: np.full((1, 3), 2))
+    marks_a = ExtractionCache("fp_A", path=path).get_or_compute(
+        MESSAGES[:2], lambda messages: np.full((len(messages), 3), 3)
+    )
+    assert (marks_a == [[1, 1, 1], [3, 3, 3]]).all()
+
+
+def test_lru_evicts_least_recently_used(count_calls):
+    cache = ExtractionCache("fingerprint", max_memory_entries=1)
+    compute_marks, calls = count_calls(lambda messages: np.ones((len(messages), 2)))
+
+    cache.get_or_compute(MESSAGES[:2], compute_marks)
+    cache.get_or_compute(MESSAGES[1:2], compute_marks)
+    cache.get_or_compute(MESSAGES[:1], compute_marks)
+
+    assert calls == [MESSAGES[:2], MESSAGES[:1]]
+
+
+def test_cached_extractor_matches_extractor(tmp_path):
+    extractor = SmartSymptomExtractor(cache_dir=tmp_path)
+    cached_extractor = SmartSymptomExtractor(
+        cache_dir=tmp_path, use_extraction_cache=True
+    )
+
+    expected = extractor.transform(MESSAGES)
+    assert (cached_extractor.transform(MESSAGES) == expected).all()
+    assert (
+        csr_to_marks(cached_extractor.transform(MESSAGES, output="sparse")) == expected
+    ).all()
+    assert cached_extractor.extraction_cache.get_stats()["hits"] == 3
+
+    reloaded_extractor = SmartSymptomExtractor(
+        cache_dir=tmp_path, use_extraction_cache=True
+    )
+    assert (reloaded_extractor.transform(MESSAGES) == expected).all()
+    assert reloaded_extractor.extraction_cache.get_stats()["misses"] == 0
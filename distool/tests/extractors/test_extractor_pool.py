@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from distool.feature_extraction import SmartSymptomExtractor, SmartSymptomExtractorPool
+
+MESSAGE = "У меня нет температуры, но есть недомогание и не болит голова."
+
+
+def test_shared_extractor_is_reused():
+    extractor = SmartSymptomExtractor.shared()
+
+    assert SmartSymptomExtractor.shared() is extractor
+
+    stats = SmartSymptomExtractor.get_instances_stats()
+    assert stats["shared_instances"] >= 1
+    assert stats["live_instances"] >= 1
+    assert stats["vectors_bytes"] >= 0
+
+
+def test_pool_is_bounded():
+    pool = SmartSymptomExtractorPool(size=2)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: _transform_with_pool(pool), range(8)))
+
+    assert all((result == results[0]).all() for result in results)
+
+    stats = pool.get_stats()
+    assert stats["created"] <= 2
+    assert stats["in_use"] == 0
+
+
+def test_pool_acquire_timeout():
+    pool = SmartSymptomExtractorPool(size=1)
+
+    with pool.acquire():
+        with pytest.raises(TimeoutError):
+            with pool.acquire(timeout=0.01):
+                pass
+
+
+def test_pool_extractors_are_private():
+    pool = SmartSymptomExtractorPool(size=1)
+
+    with pool.acquire() as extractor:
+        assert extractor is not SmartSymptomExtractor.shared()
+
+
+def _transform_with_pool(pool: SmartSymptomExtractorPool):
+    with pool.acquire() as extractor:
+        return extractor.transform([MESSAGE])
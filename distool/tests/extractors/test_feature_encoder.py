@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from distool.feature_extraction import SymptomFeatureEncoder
+from distool.feature_extraction.sparse_marks import marks_to_csr
+from distool.feature_extraction.symptom_status import SymptomStatus
+
+YES, NO, NO_INFO, CONFUSED = (
+    SymptomStatus.YES.value,
+    SymptomStatus.NO.value,
+    SymptomStatus.NO_INFO.value,
+    SymptomStatus.CONFUSED.value,
+)
+
+MARKS = np.array(
+    [[NO_INFO, YES, NO_INFO], [NO, NO_INFO, CONFUSED], [NO_INFO] * 3], dtype=np.int8
+)
+
+
+def test_ordinal_encoding_keeps_marks():
+    assert SymptomFeatureEncoder().transform(MARKS) is MARKS
+
+
+def test_signed_encoding():
+    expected = np.array([[0, 1, 0], [-1, 0, 0], [0, 0, 0]])
+    encoder = SymptomFeatureEncoder("signed")
+
+    assert (encoder.transform(MARKS) == expected).all()
+    assert (encoder.transform(marks_to_csr(MARKS)).toarray() == expected).all()
+
+
+def test_onehot_encoding():
+    expected = np.zeros((3, 9), dtype=np.int8)
+    expected[0, 1 * 3 + 0] = 1
+    expected[1, 0 * 3 + 1] = 1
+    expected[1, 2 * 3 + 2] = 1
+    encoder = SymptomFeatureEncoder("onehot")
+
+    features = encoder.transform(MARKS)
+
+    assert sparse.isspmatrix_csr(features)
+    assert (features.toarray() == expected).all()
+    assert (encoder.transform(marks_to_csr(MARKS)).toarray() == expected).all()
+
+
+def test_unknown_encoding():
+    with pytest.raises(ValueError):
+        SymptomFeatureEncoder("binary")
@@ -0,0 +1,121 @@
+import numpy as np
+from scipy import sparse
+
+from distool.feature_extraction import FeatureStore, SymptomFeatureEncoder
+from distool.feature_extraction.sparse_marks import marks_to_csr
+from distool.feature_extraction.symptom_collection import SymptomCollection
+from distool.feature_extraction.symptom_status import SymptomStatus
+
+MESSAGES = [f"сообщение {i}" for i in range(10)]
+MARKS = (
+    np.random.default_rng(0)
+    .choice([status.value for status in SymptomStatus], size=(10, 5))
+    .astype(np.int8)
+)
+
+
+def _marks_of(messages):
+    return MARKS[[MESSAGES.index(message) for message in messages]]
+
+
+def test_dense_features_are_memory_mapped(tmp_path, count_calls):
+    store = FeatureStore(tmp_path)
+    compute_marks, calls = count_calls(_marks_of)
+
+    store.get_or_compute(MESSAGES, compute_marks, "dataset", "extractor")
+    features = FeatureStore(tmp_path).get_or_compute(
+        MESSAGES, compute_marks, "dataset", "extractor"
+    )
+
+    assert len(calls) == 1
+    assert isinstance(features, np.memmap)
+    assert not features.flags.writeable
+    np.testing.assert_array_equal(features, MARKS)
+
+
+def test_sparse_features_round_trip(tmp_path):
+    store = FeatureStore(tmp_path)
+    encoder = SymptomFeatureEncoder(SymptomFeatureEncoder.ONEHOT)
+
+    features = store.get_or_compute(
+        MESSAGES,
+        lambda messages: marks_to_csr(_marks_of(messages)),
+        "dataset",
+        "extractor",
+        encoding=SymptomFeatureEncoder.ONEHOT,
+        output="sparse",
+    )
+
+    assert sparse.isspmatrix_csr(features)
+    # The csr arrays are read-only views of the memory-mapped files
+    assert not any(
+        array.flags.writeable
+        for array in (features.data, features.indices, features.indptr)
+    )
+    assert (features != encoder.transform(MARKS)).nnz == 0
+
+
+def test_new_rows_are_appended(tmp_path, count_calls):
+    store = FeatureStore(tmp_path)
+    compute_marks, calls = count_calls(
+        lambda messages: marks_to_csr(_marks_of(messages))
+    )
+    options = dict(encoding=SymptomFeatureEncoder.SIGNED, output="sparse")
+
+    store.get_or_compute(MESSAGES[:4], compute_marks, "dataset", "extractor", **options)
+    store.get_or_compute(MESSAGES[:7], compute_marks, "dataset", "extractor", **options)
+    features = store.get_or_compute(
+        MESSAGES, compute_marks, "dataset", "extractor", **options
+    )
+
+    assert calls == [MESSAGES[:4], MESSAGES[4:7], MESSAGES[7:]]
+    expected = SymptomFeatureEncoder(SymptomFeatureEncoder.SIGNED).transform(MARKS)
+    np.testing.assert_array_equal(features.toarray(), expected)
+
+
+def test_entry_is_rebuilt_when_rows_change(tmp_path, count_calls):
+    store = FeatureStore(tmp_path)
+    compute_marks, calls = count_calls(_marks_of)
+
+    store.get_or_compute(MESSAGES[:5], compute_marks, "dataset", "extractor")
+    features = store.get_or_compute(MESSAGES[5:], compute_marks, "dataset", "extractor")
+    np.testing.assert_array_equal(features, MARKS[5:])
+
+    store.get_or_compute(MESSAGES[5:], compute_marks, "dataset", "other_extractor")
+    assert calls == [MESSAGES[:5], MESSAGES[5:], MESSAGES[5:]]
+
+
+def test_marks_are_converted_to_output_format(tmp_path, count_calls):
+    store = FeatureStore(tmp_path)
+    compute_marks, calls = count_calls(_marks_of)
+
+    sparse_features = store.get_or_compute(
+        MESSAGES, compute_marks, "dataset", "extractor", output="sparse"
+    )
+    dense_features = store.get_or_compute(
+        MESSAGES, compute_marks, "dataset", "extractor", output="dense"
+    )
+
+    assert sparse.isspmatrix_csr(sparse_features)
+    assert isinstance(dense_features, np.memmap)
+    assert len(calls) == 2
+    assert (sparse_features != marks_to_csr(MARKS)).nnz == 0
+    np.testing.assert_array_equal(dense_features, MARKS)
+
+
+def test_empty_dataset_has_no_rows(tmp_path):
+    store = FeatureStore(tmp_path)
+    n_symptoms = len(SymptomCollection.get_symptoms())
+
+    features = store.get_or_compute([], _marks_of, "dataset", "extractor")
+    onehot_features = store.get_or_compute(
+        [],
+        _marks_of,
+        "dataset",
+        "extractor",
+        encoding=SymptomFeatureEncoder.ONEHOT,
+        output="sparse",
+    )
+
+    assert features.shape == (0, n_symptoms)
+    assert onehot_features.shape == (0, 3 * n_symptoms)
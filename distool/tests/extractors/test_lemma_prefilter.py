@@ -0,0 +1,65 @@
+import ast
+
+import pandas as pd
+
+from distool.feature_extraction import SmartSymptomExtractor
+from distool.feature_extraction.symptom_collection import BASE_DIR, SymptomCollection
+from distool.feature_extraction.symptom_status import SymptomStatus
+
+PATH_TO_SHOWCASE_DF = BASE_DIR / "data/showcase.csv"
+
+
+def test_first_token_lemmas():
+    first_token_lemmas = SymptomCollection.get_first_token_lemmas()
+
+    assert "температура" in first_token_lemmas
+    assert "боль" in first_token_lemmas
+
+
+def test_symptom_free_message_takes_fast_path():
+    extractor = SmartSymptomExtractor()
+
+    marks = extractor.transform(["Я завтра иду домой", "У меня температура"])
+
+    assert (marks[0] == SymptomStatus.NO_INFO.value).all()
+    assert (marks[1] != SymptomStatus.NO_INFO.value).any()
+    assert extractor.get_prefilter_stats() == {"messages": 2, "fast_path_messages": 1}
+
+
+def test_prefilter_matches_full_pipeline():
+    df_showcase = pd.read_csv(PATH_TO_SHOWCASE_DF)
+    messages = [
+        sentence for case in df_showcase.case for sentence in ast.literal_eval(case)
+    ]
+
+    extractor = SmartSymptomExtractor()
+    full_pipeline_extractor = SmartSymptomExtractor(use_lemma_prefilter=False)
+
+    assert (
+        extractor.transform(messages) == full_pipeline_extractor.transform(messages)
+    ).all()
+    assert full_pipeline_extractor.get_prefilter_stats()["fast_path_messages"] == 0
+
+
+def test_multiprocess_fast_path_is_counted():
+    extractor = SmartSymptomExtractor()
+
+    extractor.transform(
+        ["Я завтра иду домой", "Привет", "У меня температура"],
+        n_process=2,
+        batch_size=2,
+    )
+
+    assert extractor.get_prefilter_stats() == {"messages": 3, "fast_path_messages": 2}
+
+
+def test_multiprocess_respects_disabled_prefilter():
+    extractor = SmartSymptomExtractor(use_lemma_prefilter=False)
+
+    extractor.transform(
+        ["Я завтра иду домой", "Привет", "У меня температура"],
+        n_process=2,
+        batch_size=2,
+    )
+
+    assert extractor.get_prefilter_stats() == {"messages": 3, "fast_path_messages": 0}
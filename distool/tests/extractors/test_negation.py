@@ -0,0 +1,77 @@
+import ast
+
+import pandas as pd
+import pytest
+import spacy
+
+from distool.feature_extraction import SmartSymptomExtractor
+from distool.feature_extraction.negation import NegationScopeDetector
+from distool.feature_extraction.symptom_collection import BASE_DIR
+
+PATH_TO_SHOWCASE_DF = BASE_DIR / "data/showcase.csv"
+
+
+def _load_showcase_texts():
+    df_showcase = pd.read_csv(PATH_TO_SHOWCASE_DF)
+    cases = [ast.literal_eval(case) for case in df_showcase.case]
+    sentences = [sentence for case in cases for sentence in case]
+    return sentences + [" ".join(case) for case in cases]
+
+
+def _get_negated_entities(extractor, texts):
+    return [
+        [(entity.start, entity.end, entity._.negex) for entity in doc.ents]
+        for doc in extractor._spacy_lang_model.pipe(texts)
+    ]
+
+
+def test_native_negation_matches_negex():
+    texts = _load_showcase_texts()
+    negex_extractor = SmartSymptomExtractor()
+    native_extractor = SmartSymptomExtractor(
+        negation_factory=SmartSymptomExtractor.NATIVE_NEGEX_FACTORY
+    )
+
+    negex_entities = _get_negated_entities(negex_extractor, texts)
+
+    assert any(negated for doc in negex_entities for _, _, negated in doc)
+    assert _get_negated_entities(native_extractor, texts) == negex_entities
+    assert (native_extractor.transform(texts) == negex_extractor.transform(texts)).all()
+
+
+@pytest.mark.parametrize(
+    "text, negated",
+    [
+        ("нет головы", True),
+        ("не уверен, что голова", False),
+        ("голова не было", True),
+        ("нет руки, но голова", False),
+        ("нет руки. Голова", False),
+    ],
+)
+def test_negation_rules(text, negated):
+    nlp = spacy.blank("ru")
+    nlp.add_pipe("sentencizer")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns(
+        [{"label": "SYMPTOM", "pattern": [{"LOWER": {"IN": ["голова", "головы"]}}]}]
+    )
+    nlp.add_pipe(
+        "native_negex",
+        config={
+            "neg_termset": SmartSymptomExtractor.russian_termset,
+            "ent_types": ["SYMPTOM"],
+            "extension_name": "negex",
+            "chunk_prefix": [],
+        },
+    )
+
+    doc = nlp(text)
+
+    assert isinstance(nlp.get_pipe("native_negex"), NegationScopeDetector)
+    assert [entity._.negex for entity in doc.ents] == [negated]
+
+
+def test_unknown_negation_factory():
+    with pytest.raises(ValueError):
+        SmartSymptomExtractor(negation_factory="regex")
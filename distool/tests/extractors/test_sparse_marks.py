@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from distool.feature_extraction import DumbSymptomExtractor, SmartSymptomExtractor
+from distool.feature_extraction.sparse_marks import (
+    align_marks_format,
+    csr_to_marks,
+    marks_to_csr,
+    rows_to_csr,
+)
+from distool.feature_extraction.symptom_status import SymptomStatus
+
+MARKS = np.array(
+    [
+        [
+            SymptomStatus.NO_INFO.value,
+            SymptomStatus.YES.value,
+            SymptomStatus.NO_INFO.value,
+        ],
+        [
+            SymptomStatus.NO.value,
+            SymptomStatus.NO_INFO.value,
+            SymptomStatus.CONFUSED.value,
+        ],
+        [SymptomStatus.NO_INFO.value] * 3,
+    ],
+    dtype=np.int8,
+)
+
+
+def test_sparse_marks_round_trip():
+    matrix = marks_to_csr(MARKS)
+
+    assert matrix.shape == MARKS.shape
+    assert matrix.nnz == 3
+    assert (csr_to_marks(matrix) == MARKS).all()
+    assert (rows_to_csr(MARKS, MARKS.shape[1]) != matrix).nnz == 0
+
+
+def test_align_marks_format():
+    matrix = align_marks_format(MARKS, as_sparse=True)
+
+    assert sparse.issparse(matrix)
+    assert align_marks_format(matrix, as_sparse=True) is matrix
+    assert (align_marks_format(matrix, as_sparse=False) == MARKS).all()
+
+
+@pytest.mark.parametrize(
+    "extractor_class", [DumbSymptomExtractor, SmartSymptomExtractor]
+)
+def test_sparse_output_matches_dense(extractor_class, complex_data):
+    texts, _ = complex_data
+    extractor = extractor_class()
+
+    features = extractor.transform(texts, output="sparse")
+
+    assert sparse.isspmatrix_csr(features)
+    assert (csr_to_marks(features) == extractor.transform(texts)).all()
+
+
+def test_multiprocess_sparse_output(complex_data):
+    texts, _ = complex_data
+    extractor = SmartSymptomExtractor()
+
+    features = extractor.transform(texts, n_process=2, batch_size=3, output="sparse")
+
+    assert (csr_to_marks(features) == extractor.transform(texts)).all()
+
+
+def test_unknown_output_format(simple_data):
+    texts, _ = simple_data
+
+    with pytest.raises(ValueError):
+        DumbSymptomExtractor().transform(texts, output="coo")
@@ -40,4 +40,31 @@ def test_dumb_transform_on_simple_message_2():
 def test_new_symptoms():
     message = "болит и кружится голова"
     anamnesis = SmartSymptomExtractor()._transform(message)
-    print(anamnesis._symptoms_marks)
+    print(anamnesis.get_marks_with_symptom_ids(as_number=False))
+
+
+def test_multiprocess_transform_keeps_order(complex_data):
+    texts, _ = complex_data
+    extractor = SmartSymptomExtractor()
+
+    features = extractor.transform(texts)
+    multiprocess_features = extractor.transform(texts, n_process=2, batch_size=3)
+
+    assert (multiprocess_features == features).all()
+
+
+def test_multiprocess_transform_as_anamnesis(complex_data):
+    texts, _ = complex_data
+    extractor = SmartSymptomExtractor()
+
+    anamnesis_list = extractor.transform(texts, as_anamnesis=True)
+    multiprocess_anamnesis_list = extractor.transform(
+        texts, as_anamnesis=True, n_process=2, batch_size=3
+    )
+
+    for anamnesis, multiprocess_anamnesis in zip(
+        anamnesis_list, multiprocess_anamnesis_list
+    ):
+        assert anamnesis.get_marks(as_number=False) == multiprocess_anamnesis.get_marks(
+            as_number=False
+        )
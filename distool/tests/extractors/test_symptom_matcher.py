@@ -0,0 +1,88 @@
+import ast
+
+import pandas as pd
+import spacy
+
+from distool.feature_extraction import SmartSymptomExtractor
+from distool.feature_extraction.symptom_collection import BASE_DIR
+from distool.feature_extraction.symptom_matcher import SymptomMatcher
+
+PATH_TO_SHOWCASE_DF = BASE_DIR / "data/showcase.csv"
+
+PATTERNS = [
+    {"label": "SYMPTOM", "pattern": [{"LEMMA": "боль"}], "id": "боль"},
+    {
+        "label": "SYMPTOM",
+        "pattern": [{"LEMMA": "боль"}, {"LEMMA": "в"}, {"LEMMA": "горло"}],
+        "id": "боль в горло",
+    },
+    {"label": "SYMPTOM", "pattern": "насморк", "id": "насморк"},
+    {"label": "SYMPTOM", "pattern": [{"LOWER": {"IN": ["жар", "жара"]}}], "id": "жар"},
+]
+
+
+def _get_entities(extractor, texts):
+    return [
+        [
+            (entity.start, entity.end, entity.label_, entity.ent_id_)
+            for entity in doc.ents
+        ]
+        for doc in extractor._spacy_lang_model.pipe(texts)
+    ]
+
+
+def test_lemma_patterns_are_compiled():
+    assert SymptomMatcher.get_pattern_lemmas(PATTERNS[1]["pattern"]) == [
+        "боль",
+        "в",
+        "горло",
+    ]
+    assert SymptomMatcher.get_pattern_lemmas(PATTERNS[2]["pattern"]) is None
+    assert SymptomMatcher.get_pattern_lemmas(PATTERNS[3]["pattern"]) is None
+
+
+def test_symptom_matcher_matches_entity_ruler_on_mixed_patterns():
+    texts = ["боль в горле и насморк", "у меня жар, боль", "ничего"]
+    entities = {}
+    for factory_name in SmartSymptomExtractor.MATCHER_FACTORIES:
+        nlp = spacy.load(SmartSymptomExtractor.SPACY_LANG_MODEL_NAME)
+        nlp.add_pipe(factory_name, name="entity_ruler").add_patterns(PATTERNS)
+        entities[factory_name] = [
+            [(entity.start, entity.end, entity.ent_id_) for entity in doc.ents]
+            for doc in nlp.pipe(texts)
+        ]
+
+    assert entities["symptom_matcher"] == entities["entity_ruler"]
+    assert len(entities["symptom_matcher"][0]) == 2
+
+
+def test_symptom_matcher_matches_entity_ruler_on_showcase():
+    df_showcase = pd.read_csv(PATH_TO_SHOWCASE_DF)
+    texts = [
+        sentence for case in df_showcase.case for sentence in ast.literal_eval(case)
+    ]
+
+    ruler_extractor = SmartSymptomExtractor(
+        matcher_factory=SmartSymptomExtractor.ENTITY_RULER_FACTORY
+    )
+    matcher_extractor = SmartSymptomExtractor()
+
+    assert _get_entities(matcher_extractor, texts) == _get_entities(
+        ruler_extractor, texts
+    )
+    assert (
+        matcher_extractor.transform(texts) == ruler_extractor.transform(texts)
+    ).all()
+
+
+def test_symptom_matcher_serialization(tmp_path):
+    nlp = spacy.load(SmartSymptomExtractor.SPACY_LANG_MODEL_NAME)
+    nlp.add_pipe("symptom_matcher").add_patterns(PATTERNS)
+    nlp.to_disk(tmp_path)
+
+    loaded_nlp = spacy.load(tmp_path)
+
+    assert loaded_nlp.get_pipe("symptom_matcher").patterns == PATTERNS
+    assert [entity.text for entity in loaded_nlp("боль в горле").ents] == [
+        "боль в горле"
+    ]
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from distool.feature_extraction import DumbSymptomExtractor, SmartSymptomExtractor
+from distool.feature_extraction.anamnesis import Anamnesis
+
+
+@pytest.mark.parametrize(
+    "extractor_class", [DumbSymptomExtractor, SmartSymptomExtractor]
+)
+def test_transform_iter_blocks(extractor_class, complex_data):
+    texts, _ = complex_data
+    extractor = extractor_class()
+
+    blocks = list(extractor.transform_iter(iter(texts), batch_size=3))
+
+    assert [len(block) for block in blocks] == [3, 3, 2]
+    assert (np.vstack(blocks) == extractor.transform(texts)).all()
+
+
+def test_transform_iter_rows_from_generator(complex_data):
+    texts, _ = complex_data
+    extractor = SmartSymptomExtractor()
+
+    rows = list(
+        extractor.transform_iter((text for text in texts), batch_size=3, as_rows=True)
+    )
+
+    assert len(rows) == len(texts)
+    assert (np.array(rows) == extractor.transform(texts)).all()
+
+
+def test_transform_iter_cumulative(complex_data):
+    texts, _ = complex_data
+    extractor = SmartSymptomExtractor()
+    marks = extractor.transform(texts)
+
+    rows = list(
+        extractor.transform_iter(texts, batch_size=3, as_rows=True, cumulative=True)
+    )
+
+    for i, row in enumerate(rows):
+        assert (row == Anamnesis.fold_marks(marks[: i + 1])).all()
+
+
+def test_transform_iter_empty_stream():
+    assert list(DumbSymptomExtractor().transform_iter([])) == []
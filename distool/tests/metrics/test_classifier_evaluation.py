@@ -0,0 +1,33 @@
+from functools import partial
+
+import numpy as np
+
+from distool.estimators import DiseaseClassifier
+from distool.feature_extraction import SymptomFeatureEncoder
+from distool.metrics.classifier.evaluation import evaluate_classifiers
+
+METRICS = [
+    "accuracy",
+    "macro_f1",
+    "fit_seconds",
+    "predict_ms_per_row",
+    "peak_memory_mb",
+]
+
+
+def test_evaluate_classifiers_reports_every_metric():
+    rng = np.random.default_rng(42)
+    features = rng.integers(1, 5, size=(60, 8)).astype(np.int8)
+    y = np.array(["c", "a", "b", "c", "c"])[features[:, 0]]
+    classifiers = {
+        "ordinal": DiseaseClassifier,
+        "onehot": partial(DiseaseClassifier, encoding=SymptomFeatureEncoder.ONEHOT),
+    }
+
+    df_summary = evaluate_classifiers(features, y, classifiers, n_splits=3, n_jobs=2)
+
+    assert df_summary["classifier"].tolist() == ["ordinal", "onehot"]
+    for metric in METRICS:
+        assert (df_summary[f"{metric}_mean"] >= 0).all()
+        assert f"{metric}_std" in df_summary.columns
+    assert (df_summary["accuracy_mean"] > 0.8).all()
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from distool.estimators import DiseaseClassifier
+from distool.feature_extraction import DumbSymptomExtractor
+from distool.serving import AsyncIntakePipeline, LatencyHistogram, MicroBatcher
+
+
+def _create_pipeline(complex_data, **options):
+    texts, diseases = complex_data
+    extractor = DumbSymptomExtractor()
+    classifier = DiseaseClassifier().fit(extractor.transform(texts), diseases)
+
+    return AsyncIntakePipeline(extractor, classifier, **options)
+
+
+def test_concurrent_requests_are_batched(complex_data):
+    texts, _ = complex_data
+    pipeline = _create_pipeline(complex_data, max_batch_size=4, max_wait_seconds=0.05)
+
+    async def extract_and_predict():
+        marks = await asyncio.gather(*(pipeline.aextract(text) for text in texts))
+        diseases = await asyncio.gather(*(pipeline.apredict(text) for text in texts))
+        return marks, diseases
+
+    marks, diseases = asyncio.run(extract_and_predict())
+    pipeline.close()
+
+    extractor = DumbSymptomExtractor()
+    assert all(
+        (row == extractor.transform([text])[0]).all() for row, text in zip(marks, texts)
+    )
+    assert list(diseases) == list(
+        pipeline._classifier.predict(extractor.transform(texts))
+    )
+
+    stats = pipeline.get_stats()
+    assert stats["extract"]["batches"] == 2
+    assert stats["extract"]["items"] == len(texts)
+    assert stats["extract"]["latency"]["count"] == len(texts)
+    assert stats["extract"]["queue_depth"] == 0
+
+
+def test_single_request_is_sent_after_max_wait(complex_data):
+    pipeline = _create_pipeline(complex_data, max_batch_size=32, max_wait_seconds=0.01)
+
+    disease = asyncio.run(pipeline.apredict("У меня температура"))
+    pipeline.close()
+
+    assert disease in complex_data[1]
+    assert pipeline.get_stats()["predict"]["mean_batch_size"] == 1
+
+
+def test_queue_depth_limit():
+    batcher = MicroBatcher(lambda items: items, max_wait_seconds=0.01, max_queue_size=2)
+
+    async def submit_many():
+        return await asyncio.gather(
+            *(batcher.submit(i) for i in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(submit_many())
+
+    assert results[:2] == [0, 1]
+    assert isinstance(results[2], asyncio.QueueFull)
+
+
+def test_batch_errors_are_propagated():
+    def fail(items):
+        raise RuntimeError("model failed")
+
+    batcher = MicroBatcher(fail, max_wait_seconds=0.001)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(batcher.submit("message"))
+
+
+def test_missing_batch_results_fail_every_item():
+    batcher = MicroBatcher(lambda items: items[:1], max_wait_seconds=0.01)
+
+    async def submit_many():
+        return await asyncio.wait_for(
+            asyncio.gather(
+                *(batcher.submit(i) for i in range(3)), return_exceptions=True
+            ),
+            timeout=5,
+        )
+
+    results = asyncio.run(submit_many())
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram(buckets=[0.01, 0.1, 1.0])
+    for seconds in [0.005, 0.05, 0.05, 0.5, 5.0]:
+        histogram.observe(seconds)
+
+    assert list(histogram.get_counts().values()) == [1, 2, 1, 1]
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.get_stats()["count"] == 5
@@ -0,0 +1,74 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Agreed budget for a cold `import distool` in a fresh interpreter
+IMPORT_TIME_BUDGET_SECONDS = 1.0
+HEAVY_MODULES = ["fedot", "spacy", "negspacy", "sklearn"]
+
+_COLD_IMPORT_SCRIPT = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+
+heavy_modules = {heavy_modules!r}
+loaded = [name for name in heavy_modules if name in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "loaded": loaded}}))
+"""
+
+
+def _cold_import(statement: str) -> dict:
+    script = _COLD_IMPORT_SCRIPT.format(
+        statement=statement, heavy_modules=HEAVY_MODULES
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_cold_import_fits_time_budget():
+    result = _cold_import("import distool")
+
+    assert result["elapsed"] < IMPORT_TIME_BUDGET_SECONDS
+
+
+def test_cold_import_does_not_load_heavy_dependencies():
+    result = _cold_import("import distool")
+
+    assert result["loaded"] == []
+
+
+def test_dumb_extractor_does_not_load_heavy_dependencies():
+    result = _cold_import("from distool import DumbSymptomExtractor")
+
+    assert result["loaded"] == []
+
+
+def test_disease_classifier_does_not_load_fedot():
+    result = _cold_import("from distool.estimators import DiseaseClassifier")
+
+    assert "fedot" not in result["loaded"]
+
+
+def test_linear_scorer_does_not_load_sklearn():
+    result = _cold_import("from distool.estimators import LinearScorer")
+
+    assert result["loaded"] == []
+
+
+def test_lazy_attributes_are_resolved():
+    import distool
+    from distool.feature_extraction.dumb_extractor import DumbSymptomExtractor
+
+    assert distool.DumbSymptomExtractor is DumbSymptomExtractor
+    assert "SmartSymptomExtractor" in dir(distool)
+
+    with pytest.raises(AttributeError):
+        distool.UnknownExtractor
@@ -0,0 +1,159 @@
+import json
+
+import numpy as np
+import pytest
+
+from distool.estimators.classifiers import DiseaseClassifier
+from distool.feature_extraction.feature_encoder import SymptomFeatureEncoder
+from distool.pipeline import IntakePipeline
+
+
+@pytest.fixture(scope="module")
+def fitted_pipeline(complex_data):
+    texts, diseases = complex_data
+    return IntakePipeline().fit(texts, diseases)
+
+
+def test_pipeline_predicts_fitted_labels(fitted_pipeline, complex_data):
+    texts, diseases = complex_data
+
+    assert set(fitted_pipeline.predict(texts)) <= set(diseases)
+    assert fitted_pipeline.predict_proba(texts).shape == (len(texts), 2)
+
+
+def test_pipeline_round_trip_keeps_predictions(fitted_pipeline, complex_data, tmp_path):
+    texts, _ = complex_data
+
+    fitted_pipeline.save(tmp_path)
+    loaded_pipeline = IntakePipeline.load(tmp_path)
+
+    np.testing.assert_allclose(
+        loaded_pipeline.predict_proba(texts), fitted_pipeline.predict_proba(texts)
+    )
+    np.testing.assert_array_equal(
+        loaded_pipeline.predict(texts), fitted_pipeline.predict(texts)
+    )
+    assert loaded_pipeline.explain(texts[0]) == fitted_pipeline.explain(texts[0])
+
+
+def test_pipeline_load_memory_maps_weights(fitted_pipeline, tmp_path):
+    fitted_pipeline.save(tmp_path)
+
+    mapped_weights = IntakePipeline.load(tmp_path).classifier.get_weights()
+    read_weights = IntakePipeline.load(tmp_path, mmap=False).classifier.get_weights()
+
+    assert isinstance(mapped_weights["coef"], np.memmap)
+    assert not isinstance(read_weights["coef"], np.memmap)
+
+
+def test_pipeline_resave_keeps_mapped_weights(fitted_pipeline, complex_data, tmp_path):
+    texts, diseases = complex_data
+    fitted_pipeline.save(tmp_path)
+    loaded_pipeline = IntakePipeline.load(tmp_path)
+    expected_proba = loaded_pipeline.predict_proba(texts)
+
+    other_pipeline = IntakePipeline().fit(texts[::-1], diseases[::-1])
+    other_pipeline.classifier.log_reg.coef_ = (
+        other_pipeline.classifier.log_reg.coef_ + 1
+    )
+    other_pipeline.save(tmp_path)
+
+    np.testing.assert_allclose(loaded_pipeline.predict_proba(texts), expected_proba)
+    np.testing.assert_allclose(
+        IntakePipeline.load(tmp_path).predict_proba(texts),
+        other_pipeline.predict_proba(texts),
+    )
+    assert len(list(tmp_path.glob(f"{IntakePipeline.WEIGHTS_DIR_PREFIX}*"))) == 1
+
+
+def test_pipeline_load_survives_concurrent_saves(
+    fitted_pipeline, complex_data, tmp_path, monkeypatch
+):
+    texts, _ = complex_data
+    fitted_pipeline.save(tmp_path)
+    read_manifest = IntakePipeline._read_manifest
+    reads = []
+
+    def read_manifest_and_save_twice(path):
+        manifest = read_manifest(path)
+        if not reads:
+            fitted_pipeline.save(tmp_path)
+            fitted_pipeline.save(tmp_path)
+        reads.append(path)
+        return manifest
+
+    monkeypatch.setattr(
+        IntakePipeline, "_read_manifest", staticmethod(read_manifest_and_save_twice)
+    )
+    loaded_pipeline = IntakePipeline.load(tmp_path)
+
+    assert len(reads) == 2
+    np.testing.assert_allclose(
+        loaded_pipeline.predict_proba(texts), fitted_pipeline.predict_proba(texts)
+    )
+
+
+def test_pipeline_keeps_extractor_config_and_encoding(complex_data, tmp_path):
+    texts, diseases = complex_data
+    pipeline = IntakePipeline(
+        IntakePipeline.DUMB_EXTRACTOR, encoding=SymptomFeatureEncoder.ONEHOT
+    ).fit(texts, diseases)
+
+    pipeline.save(tmp_path)
+    loaded_pipeline = IntakePipeline.load(tmp_path)
+
+    assert loaded_pipeline.extractor_name == IntakePipeline.DUMB_EXTRACTOR
+    assert loaded_pipeline.encoding == SymptomFeatureEncoder.ONEHOT
+    np.testing.assert_array_equal(
+        loaded_pipeline.predict(texts), pipeline.predict(texts)
+    )
+
+
+def test_pipeline_saves_path_options(complex_data, tmp_path):
+    texts, diseases = complex_data
+    cache_dir = tmp_path / "cache"
+    pipeline = IntakePipeline(cache_dir=cache_dir).fit(texts, diseases)
+
+    pipeline.save(tmp_path / "bundle")
+    loaded_pipeline = IntakePipeline.load(tmp_path / "bundle")
+
+    assert loaded_pipeline.extractor_options == {"cache_dir": str(cache_dir)}
+
+
+def test_pipeline_load_rejects_other_format_version(fitted_pipeline, tmp_path):
+    fitted_pipeline.save(tmp_path)
+    manifest_path = tmp_path / IntakePipeline.MANIFEST_FILE_NAME
+    manifest = json.loads(manifest_path.read_text(encoding="utf8"))
+    manifest["format_version"] = IntakePipeline.FORMAT_VERSION + 1
+    manifest_path.write_text(json.dumps(manifest), encoding="utf8")
+
+    with pytest.raises(ValueError):
+        IntakePipeline.load(tmp_path)
+
+
+def test_pipeline_load_rejects_other_symptoms(fitted_pipeline, tmp_path):
+    fitted_pipeline.save(tmp_path)
+    manifest_path = tmp_path / IntakePipeline.MANIFEST_FILE_NAME
+    manifest = json.loads(manifest_path.read_text(encoding="utf8"))
+    manifest["symptoms_fingerprint"] = "0" * 64
+    manifest_path.write_text(json.dumps(manifest), encoding="utf8")
+
+    with pytest.raises(ValueError):
+        IntakePipeline.load(tmp_path)
+
+
+def test_pipeline_requires_fit():
+    with pytest.raises(ValueError):
+        IntakePipeline().predict(["У меня температура"])
+
+
+def test_classifier_from_weights_matches_fitted_classifier():
+    features = np.array([[1, 0, 2], [0, 1, 2], [1, 1, 0], [0, 0, 1]])
+    y = np.array(["a", "b", "a", "b"])
+    classifier = DiseaseClassifier().fit(features, y)
+
+    restored_classifier = DiseaseClassifier.from_weights(classifier.get_weights())
+
+    np.testing.assert_allclose(
+        restored_classifier.predict_proba(features), classifier.predict_proba(features)
+    )
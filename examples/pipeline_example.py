@@ -1,6 +1,7 @@
 from distool.feature_extraction import SmartSymptomExtractor
 from distool.interpretation.explainer import SymptomBasedExplainer
 from distool.estimators import DiseaseClassifier
+from distool.pipeline import IntakePipeline
 
 texts = [
     "У меня болит живот, но нет температуры",
@@ -24,3 +25,12 @@ print(explainer.explain(features[1]))
 # Наблюдается отит с вероятностью 59%.
 # Это потому что у вас наблюдаются следующие симптомы: температура
 # И отрицаются следующие: недомогание
+
+# The same steps are owned by IntakePipeline, which saves them to one bundle
+
+pipeline = IntakePipeline().fit(texts, diseases)
+pipeline.save("intake_bundle")
+
+# A worker maps the saved weights instead of refitting the classifier
+pipeline = IntakePipeline.load("intake_bundle")
+print(pipeline.explain(texts[1]))
@@ -26,6 +26,7 @@ setup(
         "beautifulsoup4",
         "negspacy",
         "numpy",
+        "scipy",
         "spacy",
         "negspacy",
         "attrs",